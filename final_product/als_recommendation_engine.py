@@ -0,0 +1,388 @@
+import os
+import pickle
+
+import numpy as np
+
+from interaction_store import InteractionStore
+from metrics import timed, cache_lookups
+from simple_recommendation_engine import CollaborativeRecommenderBase
+
+class ALSRecommender(CollaborativeRecommenderBase):
+    def __init__(self, csv_file_path=None, n_factors=32, regularization=0.1, alpha=2.0,
+                 n_iterations=15, random_state=42):
+        """
+        암시적 피드백 ALS(Alternating Least Squares) 행렬 분해 추천 시스템
+        풀이 기록을 선호도 1, 신뢰도 1 + alpha * 난이도 로 보고
+        사용자/문제 잠재 벡터를 NumPy로 번갈아 풀어 학습
+
+        n_factors: 잠재 벡터 차원
+        regularization: L2 정규화 계수
+        alpha: 난이도를 신뢰도로 바꿀 때 곱하는 계수
+        n_iterations: 사용자/문제 벡터를 번갈아 푸는 횟수
+        """
+        self.n_factors = n_factors
+        self.regularization = regularization
+        self.alpha = alpha
+        self.n_iterations = n_iterations
+        self.random_state = random_state
+
+        self.user_factors = None
+        self.item_factors = None
+        self.factor_user_rows = {}
+        self.factor_problem_ids = None
+        self.factor_problem_index = {}
+        self._item_gram = None
+
+        # 학습 이후 증분 갱신으로 fold-in한 사용자 벡터
+        self.folded_user_factors = {}
+
+        super().__init__(csv_file_path)
+
+    def train_model(self, block_size=None, n_workers=1):
+        """
+        ALS 학습 (block_size, n_workers는 다른 엔진과 호출 형태를 맞추기 위한 인자로 사용하지 않음)
+        """
+        if not self.user_item_matrix:
+            raise ValueError("❌ 먼저 데이터를 로드해주세요!")
+
+        print("🤖 ALS 모델 학습 시작...")
+
+        indptr, indices, data = self._build_interaction_arrays()
+        confidence = 1.0 + self.alpha * data
+        n_users, n_items = len(self.user_ids), len(self.problem_ids)
+
+        # 문제 기준(CSC) 배열: 문제 벡터를 풀 때 사용
+        rows = np.repeat(np.arange(n_users, dtype=np.int32), np.diff(indptr))
+        order = np.argsort(indices, kind='stable')
+        item_indptr = np.zeros(n_items + 1, dtype=np.int64)
+        np.cumsum(np.bincount(indices, minlength=n_items), out=item_indptr[1:])
+        item_users = rows[order]
+        item_confidence = confidence[order]
+
+        rng = np.random.default_rng(self.random_state)
+        user_factors = rng.normal(scale=0.01, size=(n_users, self.n_factors))
+        item_factors = rng.normal(scale=0.01, size=(n_items, self.n_factors))
+
+        for iteration in range(self.n_iterations):
+            print(f"   진행률: {iteration+1}/{self.n_iterations}", end='\r')
+            user_factors = self._solve_factors(item_factors, indptr, indices, confidence)
+            item_factors = self._solve_factors(user_factors, item_indptr, item_users, item_confidence)
+
+        self.user_factors = user_factors.astype(np.float32)
+        self.item_factors = item_factors.astype(np.float32)
+        self.factor_user_rows = dict(self.user_index)
+        self.factor_problem_ids = np.asarray(self.problem_ids, dtype=np.int64)
+        self.factor_problem_index = {int(problem): j for j, problem in enumerate(self.problem_ids)}
+        self.folded_user_factors = {}
+        self._item_gram = None
+
+        self._build_popularity()
+        self.trained = True
+        print("\n✅ ALS 모델 학습 완료!")
+
+    def _solve_factors(self, fixed, indptr, indices, confidence, batch_elements=1 << 22):
+        """
+        반대편 벡터(fixed)를 고정하고 각 행의 벡터를 최소제곱으로 풂
+        풀이 기록 수가 비슷한 행끼리 묶어 (행 수, k, k) 정규방정식을 쌓고 np.linalg.solve 한 번으로 풂
+        batch_elements: 한 묶음의 임시 배열 원소 수 상한
+            (행 수, 가장 긴 기록 수, k) 벡터 배열과 (행 수, k, k) 정규방정식 배열이 모두 이 안에 들어가도록
+            행 수 x k x max(가장 긴 기록 수, k)로 제한 (기록이 하나뿐인 행이 많아도 k^2에 비례해 묶음이 작아짐)
+        """
+        n_factors = fixed.shape[1]
+        gram = fixed.T.dot(fixed)
+        result = np.zeros((len(indptr) - 1, n_factors))
+        diagonal = np.arange(n_factors)
+
+        lengths = np.diff(indptr)
+        rows = np.flatnonzero(lengths)
+        rows = rows[np.argsort(lengths[rows], kind='stable')]
+
+        start = 0
+        while start < len(rows):
+            # 기록 수 오름차순이므로 묶음의 마지막 행이 가장 김
+            end = start + 1
+            while (end < len(rows)
+                   and (end + 1 - start) * n_factors * max(lengths[rows[end]], n_factors) <= batch_elements):
+                end += 1
+            batch_rows = rows[start:end]
+            start = end
+
+            # 행마다 기록을 가장 긴 행 길이에 맞춰 0으로 채운 (행 수, 길이, k) 배열
+            width = lengths[batch_rows[-1]]
+            positions = indptr[batch_rows][:, None] + np.arange(width)
+            mask = np.arange(width) < lengths[batch_rows][:, None]
+            positions[~mask] = 0
+            factors = fixed[indices[positions]] * mask[:, :, None]
+            weights = np.where(mask, confidence[positions], 0.0)
+
+            # A_u = Y^T Y + Y_u^T (C_u - I) Y_u + lambda I,  b_u = Y_u^T c_u
+            factors_t = factors.transpose(0, 2, 1)
+            A = np.matmul(factors_t * (weights - mask)[:, None, :], factors)
+            A += gram
+            A[:, diagonal, diagonal] += self.regularization
+            b = np.matmul(factors_t, weights[:, :, None])
+            result[batch_rows] = np.linalg.solve(A, b)[:, :, 0]
+
+        return result
+
+    def _solve_one(self, fixed, gram, columns, confidence):
+        """
+        (Y^T Y + Y_u^T (C_u - I) Y_u + lambda I) x_u = Y_u^T c_u
+        풀이 기록이 있는 행만 모아 계산하므로 비용은 기록 수에 비례
+        """
+        factors = fixed[columns]
+        A = gram + (factors.T * (confidence - 1.0)).dot(factors)
+        A[np.diag_indices_from(A)] += self.regularization
+        b = factors.T.dot(confidence)
+        return np.linalg.solve(A, b)
+
+    def fold_in(self, solved):
+        """
+        학습 때 없던 사용자의 벡터를 문제 벡터를 고정한 채 한 번의 최소제곱으로 계산
+        solved: {문제 ID: 난이도}, 모델이 모르는 문제는 무시
+        """
+        columns = []
+        levels = []
+        for problem, level in solved.items():
+            column = self.factor_problem_index.get(int(problem))
+            if column is not None:
+                columns.append(column)
+                levels.append(level)
+
+        if not columns:
+            return None
+
+        if self._item_gram is None:
+            self._item_gram = self.item_factors.T.astype(np.float64).dot(self.item_factors)
+
+        confidence = 1.0 + self.alpha * np.asarray(levels, dtype=np.float64)
+        return self._solve_one(
+            self.item_factors.astype(np.float64, copy=False),
+            self._item_gram,
+            np.asarray(columns, dtype=np.int64),
+            confidence
+        )
+
+    def _rank_problems(self, user_vector, solved, n_recommendations, tag_name=None):
+        """문제 벡터 전체와의 행렬-벡터 곱 한 번으로 점수를 매기고 상위 N개 선택"""
+        scores = self.item_factors.dot(user_vector.astype(np.float32))
+
+        solved_columns = [
+            self.factor_problem_index[int(problem)] for problem in solved
+            if int(problem) in self.factor_problem_index
+        ]
+        scores[solved_columns] = -np.inf
+
+        if tag_name is None:
+            n_candidates = min(n_recommendations, len(scores))
+            top = np.argpartition(-scores, n_candidates - 1)[:n_candidates]
+            candidates = top[np.argsort(-scores[top], kind='stable')]
+        else:
+            candidates = np.argsort(-scores, kind='stable')
+
+        result = []
+        with cache_lookups('tag_index') as lookups:
+            for column in candidates.tolist():
+                if len(result) >= n_recommendations or not np.isfinite(scores[column]):
+                    break
+                problem_id = int(self.factor_problem_ids[column])
+                if tag_name is not None and not self._is_tag_problem(problem_id, tag_name, lookups):
+                    continue
+                result.append({
+                    'problem_id': problem_id,
+                    'estimated_rating': float(scores[column]),
+                    'actual_rating': None
+                })
+
+        return result
+
+    def _user_vector(self, user_id):
+        if user_id in self.folded_user_factors:
+            return self.folded_user_factors[user_id]
+        if user_id in self.factor_user_rows:
+            return self.user_factors[self.factor_user_rows[user_id]]
+        return self.fold_in(self.user_item_matrix[user_id])
+
+    def get_user_recommendations(self, user_id, n_recommendations=10):
+        """특정 사용자에게 문제 추천"""
+        if not self.trained:
+            raise ValueError("❌ 먼저 모델을 학습해주세요!")
+
+        if user_id not in self.user_item_matrix:
+            print(f"⚠️ 사용자 '{user_id}'를 찾을 수 없습니다.")
+            return []
+
+        print(f"🎯 '{user_id}' 사용자를 위한 ALS 추천 생성 중...")
+        user_vector = self._user_vector(user_id)
+        if user_vector is None:
+            return []
+        with timed('scoring'):
+            return self._rank_problems(user_vector, self.user_item_matrix[user_id], n_recommendations)
+
+    def get_recommendations_for_user_history(self, user_handle, solved, n_recommendations=10):
+        """
+        풀이 기록만으로 실시간 추천 생성 (fold-in)
+
+        Parameters:
+        user_handle: 사용자 핸들
+        solved: {문제 ID: 난이도} 매핑 또는 (문제 ID 배열, 난이도 배열) 쌍
+        n_recommendations: 추천할 문제 수
+        """
+        if not self.trained:
+            raise ValueError("❌ 먼저 모델을 학습해주세요!")
+
+        new_user_problems = self._solved_mapping(solved)
+        if not new_user_problems:
+            print("❌ 사용자 데이터가 비어있습니다.")
+            return []
+
+        print(f"🎯 새 사용자 '{user_handle}'을 위한 ALS 추천 생성 중...")
+
+        with timed('fold_in'):
+            user_vector = self.fold_in(new_user_problems)
+
+        if user_vector is None:
+            print("   - 모델이 아는 문제가 없습니다.")
+            return self._get_popular_recommendations(set(new_user_problems), n_recommendations)
+
+        with timed('scoring'):
+            result = self._rank_problems(user_vector, new_user_problems, n_recommendations)
+        print(f"✅ 새 사용자 추천 완료! 상위 {len(result)}개 문제")
+        return result
+
+    def get_recommendations_for_user_history_by_tag(self, user_handle, solved, tag_name, n_recommendations=10):
+        """
+        풀이 기록만으로 특정 태그 문제 추천
+        solved: {문제 ID: 난이도} 매핑 또는 (문제 ID 배열, 난이도 배열) 쌍
+        """
+        if not self.trained:
+            raise ValueError("❌ 먼저 모델을 학습해주세요!")
+
+        new_user_problems = self._solved_mapping(solved)
+        if not new_user_problems:
+            print("❌ 사용자 데이터가 비어있습니다.")
+            return []
+
+        print(f"🎯 새 사용자 '{user_handle}'에게 '{tag_name}' 태그 ALS 추천 중...")
+
+        with timed('fold_in'):
+            user_vector = self.fold_in(new_user_problems)
+
+        result = []
+        if user_vector is not None:
+            with timed('scoring'):
+                result = self._rank_problems(user_vector, new_user_problems, n_recommendations, tag_name=tag_name)
+
+        if not result:
+            print(f"   - '{tag_name}' 태그 문제를 찾을 수 없습니다.")
+            return self._get_popular_recommendations_by_tag(set(new_user_problems), tag_name, n_recommendations)
+
+        print(f"✅ '{tag_name}' 태그 추천 완료! {len(result)}개 문제")
+        return result
+
+    def upsert_user(self, user, solved):
+        """
+        사용자 풀이 기록을 갱신하고 그 사용자의 벡터만 fold-in으로 다시 계산
+        문제 벡터는 compact() 때 전체 재학습으로 갱신
+        """
+        if not self.trained:
+            raise ValueError("❌ 먼저 모델을 학습해주세요!")
+
+        solved = {int(problem): level for problem, level in solved.items()}
+        old_problems = self.user_item_matrix.get(user)
+        if old_problems == solved:
+            return False
+
+        if old_problems is not None:
+            self._remove_postings(user, old_problems)
+        self.user_item_matrix[user] = solved
+        self._add_postings(user, solved)
+        self.update_user_norm(user)
+
+        user_vector = self.fold_in(solved)
+        if user_vector is not None:
+            self.folded_user_factors[user] = user_vector
+        else:
+            self.folded_user_factors.pop(user, None)
+
+        self._record_update('upsert', user, solved)
+        return True
+
+    def remove_user(self, user):
+        old_problems = self.user_item_matrix.get(user)
+        if old_problems is None:
+            return False
+
+        self._remove_postings(user, old_problems)
+        del self.user_item_matrix[user]
+        self.update_user_norm(user)
+        self.folded_user_factors.pop(user, None)
+        self.factor_user_rows.pop(user, None)
+
+        self._record_update('remove', user, None)
+        return True
+
+    def save_model(self, model_path="als_recommendation_model.pkl"):
+        """학습된 모델 저장"""
+        if not self.trained:
+            raise ValueError("❌ 저장할 학습된 모델이 없습니다!")
+
+        model_data = {
+            'engine': 'als',
+            'params': {
+                'n_factors': self.n_factors,
+                'regularization': self.regularization,
+                'alpha': self.alpha,
+                'n_iterations': self.n_iterations,
+                'random_state': self.random_state
+            },
+            'user_item_matrix': self._user_item_dict(),
+            'user_norms': dict(self.user_norms),
+            'user_factors': self.user_factors,
+            'item_factors': self.item_factors,
+            'factor_user_rows': self.factor_user_rows,
+            'factor_problem_ids': self.factor_problem_ids,
+            'folded_user_factors': self.folded_user_factors,
+            'popular_problems': self.popular_problems,
+            'popular_problems_by_tag': dict(self.popular_problems_by_tag),
+            'problem_data': self.problem_data
+        }
+
+        with open(model_path, 'wb') as f:
+            pickle.dump(model_data, f)
+
+        self.pending_updates = []
+        print(f"💾 ALS 모델이 {model_path}에 저장되었습니다.")
+
+    def load_model(self, model_path="als_recommendation_model.pkl"):
+        """저장된 모델 로드"""
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"❌ {model_path} 파일을 찾을 수 없습니다!")
+
+        with open(model_path, 'rb') as f:
+            model_data = pickle.load(f)
+
+        if model_data.get('engine') != 'als':
+            raise ValueError(f"❌ {model_path}는 ALS 모델 파일이 아닙니다!")
+
+        for name, value in model_data['params'].items():
+            setattr(self, name, value)
+
+        self.user_item_matrix = InteractionStore.from_dict(model_data['user_item_matrix'])
+        self.user_norms = dict(model_data['user_norms'])
+        self.user_factors = model_data['user_factors']
+        self.item_factors = model_data['item_factors']
+        self.factor_user_rows = model_data['factor_user_rows']
+        self.factor_problem_ids = model_data['factor_problem_ids']
+        self.factor_problem_index = {
+            problem: j for j, problem in enumerate(self.factor_problem_ids.tolist())
+        }
+        self.folded_user_factors = model_data['folded_user_factors']
+        self._item_gram = None
+        self.popular_problems = model_data['popular_problems']
+        self.popular_problems_by_tag = model_data['popular_problems_by_tag']
+        self.problem_data = model_data['problem_data']
+        self._build_problem_solvers_index()
+        self.trained = True
+
+        print(f"📦 ALS 모델이 {model_path}에서 로드되었습니다.")
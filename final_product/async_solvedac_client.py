@@ -0,0 +1,172 @@
+"""
+solved.ac API 비동기 HTTP 클라이언트 (httpx.AsyncClient)
+
+solvedac_client.SolvedAcClient와 같은 규칙을 따름
+- 연결 풀 하나를 프로세스 전체에서 재사용
+- 모든 요청에 (연결, 읽기) 타임아웃 적용
+- 429/5xx 응답과 연결 오류는 지수 백오프로 제한된 횟수만큼 재시도 (Retry-After 헤더가 있으면 따름)
+- 기본 주소는 SOLVEDAC_BASE_URL 환경 변수로 바꿀 수 있음
+
+httpx.AsyncClient는 처음 사용한 이벤트 루프에서만 쓸 수 있는데, Flask의 async 뷰는 요청마다 새 루프에서 실행됨
+그래서 클라이언트 전용 이벤트 루프 스레드를 하나 두고 모든 요청을 그 루프에서 보냄
+호출하는 쪽은 어느 루프에서든 await client.get_json(...) 하면 됨
+
+httpx가 설치되어 있지 않으면 ASYNC_HTTP_AVAILABLE이 False
+"""
+import asyncio
+import os
+import threading
+
+from metrics import timed
+from solvedac_client import DEFAULT_BASE_URL, RetryState
+
+try:
+    import httpx
+    ASYNC_HTTP_AVAILABLE = True
+except ImportError:
+    ASYNC_HTTP_AVAILABLE = False
+
+
+class AsyncSolvedAcClient:
+    def __init__(self, base_url=None, timeout=(3.05, 10.0), max_retries=3, backoff_factor=0.5,
+                 max_backoff=30.0, max_connections=20):
+        """
+        base_url: API 기본 주소 (없으면 SOLVEDAC_BASE_URL 환경 변수, 그것도 없으면 solved.ac)
+        timeout: 초 하나 또는 (연결, 읽기) 튜플
+        max_retries: 첫 요청 이후 추가로 시도할 최대 횟수
+        backoff_factor: n번째 재시도 전 대기 시간 = backoff_factor * 2^n (Retry-After가 있으면 그 값)
+        max_backoff: 한 번에 기다리는 최대 시간 (초)
+        max_connections: 연결 풀 크기 (동시에 보낼 수 있는 최대 요청 수)
+        """
+        if not ASYNC_HTTP_AVAILABLE:
+            raise ImportError("❌ 비동기 클라이언트에는 httpx가 필요합니다. (pip install httpx)")
+
+        self.base_url = (base_url or os.environ.get("SOLVEDAC_BASE_URL") or DEFAULT_BASE_URL).rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_connections = max_connections
+
+        self._loop = None
+        self._http_client = None
+        self._lock = threading.Lock()
+
+    def url(self, path):
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def _backoff(self, attempt):
+        return self.backoff_factor * (2 ** attempt)
+
+    def _ensure_loop(self):
+        """클라이언트 전용 이벤트 루프 스레드 (처음 호출할 때 시작)"""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="solvedac-async", daemon=True).start()
+                self._loop = loop
+        return self._loop
+
+    async def _run(self, coro):
+        """코루틴을 클라이언트 루프에서 실행하고 결과를 현재 루프에서 기다림"""
+        loop = self._ensure_loop()
+        if asyncio.get_running_loop() is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    def _http(self):
+        """httpx.AsyncClient (클라이언트 루프 안에서만 호출)"""
+        if self._http_client is None:
+            if isinstance(self.timeout, tuple):
+                connect, read = self.timeout
+                timeout = httpx.Timeout(read, connect=connect)
+            else:
+                timeout = httpx.Timeout(self.timeout)
+            self._http_client = httpx.AsyncClient(
+                timeout=timeout,
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+                headers={"Content-Type": "application/json", "Accept": "application/json"},
+            )
+        return self._http_client
+
+    def _status_error(self, response):
+        """오류 응답이면 HTTPStatusError, 아니면 None"""
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            return e
+        return None
+
+    async def _send(self, client, url, params):
+        """요청 한 번 (응답, 예외, 다시 시도할 만한 예외인지)"""
+        try:
+            with timed('upstream_request'):
+                return await client.get(url, params=params), None, False
+        except httpx.TransportError as e:
+            return None, e, True
+        except httpx.HTTPError as e:
+            return None, e, False
+
+    async def _get(self, path, params):
+        url = self.url(path)
+        client = self._http()
+        retry = RetryState(self, path)
+        while True:
+            delay = retry.next_delay(*await self._send(client, url, params))
+            if delay is None:
+                return retry.response
+            await asyncio.sleep(delay)
+
+    async def get(self, path, params=None):
+        """
+        GET 요청을 보내고 성공한 응답을 반환
+        재시도를 모두 써도 실패하거나 4xx 응답이면 None
+        """
+        return await self._run(self._get(path, params))
+
+    async def get_json(self, path, params=None):
+        """get()의 응답 본문을 JSON으로 읽어 반환 (실패 시 None)"""
+        response = await self.get(path, params)
+        if response is None:
+            return None
+        try:
+            return response.json()
+        except ValueError as e:
+            print(f"API Error: {e}")
+            return None
+
+    def close(self):
+        """연결 풀을 닫고 전용 루프 종료"""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if self._http_client is not None:
+            asyncio.run_coroutine_threadsafe(self._http_client.aclose(), loop).result()
+            self._http_client = None
+        loop.call_soon_threadsafe(loop.stop)
+
+
+_async_client = None
+_async_client_lock = threading.Lock()
+
+
+def get_async_client():
+    """프로세스 전체에서 함께 쓰는 비동기 클라이언트 (처음 호출할 때 생성)"""
+    global _async_client
+    if _async_client is None:
+        with _async_client_lock:
+            if _async_client is None:
+                _async_client = AsyncSolvedAcClient()
+    return _async_client
+
+
+def configure_async(**kwargs):
+    """공용 비동기 클라이언트를 새 설정으로 교체"""
+    global _async_client
+    with _async_client_lock:
+        if _async_client is not None:
+            _async_client.close()
+        _async_client = AsyncSolvedAcClient(**kwargs)
+    return _async_client
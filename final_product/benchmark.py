@@ -0,0 +1,245 @@
+"""
+추천 엔진 성능 측정 스크립트
+
+시드가 고정된 합성 데이터(사용자별 풀이 수와 문제 인기도가 멱법칙을 따름)를 만들어
+load_data / train_model / save_model / load_model / 기존 사용자 추천 / 새 사용자 추천
+각 단계의 시간을 재고, 결과를 JSON Lines 파일에 한 줄씩 덧붙여 커밋 간 비교에 사용
+
+사용법:
+    python benchmark.py --users 1000 10000 --engine user --output benchmark_results.jsonl
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from simple_recommendation_engine import SimpleCollaborativeRecommender
+from item_recommendation_engine import ItemCollaborativeRecommender
+from als_recommendation_engine import ALSRecommender
+
+BENCHMARK_ENGINES = {
+    'user': SimpleCollaborativeRecommender,
+    'item': ItemCollaborativeRecommender,
+    'als': ALSRecommender,
+}
+
+PROBLEM_CSV_PATH = "static/problem_all.csv"
+
+
+def _load_problem_catalog(problem_csv_path, rng):
+    """문제 ID와 난이도 목록 (problem_all.csv가 없으면 임의로 만듦)"""
+    if problem_csv_path and os.path.exists(problem_csv_path):
+        problems = pd.read_csv(
+            problem_csv_path,
+            usecols=['PROBLEM_ID', 'SOLVED_LVL'],
+            dtype={'PROBLEM_ID': 'int64', 'SOLVED_LVL': 'int64'}
+        )
+        return problems['PROBLEM_ID'].to_numpy(), problems['SOLVED_LVL'].to_numpy()
+
+    problem_ids = np.arange(1000, 31000, dtype=np.int64)
+    return problem_ids, rng.integers(1, 31, size=len(problem_ids))
+
+
+def generate_synthetic_data(n_users, csv_file_path, seed=42, problem_csv_path=PROBLEM_CSV_PATH,
+                            min_solved=10, max_solved=2000, user_exponent=1.5, problem_exponent=1.0):
+    """
+    벤치마크용 합성 풀이 기록 CSV 생성 (같은 시드면 항상 같은 파일)
+
+    - 사용자별 풀이 수: min_solved 이상의 파레토 분포 (소수의 사용자가 아주 많이 풂)
+    - 문제 인기도: 쉬운 문제일수록 앞 순위가 되도록 섞은 뒤 순위^-problem_exponent 에 비례
+    - 같은 문제를 여러 번 뽑으면 한 번만 남기므로 실제 풀이 수는 목표보다 조금 적을 수 있음
+
+    반환값: 생성된 풀이 기록 수
+    """
+    rng = np.random.default_rng(seed)
+    problem_ids, problem_levels = _load_problem_catalog(problem_csv_path, rng)
+
+    # 난이도에 잡음을 더해 정렬한 순서를 인기 순위로 사용
+    ranking = np.argsort(problem_levels + rng.normal(scale=5.0, size=len(problem_levels)), kind='stable')
+    weights = np.empty(len(problem_ids), dtype=np.float64)
+    weights[ranking] = (np.arange(len(problem_ids)) + 1.0) ** -problem_exponent
+    cdf = np.cumsum(weights)
+    cdf /= cdf[-1]
+
+    solved_counts = np.floor(min_solved * (1.0 - rng.random(n_users)) ** (-1.0 / user_exponent))
+    solved_counts = np.clip(solved_counts, min_solved, min(max_solved, len(problem_ids))).astype(np.int64)
+
+    user_codes = np.repeat(np.arange(n_users, dtype=np.int64), solved_counts)
+    columns = np.minimum(np.searchsorted(cdf, rng.random(len(user_codes))), len(problem_ids) - 1)
+
+    keys = np.unique(user_codes * len(problem_ids) + columns)
+    user_codes = keys // len(problem_ids)
+    columns = keys % len(problem_ids)
+
+    handles = np.array([f"bench_user{i}" for i in range(n_users)], dtype=object)
+    data = pd.DataFrame({
+        'SOLVER_HANDLE': handles[user_codes],
+        'PROBLEM_ID': problem_ids[columns],
+        'SOLVED_LVL': problem_levels[columns]
+    })
+    data.to_csv(csv_file_path, index=False)
+    return len(data)
+
+
+def _timed(func, *args, **kwargs):
+    """엔진이 출력하는 진행 메시지는 버리고 실행 시간(초)과 반환값을 돌려줌"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+    return elapsed, result
+
+
+def _latency_summary(samples):
+    """요청별 지연 시간(초) 목록을 밀리초 단위 요약 통계로 변환"""
+    if not samples:
+        return None
+    samples_ms = np.asarray(samples) * 1000.0
+    return {
+        'count': len(samples_ms),
+        'mean_ms': float(samples_ms.mean()),
+        'p50_ms': float(np.percentile(samples_ms, 50)),
+        'p95_ms': float(np.percentile(samples_ms, 95)),
+        'max_ms': float(samples_ms.max()),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _pick_tag(recommender):
+    """태그별 추천 측정에 쓸 태그 (문제 수가 가장 많은 태그)"""
+    store = recommender.problem_store
+    if store is None or not store.tag_problems:
+        return None
+    return max(store.tag_problems, key=lambda tag_name: len(store.tag_problems[tag_name]))
+
+
+def run_benchmark(n_users, engine='user', seed=42, n_queries=50, n_workers=1,
+                  problem_csv_path=PROBLEM_CSV_PATH):
+    """
+    합성 데이터 한 벌로 엔진의 각 단계를 측정해 결과 딕셔너리 반환
+    stages    : 단계별 소요 시간(초)
+    latencies : 추천 요청별 지연 시간 요약 (밀리초)
+    """
+    recommender_class = BENCHMARK_ENGINES[engine]
+    rng = np.random.default_rng(seed)
+    stages = {}
+    latencies = {}
+
+    with tempfile.TemporaryDirectory(prefix="recommender_benchmark_") as work_dir:
+        csv_file_path = os.path.join(work_dir, "problem_for_each_user.csv")
+        stages['generate_data'], n_interactions = _timed(
+            generate_synthetic_data, n_users, csv_file_path, seed=seed, problem_csv_path=problem_csv_path
+        )
+
+        recommender = recommender_class()
+        stages['load_data'], _ = _timed(recommender.load_data, csv_file_path)
+        stages['train_model'], _ = _timed(recommender.train_model, n_workers=n_workers)
+
+        model_path = os.path.join(work_dir, "model.pkl")
+        stages['save_model'], _ = _timed(recommender.save_model, model_path)
+        loaded = recommender_class()
+        stages['load_model'], _ = _timed(loaded.load_model, model_path)
+
+        # 바이너리 형식은 그 API가 있는 엔진(사용자 기반)만 측정
+        if hasattr(recommender_class, 'save_model_binary'):
+            model_dir = os.path.join(work_dir, "model")
+            stages['save_model_binary'], _ = _timed(recommender.save_model_binary, model_dir)
+            binary = recommender_class()
+            stages['load_model_binary'], _ = _timed(binary.load_model_binary, model_dir)
+
+        if problem_csv_path and os.path.exists(problem_csv_path):
+            stages['load_tag_index'], _ = _timed(loaded.load_tag_index, problem_csv_path)
+        tag_name = _pick_tag(loaded)
+
+        users = list(loaded.user_item_matrix.keys())
+        sample_users = [users[i] for i in rng.choice(len(users), size=min(n_queries, len(users)), replace=False)]
+
+        user_samples = []
+        new_user_samples = []
+        new_user_tag_samples = []
+        for user in sample_users:
+            elapsed, _ = _timed(loaded.get_user_recommendations, user)
+            user_samples.append(elapsed)
+
+            # 기존 사용자의 풀이 기록을 처음 보는 핸들로 넘겨 웹 서버와 같은 새 사용자 경로를 측정
+            solved = dict(loaded.user_item_matrix[user].items())
+            elapsed, _ = _timed(loaded.get_recommendations_for_user_history, f"new_{user}", solved)
+            new_user_samples.append(elapsed)
+
+            if tag_name is not None:
+                elapsed, _ = _timed(loaded.get_recommendations_for_user_history_by_tag, f"new_{user}", solved, tag_name)
+                new_user_tag_samples.append(elapsed)
+
+        latencies['get_user_recommendations'] = _latency_summary(user_samples)
+        latencies['get_recommendations_for_new_user'] = _latency_summary(new_user_samples)
+        latencies['get_recommendations_for_new_user_by_tag'] = _latency_summary(new_user_tag_samples)
+
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'engine': engine,
+        'n_users': n_users,
+        'n_interactions': n_interactions,
+        'seed': seed,
+        'n_workers': n_workers,
+        'tag_name': tag_name,
+        'stages': {name: round(seconds, 6) for name, seconds in stages.items()},
+        'latencies': latencies,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="추천 엔진 성능 측정")
+    parser.add_argument('--users', type=int, nargs='+', default=[1000],
+                        help="측정할 사용자 수 목록 (예: 1000 10000 200000)")
+    parser.add_argument('--engine', choices=sorted(BENCHMARK_ENGINES), default='user')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--queries', type=int, default=50, help="추천 지연 시간을 잴 요청 수")
+    parser.add_argument('--workers', type=int, default=1, help="train_model의 n_workers")
+    parser.add_argument('--problems', default=PROBLEM_CSV_PATH, help="문제 목록 CSV (problem_all.csv)")
+    parser.add_argument('--output', default="benchmark_results.jsonl",
+                        help="결과를 한 줄씩 덧붙일 JSON Lines 파일")
+    args = parser.parse_args(argv)
+
+    for n_users in args.users:
+        print(f"⏱️ {args.engine} 엔진 측정 중: 사용자 {n_users:,}명 (seed={args.seed})")
+        result = run_benchmark(
+            n_users, engine=args.engine, seed=args.seed, n_queries=args.queries,
+            n_workers=args.workers, problem_csv_path=args.problems
+        )
+
+        for name, seconds in result['stages'].items():
+            print(f"   - {name}: {seconds:.3f}s")
+        for name, summary in result['latencies'].items():
+            if summary is not None:
+                print(f"   - {name}: 평균 {summary['mean_ms']:.2f}ms, p95 {summary['p95_ms']:.2f}ms")
+
+        with open(args.output, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+    print(f"💾 측정 결과를 {args.output}에 저장했습니다.")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
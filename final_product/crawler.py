@@ -1,4 +1,5 @@
-import random, requests, json, os, time, pandas as pd
+import random, os, time, pandas as pd
+from solvedac_client import get_client
 
 class Problem:
     def __init__(self):
@@ -25,32 +26,29 @@ def appending(problem, hash, title, level, tags, solver):
 
 def crawlUserList(page):
     time.sleep(1)
-    url = "https://solved.ac/api/v3/ranking/class"
     querystring = {"query": "", "page": f"{page}"}
 
-    headers = {"Content-Type": "application/json"}
-    response = requests.request("GET", url, headers=headers, params=querystring)
+    data = get_client().get_json("ranking/class", querystring)
+    if data is None:
+        return
 
     temp = dict()
-    temp["item"] = json.loads(response.text).get("items")
+    temp["item"] = data.get("items")
     for item in random.sample(temp["item"], k=min(SAMPLE_SIZE_PER_PAGE, len(temp["item"]))):
         handles.append(item["handle"])
     
 def crawlProblem(page, problem, handle=None):
     time.sleep(0.5)
-    url = "https://solved.ac/api/v3/search/problem"
     if(handle is None):
         querystring = {"query": "", "page": f"{page}"}
     else:
         querystring = {"query": f"solved_by:{handle}", "page": f"{page}"}
 
-    headers = {"Content-Type": "application/json"}
-
     try:
-        response = requests.request("GET", url, headers=headers, params=querystring)
+        data = get_client().get_json("search/problem", querystring)
 
         temp = dict()
-        temp["item"] = json.loads(response.text).get("items")
+        temp["item"] = data.get("items")
         for item in temp["item"]:
             #print(item)
             hash = int(item.get("problemId"))
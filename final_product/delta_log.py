@@ -0,0 +1,90 @@
+"""
+추천 모델 증분 갱신 파일 관리 (프로세스별 파일)
+
+디렉터리 구성
+- {pid}.pkl                 : 실행 중인 프로세스가 기록을 덧붙이는 파일 (프로세스마다 하나)
+- {pid}-{시각}.sealed.pkl    : 정리(compact)를 위해 닫은 파일 (더 이상 덧붙이지 않음)
+
+여러 워커 프로세스가 같은 디렉터리를 써도 각자 자기 파일에만 쓰므로 서로 덮어쓰지 않음
+정리할 때는 닫은 파일과 이미 종료된 프로세스의 파일만 읽고 지움 (살아 있는 다른 프로세스의 파일은 건드리지 않음)
+기록 형식은 SimpleCollaborativeRecommender.save_delta/load_delta를 따름
+"""
+import os
+import threading
+import time
+
+SEALED_SUFFIX = ".sealed.pkl"
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class DeltaLog:
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._queue = []
+
+    def active_path(self):
+        """현재 프로세스가 기록을 덧붙이는 파일 (fork된 워커도 자기 pid를 쓰도록 매번 계산)"""
+        return os.path.join(self.directory, f"{os.getpid()}.pkl")
+
+    def append(self, updates):
+        """
+        증분 갱신 기록을 쓰기 대기열에 넣음
+        모델을 고친 쓰기 잠금 안에서 호출하면 대기열 순서가 모델에 반영된 순서와 같음
+        """
+        if updates:
+            with self._lock:
+                self._queue.extend(updates)
+
+    def flush(self, recommender):
+        """
+        대기열의 기록을 현재 프로세스 파일 끝에 덧붙임 (모델 잠금 밖에서 호출)
+        반환값: 쓴 기록 수
+        """
+        with self._write_lock:
+            with self._lock:
+                updates, self._queue = self._queue, []
+            if not updates:
+                return 0
+            os.makedirs(self.directory, exist_ok=True)
+            return recommender.save_delta(self.active_path(), updates)
+
+    def seal(self):
+        """현재 프로세스 파일을 닫아 정리 대상으로 돌림 (이후 기록은 새 파일에 덧붙음)"""
+        with self._write_lock:
+            path = self.active_path()
+            if os.path.exists(path):
+                os.replace(path, os.path.join(self.directory, f"{os.getpid()}-{time.time_ns()}{SEALED_SUFFIX}"))
+
+    def sealed_files(self):
+        """정리할 수 있는 파일 목록 (닫은 파일 + 종료된 프로세스의 파일, 쓰인 순서대로)"""
+        if not os.path.isdir(self.directory):
+            return []
+
+        paths = []
+        for name in os.listdir(self.directory):
+            if name.endswith(SEALED_SUFFIX):
+                paths.append(os.path.join(self.directory, name))
+            elif name.endswith(".pkl") and name[:-4].isdigit():
+                pid = int(name[:-4])
+                if pid != os.getpid() and not _process_alive(pid):
+                    paths.append(os.path.join(self.directory, name))
+        return sorted(paths, key=os.path.getmtime)
+
+    def remove(self, paths):
+        """정리가 끝난 파일 삭제"""
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
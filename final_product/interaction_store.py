@@ -0,0 +1,353 @@
+"""
+사용자 핸들과 문제 ID를 정수로 인터닝해 풀이 기록을 배열로 저장하는 압축 저장소
+
+InteractionStore      : {사용자: {문제 ID: 난이도}} 딕셔너리처럼 동작
+                        행(사용자)마다 정렬된 문제 번호 array('i') 와 난이도 array('b') 를 보관
+ProblemSolversIndex   : {문제 ID: [(사용자, 난이도), ...]} 역색인처럼 동작
+                        문제마다 사용자 행 번호 array('i') 와 난이도 array('b') 를 보관
+
+딕셔너리 항목 하나가 100바이트 이상을 쓰는 데 비해 풀이 기록 하나당 5바이트만 사용함
+인터닝 테이블은 줄어들지 않으므로 삭제된 사용자는 행 자리(None)만 남음
+"""
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping, MutableMapping
+
+import numpy as np
+
+
+def _to_array(typecode, values):
+    """numpy 배열을 같은 크기의 array로 복사 (행마다 Python 객체를 만들지 않음)"""
+    result = array(typecode)
+    result.frombytes(np.ascontiguousarray(values, dtype=_NUMPY_TYPES[typecode]).tobytes())
+    return result
+
+
+_NUMPY_TYPES = {'i': np.intc, 'b': np.int8}
+
+
+class UserProblems(Mapping):
+    """한 사용자의 풀이 기록을 {문제 ID: 난이도} 딕셔너리처럼 읽는 뷰"""
+
+    __slots__ = ('_store', '_columns', '_levels')
+
+    def __init__(self, store, columns, levels):
+        self._store = store
+        self._columns = columns
+        self._levels = levels
+
+    def _position(self, problem):
+        try:
+            column = self._store.problem_index.get(problem)
+        except TypeError:
+            return None
+        if column is None:
+            return None
+        position = bisect_left(self._columns, column)
+        if position < len(self._columns) and self._columns[position] == column:
+            return position
+        return None
+
+    def __getitem__(self, problem):
+        position = self._position(problem)
+        if position is None:
+            raise KeyError(problem)
+        return self._levels[position]
+
+    def __contains__(self, problem):
+        return self._position(problem) is not None
+
+    def __iter__(self):
+        problem_ids = self._store.problem_ids
+        return (problem_ids[column] for column in self._columns)
+
+    def __len__(self):
+        return len(self._columns)
+
+    def items(self):
+        problem_ids = self._store.problem_ids
+        return [(problem_ids[column], level) for column, level in zip(self._columns, self._levels)]
+
+    def values(self):
+        return self._levels.tolist()
+
+    def __repr__(self):
+        return f"UserProblems({dict(self.items())})"
+
+
+class InteractionStore(MutableMapping):
+    """사용자 x 문제 풀이 기록을 인터닝된 정수 배열로 저장하는 딕셔너리형 저장소"""
+
+    def __init__(self):
+        # 인터닝 테이블 (행 번호 <-> 핸들, 열 번호 <-> 문제 ID)
+        self.user_ids = []
+        self.user_index = {}
+        self.problem_ids = []
+        self.problem_index = {}
+
+        # 행별 정렬된 문제 번호 / 난이도 (삭제된 사용자는 None)
+        self._columns = []
+        self._levels = []
+        self._n_users = 0
+
+    def intern_user(self, user):
+        """핸들의 행 번호 반환 (처음 보는 핸들이면 빈 행을 추가)"""
+        row = self.user_index.get(user)
+        if row is None:
+            row = len(self.user_ids)
+            self.user_ids.append(user)
+            self.user_index[user] = row
+            self._columns.append(None)
+            self._levels.append(None)
+        return row
+
+    def intern_problem(self, problem):
+        """문제 ID의 열 번호 반환 (처음 보는 문제면 새 번호 부여)"""
+        problem = int(problem)
+        column = self.problem_index.get(problem)
+        if column is None:
+            column = len(self.problem_ids)
+            self.problem_ids.append(problem)
+            self.problem_index[problem] = column
+        return column
+
+    def _row(self, user):
+        row = self.user_index.get(user)
+        if row is None or self._columns[row] is None:
+            return None
+        return row
+
+    def __getitem__(self, user):
+        row = self._row(user)
+        if row is None:
+            raise KeyError(user)
+        return UserProblems(self, self._columns[row], self._levels[row])
+
+    def __contains__(self, user):
+        return self._row(user) is not None
+
+    def __setitem__(self, user, solved):
+        entries = sorted((self.intern_problem(problem), int(level)) for problem, level in solved.items())
+        row = self.intern_user(user)
+        if self._columns[row] is None:
+            self._n_users += 1
+        self._columns[row] = array('i', (column for column, _ in entries))
+        self._levels[row] = array('b', (level for _, level in entries))
+
+    def __delitem__(self, user):
+        row = self._row(user)
+        if row is None:
+            raise KeyError(user)
+        self._columns[row] = None
+        self._levels[row] = None
+        self._n_users -= 1
+
+    def __iter__(self):
+        for row, user in enumerate(self.user_ids):
+            if self._columns[row] is not None:
+                yield user
+
+    def __len__(self):
+        return self._n_users
+
+    def _live_arrays(self):
+        """살아 있는 사용자 행 번호와 이어 붙인 (행, 열, 난이도) 배열"""
+        rows = [row for row, columns in enumerate(self._columns) if columns is not None]
+        lengths = np.array([len(self._columns[row]) for row in rows], dtype=np.int64)
+        columns = np.frombuffer(b''.join(self._columns[row].tobytes() for row in rows), dtype=np.intc)
+        levels = np.frombuffer(b''.join(self._levels[row].tobytes() for row in rows), dtype=np.int8)
+        return rows, lengths, columns, levels
+
+    def to_csr(self):
+        """
+        살아 있는 사용자만 모아 CSR 배열 생성
+        반환값: (사용자 목록, 문제 ID 목록(정렬됨), indptr, indices, data)
+        """
+        rows, lengths, columns, levels = self._live_arrays()
+
+        # 아무도 풀지 않게 된 문제는 빼고, 열은 문제 ID 순서로 다시 번호를 매김
+        used = np.zeros(len(self.problem_ids), dtype=bool)
+        used[columns] = True
+        problem_ids = np.asarray(self.problem_ids, dtype=np.int64)
+        used_columns = np.flatnonzero(used)
+        used_columns = used_columns[np.argsort(problem_ids[used_columns], kind='stable')]
+        remap = np.full(len(self.problem_ids), -1, dtype=np.int32)
+        remap[used_columns] = np.arange(len(used_columns), dtype=np.int32)
+
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+
+        return ([self.user_ids[row] for row in rows],
+                problem_ids[used_columns].tolist(),
+                indptr,
+                remap[columns],
+                levels.astype(np.float64))
+
+    def build_solvers_index(self):
+        """현재 풀이 기록으로 문제별 역색인 생성 (사용자는 행 순서대로 나열)"""
+        rows, lengths, columns, levels = self._live_arrays()
+        user_rows = np.repeat(np.asarray(rows, dtype=np.intc), lengths)
+
+        order = np.argsort(columns, kind='stable')
+        sorted_columns = columns[order]
+        boundaries = np.flatnonzero(np.diff(sorted_columns)) + 1
+        starts = np.concatenate(([0], boundaries)).astype(np.int64)
+
+        index = ProblemSolversIndex(self)
+        for start, column_rows, column_levels in zip(
+            starts.tolist(),
+            np.split(user_rows[order], boundaries),
+            np.split(levels[order], boundaries)
+        ):
+            if len(column_rows) == 0:
+                continue
+            problem = self.problem_ids[sorted_columns[start]]
+            index._rows[problem] = _to_array('i', column_rows)
+            index._levels[problem] = _to_array('b', column_levels)
+        return index
+
+    def to_dict(self):
+        """모델 파일 저장용 {사용자: {문제 ID: 난이도}} 딕셔너리로 변환"""
+        return {user: dict(self[user].items()) for user in self}
+
+    @classmethod
+    def from_dict(cls, user_item_matrix):
+        """{사용자: {문제 ID: 난이도}} 딕셔너리에서 생성"""
+        store = cls()
+        for user, solved in user_item_matrix.items():
+            store[user] = solved
+        return store
+
+    def add_arrays(self, handles, user_codes, problem_ids, levels):
+        """
+        정수 배열로 된 풀이 기록 묶음(CSV 청크 하나 등)을 추가
+        handles[user_codes[i]] 사용자가 problem_ids[i] 문제를 levels[i] 난이도로 풀었음
+        같은 사용자-문제 쌍이 이미 있거나 묶음 안에서 다시 나오면 먼저 들어온 기록을 유지
+        새 문제는 처음 나온 순서로 번호를 받으므로 다 추가한 뒤 sort_problem_columns()로 정리
+        """
+        user_codes = np.asarray(user_codes)
+        levels = np.asarray(levels)
+        if len(user_codes) == 0:
+            return
+
+        unique_problems, inverse = np.unique(np.asarray(problem_ids), return_inverse=True)
+        column_map = np.array([self.intern_problem(problem) for problem in unique_problems.tolist()], dtype=np.intc)
+        columns = column_map[inverse]
+
+        # 사용자, 문제 번호, 원래 순서로 정렬한 뒤 같은 쌍은 첫 기록만 남김
+        order = np.lexsort((np.arange(len(user_codes)), columns, user_codes))
+        sorted_users = user_codes[order]
+        sorted_columns = columns[order]
+        sorted_levels = levels[order]
+        keep = np.ones(len(order), dtype=bool)
+        keep[1:] = (sorted_users[1:] != sorted_users[:-1]) | (sorted_columns[1:] != sorted_columns[:-1])
+        sorted_users = sorted_users[keep]
+        sorted_columns = sorted_columns[keep]
+        sorted_levels = sorted_levels[keep]
+
+        boundaries = np.flatnonzero(np.diff(sorted_users)) + 1
+        starts = np.concatenate(([0], boundaries)).tolist()
+        ends = np.concatenate((boundaries, [len(sorted_users)])).tolist()
+        for start, end in zip(starts, ends):
+            row = self.intern_user(handles[sorted_users[start]])
+            row_columns = sorted_columns[start:end]
+            row_levels = sorted_levels[start:end]
+            if self._columns[row] is None:
+                self._n_users += 1
+            else:
+                row_columns, row_levels = self._merge_row(row, row_columns, row_levels)
+            self._columns[row] = _to_array('i', row_columns)
+            self._levels[row] = _to_array('b', row_levels)
+
+    def _merge_row(self, row, columns, levels):
+        """이미 있는 행에 정렬된 기록을 합침 (같은 문제는 이미 있던 기록을 유지)"""
+        merged_columns = np.concatenate((np.frombuffer(self._columns[row], dtype=np.intc), columns))
+        merged_levels = np.concatenate((np.frombuffer(self._levels[row], dtype=np.int8), levels))
+        order = np.argsort(merged_columns, kind='stable')
+        merged_columns = merged_columns[order]
+        keep = np.ones(len(order), dtype=bool)
+        keep[1:] = merged_columns[1:] != merged_columns[:-1]
+        return merged_columns[keep], merged_levels[order][keep]
+
+    def sort_problem_columns(self):
+        """문제 번호를 문제 ID 순서로 다시 매겨 행 안의 정렬 순서가 문제 ID 순서와 같도록 함"""
+        problem_ids = np.asarray(self.problem_ids, dtype=np.int64)
+        order = np.argsort(problem_ids, kind='stable')
+        if np.array_equal(order, np.arange(len(order))):
+            return
+
+        remap = np.empty(len(order), dtype=np.intc)
+        remap[order] = np.arange(len(order), dtype=np.intc)
+        for row, columns in enumerate(self._columns):
+            if columns is None:
+                continue
+            new_columns = remap[np.frombuffer(columns, dtype=np.intc)]
+            row_order = np.argsort(new_columns, kind='stable')
+            self._columns[row] = _to_array('i', new_columns[row_order])
+            self._levels[row] = _to_array('b', np.frombuffer(self._levels[row], dtype=np.int8)[row_order])
+
+        self.problem_ids = problem_ids[order].tolist()
+        self.problem_index = {problem: column for column, problem in enumerate(self.problem_ids)}
+
+    def norms(self):
+        """사용자별 풀이 기록 벡터 크기 {사용자: norm}"""
+        result = {}
+        for row, levels in enumerate(self._levels):
+            if levels is not None:
+                values = np.frombuffer(levels, dtype=np.int8).astype(np.float64)
+                result[self.user_ids[row]] = float(np.sqrt(values.dot(values)))
+        return result
+
+    def n_interactions(self):
+        """저장된 전체 풀이 기록 수"""
+        return sum(len(columns) for columns in self._columns if columns is not None)
+
+    @classmethod
+    def from_arrays(cls, handles, user_codes, problem_ids, levels):
+        """
+        정수 배열에서 한 번에 생성
+        handles[user_codes[i]] 사용자가 problem_ids[i] 문제를 levels[i] 난이도로 풀었음
+        (같은 사용자-문제 쌍은 처음 나온 기록만 사용)
+        """
+        store = cls()
+        store.add_arrays(handles, user_codes, problem_ids, levels)
+        store.sort_problem_columns()
+        return store
+
+
+class ProblemSolversIndex(MutableMapping):
+    """
+    InteractionStore의 인터닝 테이블을 함께 쓰는 {문제 ID: [(사용자, 난이도), ...]} 역색인
+    값은 읽을 때마다 새 목록으로 만들어지므로 고칠 때는 목록을 다시 대입해야 함
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._rows = {}
+        self._levels = {}
+
+    def __getitem__(self, problem):
+        rows = self._rows[problem]
+        user_ids = self.store.user_ids
+        return [(user_ids[row], level) for row, level in zip(rows, self._levels[problem])]
+
+    def __contains__(self, problem):
+        try:
+            return problem in self._rows
+        except TypeError:
+            return False
+
+    def __setitem__(self, problem, solvers):
+        problem = int(problem)
+        self._rows[problem] = array('i', (self.store.intern_user(user) for user, _ in solvers))
+        self._levels[problem] = array('b', (int(level) for _, level in solvers))
+
+    def __delitem__(self, problem):
+        del self._rows[problem]
+        del self._levels[problem]
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __len__(self):
+        return len(self._rows)
@@ -0,0 +1,257 @@
+import os
+import pickle
+from collections import defaultdict
+
+import numpy as np
+
+from interaction_store import InteractionStore
+from metrics import timed, cache_lookups
+from neighbor_store import NeighborStore
+from simple_recommendation_engine import CollaborativeRecommenderBase, SPARSE_AVAILABLE
+
+if SPARSE_AVAILABLE:
+    from scipy import sparse
+
+# 문제별로 저장할 유사 문제 수
+DEFAULT_ITEM_TOP_K = 50
+
+class ItemCollaborativeRecommender(CollaborativeRecommenderBase):
+    def __init__(self, csv_file_path=None, n_item_neighbors=DEFAULT_ITEM_TOP_K, quantize=False):
+        """
+        문제 기반(item-item) 협업 필터링 추천 시스템
+        문제 간 유사도를 미리 계산해 문제별 top-K 이웃만 저장하고,
+        요청자가 푼 문제들의 이웃 목록을 합산해 추천하므로
+        요청 한 번의 비용은 요청자의 풀이 기록 길이에만 비례함
+
+        n_item_neighbors: 문제별로 저장할 유사 문제 수 (top-K)
+        """
+        self.n_item_neighbors = n_item_neighbors
+        self.item_neighbors = None
+        super().__init__(csv_file_path, quantize=quantize)
+
+    def _train_sparse(self, block_size, n_workers=1):
+        """문제 x 사용자 행렬의 열 벡터 간 코사인 유사도를 블록 단위로 계산"""
+        matrix = self._build_sparse_matrix()
+        item_matrix = matrix.T.tocsr()
+
+        norms = np.sqrt(np.asarray(item_matrix.multiply(item_matrix).sum(axis=1)).ravel())
+        inv_norms = np.zeros_like(norms)
+        nonzero = norms > 0
+        inv_norms[nonzero] = 1.0 / norms[nonzero]
+
+        normalized = sparse.diags(inv_norms).dot(item_matrix).tocsr()
+        normalized_t = normalized.T.tocsr()
+
+        problems = [int(problem) for problem in self.problem_ids]
+        self.item_neighbors = NeighborStore(problems, k=self.n_item_neighbors, quantize=self.quantize)
+        self._compute_neighbor_blocks(self.item_neighbors, normalized, normalized_t, block_size, n_workers)
+
+    def _train_pure_python(self):
+        """scipy가 없을 때 사용하는 순수 Python 학습 (같은 사용자가 푼 문제 쌍만 계산)"""
+        item_norms = defaultdict(float)
+        for user_problems in self.user_item_matrix.values():
+            for problem, level in user_problems.items():
+                item_norms[int(problem)] += level ** 2
+
+        problems = sorted(item_norms)
+        self.item_neighbors = NeighborStore(problems, k=self.n_item_neighbors, quantize=self.quantize)
+
+        for i, problem in enumerate(problems):
+            print(f"   진행률: {i+1}/{len(problems)}", end='\r')
+
+            dot_products = defaultdict(float)
+            for user, level in self.problem_solvers.get(problem, ()):
+                for other, other_level in self.user_item_matrix[user].items():
+                    dot_products[int(other)] += level * other_level
+
+            norm = item_norms[problem] ** 0.5
+            indices = []
+            scores = []
+            for other, dot_product in dot_products.items():
+                other_norm = item_norms[other] ** 0.5
+                if norm > 0 and other_norm > 0:
+                    indices.append(self.item_neighbors.user_index[other])
+                    scores.append(dot_product / (norm * other_norm))
+            self.item_neighbors.set_from_scores(i, indices, scores)
+
+    def _score_from_history(self, solved_problems_levels, n_recommendations, tag_name=None):
+        """
+        푼 문제들의 이웃 목록을 합산해 추천 점수 계산
+        점수 = sum(문제 간 유사도 * 요청자가 푼 문제의 난이도)
+        """
+        recommendations = defaultdict(float)
+
+        for problem, level in solved_problems_levels.items():
+            for neighbor, similarity in self.item_neighbors.neighbors(int(problem)):
+                if neighbor not in solved_problems_levels:
+                    recommendations[neighbor] += similarity * level
+
+        sorted_recommendations = sorted(
+            recommendations.items(),
+            key=lambda x: x[1],
+            reverse=True
+        )
+
+        result = []
+        with cache_lookups('tag_index') as lookups:
+            for problem_id, score in sorted_recommendations:
+                if len(result) >= n_recommendations:
+                    break
+                if score <= 0:
+                    continue
+                if tag_name is not None and not self._is_tag_problem(problem_id, tag_name, lookups):
+                    continue
+                result.append({
+                    'problem_id': int(problem_id),
+                    'estimated_rating': float(score),
+                    'actual_rating': None
+                })
+
+        return result
+
+    def get_user_recommendations(self, user_id, n_recommendations=10):
+        """특정 사용자에게 문제 추천"""
+        if not self.trained:
+            raise ValueError("❌ 먼저 모델을 학습해주세요!")
+
+        if user_id not in self.user_item_matrix:
+            print(f"⚠️ 사용자 '{user_id}'를 찾을 수 없습니다.")
+            return []
+
+        print(f"🎯 '{user_id}' 사용자를 위한 문제 기반 추천 생성 중...")
+        solved = {int(problem): level for problem, level in self.user_item_matrix[user_id].items()}
+        with timed('scoring'):
+            return self._score_from_history(solved, n_recommendations)
+
+    def get_recommendations_for_user_history(self, user_handle, solved, n_recommendations=10):
+        """
+        풀이 기록만으로 실시간 추천 생성
+
+        Parameters:
+        user_handle: 사용자 핸들
+        solved: {문제 ID: 난이도} 매핑 또는 (문제 ID 배열, 난이도 배열) 쌍
+        n_recommendations: 추천할 문제 수
+        """
+        if not self.trained:
+            raise ValueError("❌ 먼저 모델을 학습해주세요!")
+
+        new_user_problems = self._solved_mapping(solved)
+        if not new_user_problems:
+            print("❌ 사용자 데이터가 비어있습니다.")
+            return []
+
+        print(f"🎯 새 사용자 '{user_handle}'을 위한 문제 기반 추천 생성 중...")
+
+        with timed('scoring'):
+            result = self._score_from_history(new_user_problems, n_recommendations)
+
+        if not result:
+            print("   - 추천할 수 있는 문제가 없습니다.")
+            return self._get_popular_recommendations(set(new_user_problems), n_recommendations)
+
+        print(f"✅ 새 사용자 추천 완료! 상위 {len(result)}개 문제")
+        return result
+
+    def get_recommendations_for_user_history_by_tag(self, user_handle, solved, tag_name, n_recommendations=10):
+        """
+        풀이 기록만으로 특정 태그 문제 추천
+        solved: {문제 ID: 난이도} 매핑 또는 (문제 ID 배열, 난이도 배열) 쌍
+        """
+        if not self.trained:
+            raise ValueError("❌ 먼저 모델을 학습해주세요!")
+
+        new_user_problems = self._solved_mapping(solved)
+        if not new_user_problems:
+            print("❌ 사용자 데이터가 비어있습니다.")
+            return []
+
+        print(f"🎯 새 사용자 '{user_handle}'에게 '{tag_name}' 태그 문제 기반 추천 중...")
+
+        with timed('scoring'):
+            result = self._score_from_history(new_user_problems, n_recommendations, tag_name=tag_name)
+
+        if not result:
+            print(f"   - '{tag_name}' 태그 문제를 찾을 수 없습니다.")
+            return self._get_popular_recommendations_by_tag(set(new_user_problems), tag_name, n_recommendations)
+
+        print(f"✅ '{tag_name}' 태그 추천 완료! {len(result)}개 문제")
+        return result
+
+    def upsert_user(self, user, solved):
+        """
+        사용자 풀이 기록만 갱신
+        문제 간 유사도는 사용자 한 명으로 크게 바뀌지 않으므로 compact() 때 다시 계산
+        """
+        if not self.trained:
+            raise ValueError("❌ 먼저 모델을 학습해주세요!")
+
+        solved = {int(problem): level for problem, level in solved.items()}
+        old_problems = self.user_item_matrix.get(user)
+        if old_problems == solved:
+            return False
+
+        if old_problems is not None:
+            self._remove_postings(user, old_problems)
+        self.user_item_matrix[user] = solved
+        self._add_postings(user, solved)
+        self.update_user_norm(user)
+
+        self._record_update('upsert', user, solved)
+        return True
+
+    def remove_user(self, user):
+        old_problems = self.user_item_matrix.get(user)
+        if old_problems is None:
+            return False
+
+        self._remove_postings(user, old_problems)
+        del self.user_item_matrix[user]
+        self.update_user_norm(user)
+
+        self._record_update('remove', user, None)
+        return True
+
+    def save_model(self, model_path="item_recommendation_model.pkl"):
+        """학습된 모델 저장"""
+        if not self.trained:
+            raise ValueError("❌ 저장할 학습된 모델이 없습니다!")
+
+        model_data = {
+            'engine': 'item',
+            'user_item_matrix': self._user_item_dict(),
+            'user_norms': dict(self.user_norms),
+            'item_neighbors': self.item_neighbors.to_dict(),
+            'popular_problems': self.popular_problems,
+            'popular_problems_by_tag': dict(self.popular_problems_by_tag),
+            'problem_data': self.problem_data
+        }
+
+        with open(model_path, 'wb') as f:
+            pickle.dump(model_data, f)
+
+        self.pending_updates = []
+        print(f"💾 문제 기반 모델이 {model_path}에 저장되었습니다.")
+        print(f"   - 문제 이웃 저장소 크기: {self.item_neighbors.nbytes:,} bytes "
+              f"(문제당 {self.item_neighbors.k}개)")
+
+    def load_model(self, model_path="item_recommendation_model.pkl"):
+        """저장된 모델 로드"""
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"❌ {model_path} 파일을 찾을 수 없습니다!")
+
+        with open(model_path, 'rb') as f:
+            model_data = pickle.load(f)
+
+        if model_data.get('engine') != 'item':
+            raise ValueError(f"❌ {model_path}는 문제 기반 모델 파일이 아닙니다!")
+
+        self.user_item_matrix = InteractionStore.from_dict(model_data['user_item_matrix'])
+        self.user_norms = dict(model_data['user_norms'])
+        self.item_neighbors = NeighborStore.from_dict(model_data['item_neighbors'])
+        self.popular_problems = model_data['popular_problems']
+        self.popular_problems_by_tag = model_data['popular_problems_by_tag']
+        self.problem_data = model_data['problem_data']
+        self._build_problem_solvers_index()
+        self.trained = True
+
+        print(f"📦 문제 기반 모델이 {model_path}에서 로드되었습니다.")
@@ -1,16 +1,38 @@
 from flask import Flask, jsonify, render_template, redirect, url_for, request, session
 from flask_login import login_user, logout_user, login_required, LoginManager, UserMixin, current_user
-import requests
-import json
 import os
+import asyncio
+import importlib.util
+import threading
+import time
+from bisect import bisect_right
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from metrics import METRICS, timed, count_cache_lookup, cache_lookups
+from solvedac_client import get_client, RateLimiter
+from async_solvedac_client import get_async_client, ASYNC_HTTP_AVAILABLE
+from recommendation_cache import RecommendationCache
+from problem_store import ProblemStore
+from solved_history_store import SolvedHistoryStore, SolvedHistory
+from tag_catalog import TagCatalog
+from rwlock import ReadWriteLock
+from delta_log import DeltaLog
 
 # 추천 시스템 임포트 추가
 try:
     from simple_recommendation_engine import SimpleCollaborativeRecommender
+    from item_recommendation_engine import ItemCollaborativeRecommender
+    from als_recommendation_engine import ALSRecommender
+    RECOMMENDER_CLASSES = {
+        'user': SimpleCollaborativeRecommender,
+        'item': ItemCollaborativeRecommender,
+        'als': ALSRecommender,
+    }
     RECOMMENDER_AVAILABLE = True
     print("추천 시스템 모듈 로드 성공")
 except ImportError as e:
     print(f"추천 시스템 모듈 로드 실패: {e}")
+    RECOMMENDER_CLASSES = {}
     RECOMMENDER_AVAILABLE = False
 
 class User(UserMixin):
@@ -25,49 +47,150 @@ class User(UserMixin):
         return f"USER: {self.id}"
 
 userInfo = {'a' : User('a', 'a')}
-user = None
+userInfoLock = threading.Lock()
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'my-super-secret-key'
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login' 
-loggedIn = False
 
 # 🤖 추천 시스템 전역 변수 추가
+# 추천 계산은 읽기 잠금으로 동시에 실행하고, 사용자 반영과 모델 교체만 쓰기 잠금으로 실행
 recommender = None
+recommenderLock = ReadWriteLock()
 
-def initialize_recommender():
-    """추천 시스템 초기화"""
-    global recommender
+# 로그인한 사용자의 풀이 기록을 모델에 반영한 증분 갱신 파일 (프로세스마다 따로 덧붙임)
+DELTA_DIR = "static/recommendation_delta"
+deltaLog = DeltaLog(DELTA_DIR)
+
+# 증분 갱신이 이만큼 쌓이거나, 갱신이 있는 채로 이 시간(초)이 지나면 백그라운드에서 재학습해 정리
+COMPACT_AFTER_UPDATES = 500
+COMPACT_INTERVAL = 6 * 3600
+compactExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-compact")
+compactLock = threading.Lock()
+compactFuture = None
+lastCompactedAt = time.monotonic()
+
+# 사용할 추천 엔진 (환경 변수 RECOMMENDER_ENGINE=user/item/als 로 선택)
+# 엔진 이름 -> (pickle 모델 파일, 바이너리 모델 디렉터리)
+RECOMMENDER_ENGINES = {
+    'user': ("static/simple_recommendation_model.pkl", "static/simple_recommendation_model"),
+    'item': ("static/item_recommendation_model.pkl", None),
+    'als': ("static/als_recommendation_model.pkl", None),
+}
+RECOMMENDER_ENGINE = os.environ.get("RECOMMENDER_ENGINE", "user")
+
+# 사용자별 추천 결과 캐시 (키: 핸들, 태그, 엔진 버전)
+# 모델을 다시 로드하면 엔진 버전이 바뀌므로 이전 결과는 더 이상 쓰이지 않음
+recommendation_cache = RecommendationCache(max_entries=1024, ttl_seconds=600, revalidate_after=60)
+recommender_version = None
+_model_generation = 0
+
+# problem_all.csv 기반 문제 정보 저장소 (findProblem과 추천 엔진의 태그 색인이 함께 사용)
+PROBLEM_ALL_PATH = "static/problem_all.csv"
+problem_store = None
+
+# 로컬에 없는 문제 정보 조회 설정
+# problem/lookup 한 번에 넘길 최대 문제 수, 일괄 조회가 안 될 때 동시에 보낼 개별 요청 수
+PROBLEM_LOOKUP_BATCH_SIZE = 100
+PROBLEM_FETCH_WORKERS = 8
+problemFetchExecutor = ThreadPoolExecutor(max_workers=PROBLEM_FETCH_WORKERS, thread_name_prefix="problem-fetch")
+
+# 사용자 풀이 기록 조회 설정
+# search/problem은 한 페이지에 50문제씩 반환하며, 두 번째 페이지부터는 초당 요청 수를 제한해 동시에 가져옴
+SOLVED_PAGE_SIZE = 50
+SOLVED_PAGE_WORKERS = 4
+SOLVED_PAGE_RATE_LIMIT = 8
+solvedPageExecutor = ThreadPoolExecutor(max_workers=SOLVED_PAGE_WORKERS, thread_name_prefix="solved-page")
+solvedPageLimiter = RateLimiter(SOLVED_PAGE_RATE_LIMIT, burst=SOLVED_PAGE_WORKERS)
+
+# 사용자별 풀이 기록 저장소 (추천 요청은 저장된 기록을 바로 쓰고, 오래된 기록은 백그라운드에서 갱신)
+SOLVED_HISTORY_PATH = "static/solved_history.sqlite3"
+SOLVED_HISTORY_STALE_AFTER = 600
+solvedHistoryStore = SolvedHistoryStore(SOLVED_HISTORY_PATH, stale_after=SOLVED_HISTORY_STALE_AFTER)
+historyRefreshExecutor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="history-refresh")
+historyRefreshing = set()
+historyRefreshLock = threading.Lock()
+
+# 태그 목록 캐시 (하루에 한 번 백그라운드에서 갱신, 브라우저는 1시간 동안 재사용)
+TAG_LIST_PATH = "static/tag_list.json"
+TAG_LIST_REFRESH_INTERVAL = 86400
+TAG_LIST_MAX_AGE = 3600
+tagCatalog = TagCatalog(TAG_LIST_PATH, refresh_interval=TAG_LIST_REFRESH_INTERVAL)
+
+def getProblemStore():
+    """문제 정보 저장소 (처음 호출할 때 한 번만 로드)"""
+    global problem_store
+    if problem_store is None:
+        problem_store = ProblemStore(PROBLEM_ALL_PATH)
+    return problem_store
+
+def saveCompactedModel(model, model_path, binary_model_path):
+    """
+    증분 갱신을 반영해 정리한 모델 저장
+    바이너리 모델 디렉터리(git에 포함되지 않음)가 있는 엔진은 그쪽에만 저장해
+    저장소에 포함된 기본 pickle 모델은 덮어쓰지 않음
+    """
+    if binary_model_path:
+        model.save_model_binary(binary_model_path)
+    else:
+        model.save_model(model_path)
+
+def initialize_recommender(engine=None):
+    """
+    추천 시스템 초기화
+    서버 시작 때와 증분 갱신 정리(scheduleCompaction) 때 호출되며, 새 모델을 다 만든 뒤 한 번에 교체함
+    """
+    global recommender, recommender_version, _model_generation, lastCompactedAt
     
     if not RECOMMENDER_AVAILABLE:
         print("❌ 추천 시스템이 비활성화되었습니다.")
         return None
     
     try:
+        engine = engine or RECOMMENDER_ENGINE
+        if engine not in RECOMMENDER_ENGINES:
+            print(f"⚠️ 알 수 없는 추천 엔진 '{engine}', 기본 엔진(user)을 사용합니다.")
+            engine = 'user'
+        model_path, binary_model_path = RECOMMENDER_ENGINES[engine]
+        
         data_path = "static/problem_for_each_user.csv"
-        model_path = "static/simple_recommendation_model.pkl"
+        problem_all_path = PROBLEM_ALL_PATH
         
+        print(f"📁 추천 엔진: {engine}")
         print(f"📁 데이터 파일 경로: {data_path}")
         print(f"📁 모델 파일 경로: {model_path}")
         print(f"📁 데이터 파일 존재: {os.path.exists(data_path)}")
         print(f"📁 모델 파일 존재: {os.path.exists(model_path)}")
+        if binary_model_path:
+            print(f"📁 바이너리 모델 존재: {RECOMMENDER_CLASSES[engine].has_model_binary(binary_model_path)}")
+        print(f"📁 문제 목록 파일 존재: {os.path.exists(problem_all_path)}")
         
-        recommender = SimpleCollaborativeRecommender()
-        print("✅ SimpleCollaborativeRecommender 객체 생성 완료")
+        model = RECOMMENDER_CLASSES[engine]()
+        print(f"✅ {type(model).__name__} 객체 생성 완료")
 
-        if os.path.exists(model_path):
+        if binary_model_path and model.has_model_binary(binary_model_path):
+            print("💾 저장된 바이너리 모델을 로드합니다...")
+            model.load_model_binary(binary_model_path)
+            print("✅ 모델 로드 완료")
+        elif os.path.exists(model_path):
             print("💾 저장된 모델을 로드합니다...")
-            recommender.load_model(model_path)
+            model.load_model(model_path)
             print("✅ 모델 로드 완료")
+            # 다음 실행부터는 mmap으로 바로 열 수 있도록 바이너리 형식으로 변환
+            if binary_model_path:
+                model.save_model_binary(binary_model_path)
+                print("✅ 바이너리 모델 변환 완료")
         elif os.path.exists(data_path):
             print("🤖 새로운 모델을 학습합니다...")
-            recommender.load_data(data_path)
+            model.load_data(data_path)
             print("✅ 데이터 로드 완료")
-            recommender.train_model()
+            model.train_model()
             print("✅ 모델 학습 완료")
-            recommender.save_model(model_path)
+            model.save_model(model_path)
+            if binary_model_path:
+                model.save_model_binary(binary_model_path)
             print("✅ 모델 저장 완료")
         else:
             print("❌ 데이터가 없습니다.")
@@ -80,15 +203,46 @@ def initialize_recommender():
             create_test_data()
             print("✅ 테스트 데이터 생성 완료")
             
-            recommender.load_data(data_path)
+            model.load_data(data_path)
             print("✅ 데이터 로드 완료")
-            recommender.train_model()
+            model.train_model()
             print("✅ 모델 학습 완료")
-            recommender.save_model(model_path)
+            model.save_model(model_path)
+            if binary_model_path:
+                model.save_model_binary(binary_model_path)
             print("✅ 모델 저장 완료")
         
-        print(f"🎯 추천 시스템 초기화 성공! trained: {recommender.trained}")
-        return recommender
+        # 지난 실행과 종료된 워커, 그리고 이 프로세스에서 쌓인 증분 갱신을 반영하고 재학습으로 정리
+        deltaLog.seal()
+        delta_files = deltaLog.sealed_files()
+        if delta_files:
+            if sum(model.load_delta(path) for path in delta_files):
+                model.compact()
+                saveCompactedModel(model, model_path, binary_model_path)
+                print("✅ 증분 갱신 반영 완료")
+            deltaLog.remove(delta_files)
+        
+        # 태그별 추천에서 문제마다 API를 호출하지 않도록 로컬 태그 색인 로드
+        if os.path.exists(problem_all_path):
+            model.set_problem_store(getProblemStore())
+            print("✅ 태그 색인 로드 완료")
+        
+        # 준비가 끝난 모델로 한 번에 교체 (진행 중인 추천 계산이 끝날 때까지 기다림)
+        with recommenderLock.write_locked():
+            # 정리하는 동안 이 프로세스에 새로 쌓인 갱신도 반영 (이미 파일에 있으므로 다시 쓰지 않음)
+            deltaLog.flush(model)
+            active_path = deltaLog.active_path()
+            if os.path.exists(active_path):
+                model.load_delta(active_path)
+                model.take_pending_updates()
+            recommender = model
+            lastCompactedAt = time.monotonic()
+            _model_generation += 1
+            recommender_version = f"{engine}-{_model_generation}"
+            recommendation_cache.clear()
+        
+        print(f"🎯 추천 시스템 초기화 성공! trained: {model.trained}")
+        return model
             
     except Exception as e:
         print(f"❌ 추천 시스템 초기화 실패: {e}")
@@ -96,18 +250,14 @@ def initialize_recommender():
         traceback.print_exc()
         return None
 
-def makeRequest(url, querystring):
-    headers = {"Content-Type": "application/json"}
-    try:
-        response = requests.request("GET", url, headers=headers, params=querystring)
-        response.raise_for_status()
-        return response
-    except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
-        print(f"API Error: {e}")
-        return None
+def makeRequest(path, querystring):
+    """공용 solved.ac 클라이언트로 GET 요청 (path는 API 기본 주소 기준 경로, 실패 시 None)"""
+    return get_client().get(path, querystring)
     
 def findUser(handle):
-    response = makeRequest("https://solved.ac/api/v3/search/user", {"query": handle})
+    response = makeRequest("search/user", {"query": handle})
+    if(response is None):
+        return False
     temp = response.json().get("items", [])
     if(temp is None):
         return False
@@ -116,100 +266,330 @@ def findUser(handle):
     else:
         return False
 
-def findProblem(problemId):
-    response = makeRequest("https://solved.ac/api/v3/problem/show", {"problemId": problemId})
-    if(response is None):
+def getUserSolvedCount(user_handle):
+    """solved.ac에 기록된 사용자의 푼 문제 수 (실패 시 None)"""
+    response = makeRequest("user/show", {"handle": user_handle})
+    if response is None:
         return None
+    return response.json().get("solvedCount")
+
+def solvedCountLoader(user_handle):
+    """
+    요청 하나에서 풀이 수를 한 번만 조회하는 함수를 반환
+    캐시 재검증 때 조회한 값을 캐시 미스 뒤의 추천 계산에서 그대로 씀
+    """
+    loaded = []
+    def load():
+        if not loaded:
+            loaded.append(getUserSolvedCount(user_handle))
+        return loaded[0]
+    return load
+
+def fetchProblem(problemId):
+    """solved.ac에서 문제 하나의 정보 조회 (실패 시 None)"""
+    return get_client().get_json("problem/show", {"problemId": problemId})
+
+def problemLookupQueries(problemIds):
+    """problem/lookup 요청마다 보낼 쿼리 (PROBLEM_LOOKUP_BATCH_SIZE개씩 묶음)"""
+    return [
+        {"problemIds": ",".join(str(p) for p in problemIds[start:start + PROBLEM_LOOKUP_BATCH_SIZE])}
+        for start in range(0, len(problemIds), PROBLEM_LOOKUP_BATCH_SIZE)
+    ]
+
+def parseLookupResults(results):
+    """problem/lookup 응답들을 {문제 ID: 정보}로 합침 (실패한 묶음은 빠짐)"""
+    found = {}
+    for items in results:
+        if not isinstance(items, list):
+            continue
+        for problem_info in items:
+            if isinstance(problem_info, dict) and problem_info.get("problemId") is not None:
+                found[int(problem_info["problemId"])] = problem_info
+    return found
+
+def fetchedProblems(problemIds, infos):
+    """개별 조회 결과를 {문제 ID: 정보}로 모음 (가져오지 못한 문제는 빠짐)"""
+    return {problem_id: problem_info for problem_id, problem_info in zip(problemIds, infos) if problem_info is not None}
+
+def storedProblems(problem_ids):
+    """로컬 저장소에 있는 문제 정보 {문제 ID: 정보}와 없는 문제 ID 목록 (중복 ID는 한 번만)"""
+    store = getProblemStore()
+    results = {}
+    missing = []
+    with cache_lookups('problem_store') as lookups:
+        for problem_id in dict.fromkeys(problem_ids):
+            problem_info = store.get_problem(problem_id)
+            lookups.record(problem_info is not None)
+            if problem_info is None:
+                missing.append(problem_id)
+            else:
+                results[problem_id] = problem_info
+    return results, missing
+
+def storeFetchedProblems(results, fetched):
+    """네트워크에서 가져온 문제 정보를 저장소와 결과에 추가"""
+    store = getProblemStore()
+    for problem_id, problem_info in fetched.items():
+        store.add_problem_info(problem_info, problem_id)
+        results[problem_id] = problem_info
+
+def lookupProblems(problemIds):
+    """problem/lookup으로 여러 문제를 한 번에 조회해 {문제 ID: 정보} 반환 (실패한 묶음은 빠짐)"""
+    return parseLookupResults(
+        get_client().get_json("problem/lookup", query) for query in problemLookupQueries(problemIds)
+    )
+
+def findProblems(problemIds):
+    """
+    여러 문제의 정보를 입력 순서대로 반환 (가져오지 못한 문제 자리는 None)
+    로컬 저장소 -> problem/lookup 일괄 조회 -> 남은 문제만 개별 요청을 동시에 보내는 순서로 시도하고
+    네트워크에서 가져온 정보는 저장소에 추가
+    """
+    with timed('find_problems'):
+        problem_ids = [int(problem_id) for problem_id in problemIds]
+        results, missing = storedProblems(problem_ids)
+        
+        if missing:
+            fetched = lookupProblems(missing)
+            remaining = [problem_id for problem_id in missing if problem_id not in fetched]
+            if remaining:
+                fetched.update(fetchedProblems(remaining, problemFetchExecutor.map(fetchProblem, remaining)))
+            storeFetchedProblems(results, fetched)
+        
+        return [results.get(problem_id) for problem_id in problem_ids]
+
+def findProblem(problemId):
+    return findProblems([problemId])[0]
+    
+
+def fetchSolvedPage(user_handle, page):
+    """solved_by 검색 결과 한 페이지 (문제 ID 오름차순, 실패 시 None)"""
+    solvedPageLimiter.acquire()
+    return get_client().get_json("search/problem", solvedPageQuery(user_handle, page))
+
+def fetchSolvedPages(user_handle, pages):
+    """여러 페이지를 동시에 가져와 {페이지: [(문제 ID, 난이도), ...]} 반환 (실패한 페이지는 빠짐)"""
+    pages = list(pages)
+    return parseSolvedPages(pages, solvedPageExecutor.map(lambda page: fetchSolvedPage(user_handle, page), pages))
+
+def solvedPageQuery(user_handle, page):
+    return {"query": f"solved_by:{user_handle}", "page": page, "sort": "id", "direction": "asc"}
+
+def solvedEntries(items):
+    return [(int(item.get("problemId")), item.get("level") or 0) for item in items]
+
+def parseFirstSolvedPage(response):
+    """첫 페이지 응답의 (문제 목록, 전체 풀이 수)"""
+    first_page = solvedEntries(response.get("items", []))
+    return first_page, response.get("count", len(first_page))
+
+def parseSolvedPages(pages, responses):
+    """페이지별 응답을 {페이지: [(문제 ID, 난이도), ...]}로 모음 (실패한 페이지는 빠짐)"""
+    return {
+        page: solvedEntries(response.get("items", []))
+        for page, response in zip(pages, responses) if response is not None
+    }
+
+def solvedPageCount(count):
+    return -(-count // SOLVED_PAGE_SIZE)
+
+def joinSolvedPages(pages, count):
+    """
+    페이지 순서대로 이어 붙인 전체 풀이 기록
+    반환값: (문제 목록, 모든 페이지를 가져왔는지 여부)
+    """
+    entries = []
+    for page in sorted(pages):
+        entries.extend(pages[page])
+    return entries, len(entries) == count
+
+def fetchSolvedHistory(user_handle, first_page, count):
+    """첫 페이지 이후의 모든 페이지를 동시에 가져와 전체 풀이 기록 반환 (joinSolvedPages와 같은 형식)"""
+    pages = fetchSolvedPages(user_handle, range(2, solvedPageCount(count) + 1))
+    pages[1] = first_page
+    return joinSolvedPages(pages, count)
+
+def saveSolvedHistory(user_handle, solved_count, entries, complete):
+    """
+    가져온 풀이 기록을 저장하고 SolvedHistory 반환
+    일부 페이지를 못 가져온 기록은 저장하지 않아 다음 호출에서 다시 전부 가져옴
+    """
+    if complete:
+        history = solvedHistoryStore.put(user_handle, solved_count, entries)
     else:
-        return response.json() # JSON 객체를 바로 반환
+        solvedHistoryStore.delete(user_handle)
+        history = SolvedHistory(user_handle, solved_count, time.time(),
+                                [problem_id for problem_id, _ in entries],
+                                [level for _, level in entries])
     
+    print(f"✅ 총 {len(history)}개의 문제 풀이 기록 수집 완료")
+    return history
 
-def getUserSolvedProblems(user_handle, max_pages=5):
+def refreshSolvedHistory(user_handle, stored, first_page, count):
     """
-    solved.ac API에서 특정 사용자가 푼 문제들을 가져오는 함수
+    저장된 풀이 기록에 새로 푼 문제만 찾아 합침 (일관되게 합칠 수 없으면 None)
+    
+    목록이 문제 ID 순이므로 k페이지 마지막 문제 ID 이하인 저장된 문제 수를 세면
+    1~k페이지에 들어 있는 새 문제 수를 알 수 있음
+    새 문제 수가 늘지 않은 구간은 건너뛰고, 늘어난 구간만 반으로 나누며 가운데 페이지를 가져옴
+    (새 문제가 몇 개 없으면 전체 페이지 중 일부만 요청하게 됨)
     """
-    print(f"🔍 사용자 '{user_handle}'의 풀이 기록을 가져오는 중...")
+    known_ids = [problem_id for problem_id, _ in stored]
+    new_count = count - len(stored)
+    page_count = solvedPageCount(count)
     
-    solved_problems = []
-    page = 1
+    # 새 문제 하나를 찾는 데 최대 log2(페이지 수)번 요청하므로 새 문제가 많으면 전부 다시 가져오는 편이 나음
+    if new_count * page_count.bit_length() >= page_count:
+        return None
     
-    while page <= max_pages:
-        try:
-            response = makeRequest(
-                "https://solved.ac/api/v3/search/problem", 
-                {"query": f"solved_by:{user_handle}", "page": page}
-            )
-            
-            if response is None:
-                break
-                
-            temp = response.json().get("items", [])
-            if len(temp) == 0:
-                break
-            
-            for item in temp:
-                problem_id = item.get("problemId")
-                level = item.get("level")
-                title = item.get("titleKo")
-                
-                solved_problems.append({
-                    'user_handle': user_handle,
-                    'problem_id': problem_id,
-                    'level': level,
-                    'title': title
-                })
-            
-            page += 1
-            
-        except Exception as e:
-            print(f"❌ 페이지 {page} 가져오기 실패: {e}")
+    def newBefore(page, entries):
+        """1~page 페이지에 들어 있는 새 문제 수 (페이지가 예상과 다르면 None)"""
+        if len(entries) != SOLVED_PAGE_SIZE:
+            return None
+        value = page * SOLVED_PAGE_SIZE - bisect_right(known_ids, entries[-1][0])
+        return value if 0 <= value <= new_count else None
+    
+    pages = {1: first_page}
+    boundaries = {0: 0, page_count: new_count}
+    if page_count > 1:
+        boundaries[1] = newBefore(1, first_page)
+        if boundaries[1] is None:
+            return None
+    
+    while True:
+        points = sorted(boundaries)
+        wanted = []
+        for lo, hi in zip(points, points[1:]):
+            if boundaries[hi] < boundaries[lo]:
+                return None
+            if boundaries[hi] == boundaries[lo]:
+                continue
+            if hi - lo > 1:
+                wanted.append((lo + hi) // 2)
+            elif hi not in pages:
+                wanted.append(hi)
+        if not wanted:
             break
+        
+        fetched = fetchSolvedPages(user_handle, wanted)
+        if len(fetched) < len(wanted):
+            return None
+        for page, entries in fetched.items():
+            pages[page] = entries
+            if page < page_count:
+                boundaries[page] = newBefore(page, entries)
+                if boundaries[page] is None:
+                    return None
     
-    print(f"✅ 총 {len(solved_problems)}개의 문제 풀이 기록 수집 완료")
-    return solved_problems
+    known = set(known_ids)
+    new_entries = {}
+    for entries in pages.values():
+        for entry in entries:
+            if entry[0] not in known:
+                new_entries[entry[0]] = entry
+    if len(new_entries) != new_count:
+        return None
+    
+    print(f"🔄 새로 푼 문제 {new_count}개 반영 (페이지 {len(pages)}/{page_count}개 요청)")
+    return sorted(stored + list(new_entries.values()))
 
-def createUserDataFrame(user_handle):
-    """
-    특정 사용자의 데이터를 DataFrame 형태로 생성
+def getUserSolvedProblems(user_handle, solved_count=None):
     """
-    import pandas as pd
+    solved.ac API에서 특정 사용자가 푼 문제들을 가져와 저장소에 기록하는 함수
     
-    solved_problems = getUserSolvedProblems(user_handle)
+    첫 페이지로 전체 풀이 수를 확인한 뒤 나머지 페이지는 초당 요청 수를 제한해 동시에 가져옴
+    저장된 기록이 있으면 풀이 수가 그대로일 때는 첫 페이지만,
+    늘었으면 새로 푼 문제가 들어 있는 페이지만 가져와 합침
+    solved_count: user/show로 확인한 풀이 수 (저장소의 갱신 필요 여부 판단에 사용)
+    반환값: SolvedHistory (첫 페이지를 가져오지 못하면 None)
+    """
+    print(f"🔍 사용자 '{user_handle}'의 풀이 기록을 가져오는 중...")
     
-    if not solved_problems:
+    first = fetchSolvedPage(user_handle, 1)
+    if first is None:
+        print("❌ 페이지 1 가져오기 실패")
         return None
     
-    # DataFrame 생성
-    df = pd.DataFrame(solved_problems)
-    df.rename(columns={
-        'user_handle': 'SOLVER_HANDLE',
-        'problem_id': 'PROBLEM_ID',
-        'level': 'SOLVED_LVL'
-    }, inplace=True)
+    first_page, count = parseFirstSolvedPage(first)
     
-    return df[['SOLVER_HANDLE', 'PROBLEM_ID', 'SOLVED_LVL']]
+    history = solvedHistoryStore.get(user_handle)
+    
+    entries = None
+    if history is not None:
+        stored = history.entries()
+        if count == len(stored) and stored[:len(first_page)] == first_page:
+            entries = stored
+        elif count > len(stored):
+            entries = refreshSolvedHistory(user_handle, stored, first_page, count)
+    
+    complete = True
+    if entries is None:
+        entries, complete = fetchSolvedHistory(user_handle, first_page, count)
+    
+    if solved_count is None:
+        solved_count = count
+    return saveSolvedHistory(user_handle, solved_count, entries, complete)
 
+def refreshUserHistoryInBackground(user_handle, solved_count=None):
+    """풀이 기록 갱신을 백그라운드에 맡김 (같은 사용자의 갱신이 이미 진행 중이면 무시)"""
+    with historyRefreshLock:
+        if user_handle in historyRefreshing:
+            return
+        historyRefreshing.add(user_handle)
+    
+    def refresh():
+        try:
+            getUserSolvedProblems(user_handle, solved_count)
+        except Exception as e:
+            print(f"⚠️ 사용자 '{user_handle}' 풀이 기록 갱신 실패: {e}")
+        finally:
+            with historyRefreshLock:
+                historyRefreshing.discard(user_handle)
+    
+    historyRefreshExecutor.submit(refresh)
+
+def getUserHistory(user_handle, solved_count=None):
+    """
+    사용자 풀이 기록 반환 (SolvedHistory, 가져올 수 없으면 None)
+    저장된 기록이 있으면 바로 반환하고, 오래되었거나 풀이 수가 달라졌으면 백그라운드에서 갱신
+    저장된 기록이 없을 때만 solved.ac에서 직접 가져옴
+    """
+    history = storedUserHistory(user_handle, solved_count)
+    if history is None:
+        return getUserSolvedProblems(user_handle, solved_count)
+    return history
+
+def storedUserHistory(user_handle, solved_count=None):
+    """저장된 풀이 기록 (없으면 None), 오래되었거나 풀이 수가 달라졌으면 백그라운드 갱신을 예약"""
+    history = solvedHistoryStore.get(user_handle)
+    count_cache_lookup('solved_history', hit=history is not None)
+    if history is not None and solvedHistoryStore.is_stale(history, solved_count):
+        refreshUserHistoryInBackground(user_handle, solved_count)
+    return history
 
 @app.route('/getTagList', methods = ['GET'])
 def getTagList():
-    tagList = []
-    page = 1
-    while(True):
-        print(page)
-        response = makeRequest("https://solved.ac/api/v3/tag/list", {"page": page})
-        if(response is None):
-            break
-        temp = response.json().get("items", [])
-        if(len(temp) == 0):
-            break
-        tagList += ([{"en": tag.get("displayNames")[1].get("short").replace(' ', '_'), "ko": tag.get("displayNames")[0].get("short").replace(' ', '_')} for tag in temp])
-        page += 1
-    return jsonify({"items": tagList})
+    """메모리에 있는 태그 목록 반환 (ETag가 같으면 304, 오래된 목록은 백그라운드에서 갱신)"""
+    catalog = tagCatalog.get()
+    if catalog is None:
+        return jsonify({"items": []}), 503
+    
+    response = app.response_class(catalog.body, mimetype='application/json')
+    response.set_etag(catalog.etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = TAG_LIST_MAX_AGE
+    return response.make_conditional(request)
 
 @login_manager.user_loader
 def load_user(user_id):
     return userInfo.get(str(user_id))
 
+def currentUserId():
+    """현재 요청을 보낸 로그인 사용자의 핸들 (로그인하지 않았으면 None)"""
+    if current_user.is_authenticated:
+        return current_user.get_id()
+    return None
+
 @app.route("/")
 def index():
     return render_template('index.html')
@@ -220,13 +600,10 @@ def login():
         id = request.form.get('id')
         password = request.form.get('password')
         
-        global user
         user = userInfo.get(id)
         
         if user and user.password == password:
             login_user(user)
-            global loggedIn
-            loggedIn = True
             next_page = request.args.get('next')
             return redirect(next_page or url_for('index'))
         else:
@@ -236,8 +613,8 @@ def login():
 
 @app.route('/getLogin', methods=['GET'])
 def getLogin():
-    if loggedIn and user:
-        return jsonify({"items": [True, user.id, user.password]})
+    if current_user.is_authenticated:
+        return jsonify({"items": [True, current_user.id, current_user.password]})
     else:
         return jsonify({"items": [False]})
     
@@ -254,13 +631,13 @@ def register():
             return f"<h1>User '{id}' not found on solved.ac</h1>"
 
         new_user = User(id, password)
-        userInfo[id] = new_user
+        with userInfoLock:
+            # solved.ac 확인을 기다리는 동안 같은 ID가 먼저 등록되었을 수 있음
+            if id in userInfo:
+                return "<h1>This ID is already taken.</h1>"
+            userInfo[id] = new_user
 
-        global user
-        user = new_user
-        login_user(user)
-        global loggedIn
-        loggedIn = True
+        login_user(new_user)
         
         print(f"New user registered: {id}, Total users: {len(userInfo)}")
         return redirect(url_for('index'))
@@ -272,10 +649,6 @@ def register():
 def logout():
     logout_user()
     
-    global loggedIn, user
-    loggedIn = False
-    user = None
-    
     return redirect(url_for('index'))
 
 @app.route('/search', methods = ['GET', 'POST'])
@@ -284,9 +657,8 @@ def search():
         return render_template('search.html')
     else:
         problems = {"items": []}
-        recommendation_list = getRecommendation()  # 수정된 부분
-        for problem_id in recommendation_list:
-            problem_info = findProblem(problem_id)
+        recommendation_list = getRecommendation(currentUserId())  # 수정된 부분
+        for problem_info in findProblems(recommendation_list):
             if problem_info:
                 problems["items"].append(problem_info)
         
@@ -295,17 +667,49 @@ def search():
 # 🎯 핵심 수정: getRecommendation 함수를 실제 추천 시스템과 연결
 @app.route('/getRecommendation', methods=['GET'])
 def parseRecommendation():
-    problemList = getRecommendation()
-    parsed = []
-    for p in problemList:
-        parsed.append(findProblem(p))
-    return jsonify({"items": parsed})
+    with timed('request_recommendation'):
+        problemList = getRecommendation(currentUserId())
+        with timed('problem_details'):
+            # 가져오지 못한 문제는 빼고 순서대로 반환
+            parsed = [problem_info for problem_info in findProblems(problemList) if problem_info]
+        return jsonify({"items": parsed})
 
-def getRecommendation():
-    """현재 로그인한 사용자에게 맞춤 문제 추천"""
+def updateRecommenderUser(user_id, solved):
+    """실시간으로 가져온 사용자 풀이 기록({문제 ID: 난이도})을 모델에 반영 (바뀐 경우에만 증분 갱신 파일에 덧붙임)"""
+    try:
+        with timed('model_update'):
+            # 대부분의 요청은 기록이 그대로이므로 읽기 잠금으로 먼저 확인하고, 바뀐 경우에만 쓰기 잠금을 잡음
+            with recommenderLock.read_locked():
+                if recommender.has_user_history(user_id, solved):
+                    return
+            
+            with recommenderLock.write_locked():
+                model = recommender
+                if model.upsert_user(user_id, solved):
+                    deltaLog.append(model.take_pending_updates())
+            
+            # 파일 쓰기는 잠금 밖에서 (기록 순서는 잠금 안에서 넣은 대기열 순서를 따름)
+            deltaLog.flush(model)
+        scheduleCompaction()
+    except Exception as e:
+        print(f"⚠️ 사용자 '{user_id}' 모델 반영 실패: {e}")
+
+def scheduleCompaction():
+    """증분 갱신이 충분히 쌓였으면 백그라운드에서 새 모델을 만들어 교체 (이미 진행 중이면 무시)"""
+    global compactFuture
+    updates = recommender.updates_since_compact
+    if updates < COMPACT_AFTER_UPDATES and not (updates and time.monotonic() - lastCompactedAt >= COMPACT_INTERVAL):
+        return
+    with compactLock:
+        if compactFuture is None or compactFuture.done():
+            print(f"🧹 증분 갱신 {updates}건, 백그라운드 정리 시작")
+            compactFuture = compactExecutor.submit(initialize_recommender)
+
+def getRecommendation(user_id):
+    """로그인한 사용자(user_id)에게 맞춤 문제 추천 (user_id가 None이면 로그인하지 않은 요청)"""
     
     # 로그인 확인
-    if not loggedIn or not user:
+    if not user_id:
         print("❌ 로그인되지 않은 사용자")
         return [1000, 1001, 1002, 1003]  # 기본 추천
     
@@ -315,18 +719,31 @@ def getRecommendation():
         return [1000, 1001, 1002, 1003]  # 기본 추천
     
     try:
-        user_id = user.id
+        # 풀이 수가 그대로면 이전에 계산한 추천을 그대로 사용
+        cache_key = (user_id, None, recommender_version)
+        loadSolvedCount = solvedCountLoader(user_id)
+        cached = recommendation_cache.get(cache_key, loadSolvedCount)
+        if cached is not None:
+            print(f"⚡ 캐시된 추천 사용: {list(cached)}")
+            return list(cached)
+        
         print(f"🎯 사용자 '{user_id}'에게 문제 추천 중...")
+        solved_count = loadSolvedCount()
         
-        # 1. 실시간으로 사용자 데이터 가져오기
-        user_df = createUserDataFrame(user_id)
+        # 1. 사용자 풀이 기록 가져오기 (저장된 기록이 있으면 바로 사용)
+        with timed('fetch_solved_problems'):
+            history = getUserHistory(user_id, solved_count)
         
-        if user_df is None or len(user_df) == 0:
+        if history is None or len(history) == 0:
             print(f"⚠️ 사용자 '{user_id}'의 풀이 기록을 찾을 수 없음")
             return [1000, 1001, 1002, 1003]  # 기본 추천
         
+        solved = history.problems()
+        updateRecommenderUser(user_id, solved)
+        
         # 2. 추천 시스템에 실시간 데이터 추가하여 추천받기
-        recommendations = recommender.get_recommendations_for_new_user(user_df, n_recommendations=10)
+        with timed('recommend'), recommenderLock.read_locked():
+            recommendations = recommender.get_recommendations_for_user_history(user_id, solved, n_recommendations=10)
         
         if not recommendations:
             print(f"⚠️ 사용자 '{user_id}'에 대한 추천이 없음")
@@ -336,6 +753,8 @@ def getRecommendation():
         problem_ids = [rec['problem_id'] for rec in recommendations]
         print(f"✅ 추천 완료: {problem_ids}")
         
+        # 저장된 기록이 현재 풀이 수보다 뒤처져 있으면 그 풀이 수로 저장해 갱신 후 다시 계산하게 함
+        recommendation_cache.put(cache_key, tuple(problem_ids), history.solved_count)
         return problem_ids
         
     except Exception as e:
@@ -346,19 +765,19 @@ def getRecommendation():
 def parseRecommendationByTag():
     tag_name = request.get_json().get('tag')
     print("tag_name:",tag_name)
-    problemList = getRecommendationByTag(tag_name)
-    parsed = []
-    for p in problemList:
-        parsed.append(findProblem(p))
-    return jsonify({"items": parsed})
+    with timed('request_recommendation_by_tag'):
+        problemList = getRecommendationByTag(currentUserId(), tag_name)
+        with timed('problem_details'):
+            parsed = [problem_info for problem_info in findProblems(problemList) if problem_info]
+        return jsonify({"items": parsed})
 
-def getRecommendationByTag(tag_name):
+def getRecommendationByTag(user_id, tag_name):
     """태그별 맞춤 문제 추천 (간단 버전)"""
 
     print(f"🏷️ 태그 '{tag_name}' 추천 요청")
 
     # 로그인 확인
-    if not loggedIn or not user:
+    if not user_id:
         print("❌ 로그인되지 않은 사용자")
         return [1000, 1001, 1002, 1003]
 
@@ -368,20 +787,32 @@ def getRecommendationByTag(tag_name):
         return [1000, 1001, 1002, 1003]
 
     try:
-        user_id = user.id
+        cache_key = (user_id, tag_name, recommender_version)
+        loadSolvedCount = solvedCountLoader(user_id)
+        cached = recommendation_cache.get(cache_key, loadSolvedCount)
+        if cached is not None:
+            print(f"⚡ 캐시된 '{tag_name}' 태그 추천 사용: {list(cached)}")
+            return list(cached)
+        
         print(f"🎯 사용자 '{user_id}'에게 '{tag_name}' 태그 문제 추천 중...")
+        solved_count = loadSolvedCount()
         
-        # 실시간으로 사용자 데이터 가져오기
-        user_df = createUserDataFrame(user_id)
+        # 사용자 풀이 기록 가져오기 (저장된 기록이 있으면 바로 사용)
+        with timed('fetch_solved_problems'):
+            history = getUserHistory(user_id, solved_count)
         
-        if user_df is None or len(user_df) == 0:
+        if history is None or len(history) == 0:
             print(f"⚠️ 사용자 '{user_id}'의 풀이 기록을 찾을 수 없음")
             return [1000, 1001, 1002, 1003]
         
+        solved = history.problems()
+        updateRecommenderUser(user_id, solved)
+        
         # 태그별 추천 생성
-        recommendations = recommender.get_recommendations_for_new_user_by_tag(
-            user_df, tag_name, n_recommendations=10
-        )
+        with timed('recommend_by_tag'), recommenderLock.read_locked():
+            recommendations = recommender.get_recommendations_for_user_history_by_tag(
+                user_id, solved, tag_name, n_recommendations=10
+            )
         
         if not recommendations:
             print(f"⚠️ '{tag_name}' 태그 추천이 없음")
@@ -391,6 +822,8 @@ def getRecommendationByTag(tag_name):
         problem_ids = [rec['problem_id'] for rec in recommendations]
         print(f"✅ '{tag_name}' 태그 추천 완료: {problem_ids}")
         
+        # 저장된 기록이 현재 풀이 수보다 뒤처져 있으면 그 풀이 수로 저장해 갱신 후 다시 계산하게 함
+        recommendation_cache.put(cache_key, tuple(problem_ids), history.solved_count)
         return problem_ids
         
     except Exception as e:
@@ -410,10 +843,12 @@ def api_recommendations():
     
     try:
         user_id = current_user.get_id()
-        recommendations = recommender.get_user_recommendations(user_id, 10)
+        with recommenderLock.read_locked():
+            recommendations = recommender.get_user_recommendations(user_id, 10)
+            if not recommendations:
+                available_users = list(islice(recommender.user_item_matrix.keys(), 10))
         
         if not recommendations:
-            available_users = list(recommender.user_item_matrix.keys())[:10]
             return jsonify({
                 'message': f'사용자 "{user_id}"의 데이터를 찾을 수 없습니다.',
                 'available_users': available_users,
@@ -422,8 +857,8 @@ def api_recommendations():
         
         # 추천 결과 포맷팅
         formatted_recs = []
-        for rec in recommendations:
-            problem_info = findProblem(rec['problem_id'])
+        problem_infos = findProblems([rec['problem_id'] for rec in recommendations])
+        for rec, problem_info in zip(recommendations, problem_infos):
             formatted_recs.append({
                 'problem_id': int(rec['problem_id']),
                 'estimated_preference': round(rec['estimated_rating'], 2),
@@ -449,10 +884,12 @@ def api_user_stats():
     
     try:
         user_id = current_user.get_id()
-        stats = recommender.get_user_stats(user_id)
+        with recommenderLock.read_locked():
+            stats = recommender.get_user_stats(user_id)
+            if stats is None:
+                available_users = list(islice(recommender.user_item_matrix.keys(), 10))
         
         if stats is None:
-            available_users = list(recommender.user_item_matrix.keys())[:10]
             return jsonify({
                 'message': f'사용자 "{user_id}"의 데이터를 찾을 수 없습니다.',
                 'available_users': available_users,
@@ -473,11 +910,192 @@ def api_status():
     return jsonify({
         'recommender_available': RECOMMENDER_AVAILABLE,
         'recommender_initialized': recommender is not None and recommender.trained,
-        'logged_in': loggedIn,
-        'current_user': user.id if user else None,
+        'logged_in': current_user.is_authenticated,
+        'current_user': currentUserId(),
         'message': '시스템이 정상 작동 중입니다.' if recommender else '추천 시스템이 초기화되지 않았습니다.'
     })
 
+@app.route('/api/metrics', methods=['GET'])
+def api_metrics():
+    """
+    단계별 지연 시간 히스토그램과 업스트림 호출/캐시 카운터
+    기본은 JSON, ?format=prometheus 이면 Prometheus 텍스트 형식
+    """
+    if request.args.get('format') == 'prometheus':
+        return METRICS.to_prometheus(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+    return jsonify(METRICS.to_dict())
+
+# ⚡ 비동기 경로 (/async/...)
+# 요청 하나가 보내는 업스트림 호출(풀이 기록 페이지, 문제 정보)을 공용 비동기 클라이언트로 동시에 기다리고
+# 추천 계산처럼 CPU를 쓰는 작업과 SQLite 풀이 기록/문제 정보 저장소 접근은 실행기 스레드에 맡겨 이벤트 루프를 막지 않음
+# Flask의 async 뷰에는 asgiref가 필요하므로 httpx와 asgiref가 모두 있을 때만 등록하고, 기존 동기 경로는 그대로 둠
+ASYNC_VIEWS_AVAILABLE = ASYNC_HTTP_AVAILABLE and importlib.util.find_spec("asgiref") is not None
+RECOMMEND_WORKERS = 4
+recommendExecutor = ThreadPoolExecutor(max_workers=RECOMMEND_WORKERS, thread_name_prefix="recommend")
+STORAGE_WORKERS = 8
+storageExecutor = ThreadPoolExecutor(max_workers=STORAGE_WORKERS, thread_name_prefix="async-storage")
+
+async def runBlocking(executor, func, *args):
+    """동기 함수를 실행기 스레드에서 실행하고 결과를 기다림"""
+    return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+async def getUserSolvedCountAsync(user_handle):
+    """getUserSolvedCount의 비동기 버전"""
+    data = await get_async_client().get_json("user/show", {"handle": user_handle})
+    if data is None:
+        return None
+    return data.get("solvedCount")
+
+def solvedCountLoaderAsync(user_handle):
+    """solvedCountLoader의 비동기 버전 (반환한 함수가 코루틴 함수)"""
+    loaded = []
+    async def load():
+        if not loaded:
+            loaded.append(await getUserSolvedCountAsync(user_handle))
+        return loaded[0]
+    return load
+
+async def fetchSolvedPageAsync(user_handle, page):
+    """fetchSolvedPage의 비동기 버전 (동기 경로와 같은 초당 요청 수 한도를 나눠 씀)"""
+    await solvedPageLimiter.acquire_async()
+    return await get_async_client().get_json("search/problem", solvedPageQuery(user_handle, page))
+
+async def getUserSolvedProblemsAsync(user_handle, solved_count=None):
+    """
+    저장된 기록이 없는 사용자의 풀이 기록 전체를 가져와 저장 (SolvedHistory, 실패 시 None)
+    첫 페이지로 전체 풀이 수를 확인한 뒤 나머지 페이지를 동시에 기다림
+    """
+    print(f"🔍 사용자 '{user_handle}'의 풀이 기록을 가져오는 중... (비동기)")
+    
+    first = await fetchSolvedPageAsync(user_handle, 1)
+    if first is None:
+        print("❌ 페이지 1 가져오기 실패")
+        return None
+    
+    first_page, count = parseFirstSolvedPage(first)
+    
+    pages = range(2, solvedPageCount(count) + 1)
+    found = parseSolvedPages(pages, await asyncio.gather(*(fetchSolvedPageAsync(user_handle, page) for page in pages)))
+    found[1] = first_page
+    entries, complete = joinSolvedPages(found, count)
+    
+    if solved_count is None:
+        solved_count = count
+    return await runBlocking(storageExecutor, saveSolvedHistory, user_handle, solved_count, entries, complete)
+
+async def getUserHistoryAsync(user_handle, solved_count=None):
+    """getUserHistory의 비동기 버전 (오래된 기록의 갱신은 동기 경로와 같은 백그라운드 실행기가 맡음)"""
+    history = await runBlocking(storageExecutor, storedUserHistory, user_handle, solved_count)
+    if history is None:
+        return await getUserSolvedProblemsAsync(user_handle, solved_count)
+    return history
+
+async def lookupProblemsAsync(problemIds):
+    """lookupProblems의 비동기 버전 (묶음마다 요청을 동시에 보냄)"""
+    return parseLookupResults(await asyncio.gather(*(
+        get_async_client().get_json("problem/lookup", query) for query in problemLookupQueries(problemIds)
+    )))
+
+async def fetchProblemAsync(problemId):
+    """fetchProblem의 비동기 버전"""
+    return await get_async_client().get_json("problem/show", {"problemId": problemId})
+
+async def findProblemsAsync(problemIds):
+    """findProblems의 비동기 버전 (로컬 저장소 -> problem/lookup -> 남은 문제만 개별 요청)"""
+    with timed('find_problems'):
+        problem_ids = [int(problem_id) for problem_id in problemIds]
+        results, missing = await runBlocking(storageExecutor, storedProblems, problem_ids)
+        
+        if missing:
+            fetched = await lookupProblemsAsync(missing)
+            remaining = [problem_id for problem_id in missing if problem_id not in fetched]
+            if remaining:
+                infos = await asyncio.gather(*(fetchProblemAsync(problem_id) for problem_id in remaining))
+                fetched.update(fetchedProblems(remaining, infos))
+            await runBlocking(storageExecutor, storeFetchedProblems, results, fetched)
+        
+        return [results.get(problem_id) for problem_id in problem_ids]
+
+def computeRecommendation(user_id, solved, tag_name=None):
+    """풀이 기록을 모델에 반영하고 추천 목록 계산 (CPU 작업이므로 비동기 경로에서는 실행기 스레드에서 호출)"""
+    updateRecommenderUser(user_id, solved)
+    if tag_name is None:
+        with timed('recommend'), recommenderLock.read_locked():
+            return recommender.get_recommendations_for_user_history(user_id, solved, n_recommendations=10)
+    with timed('recommend_by_tag'), recommenderLock.read_locked():
+        return recommender.get_recommendations_for_user_history_by_tag(
+            user_id, solved, tag_name, n_recommendations=10
+        )
+
+async def getRecommendationAsync(user_id, tag_name=None):
+    """getRecommendation / getRecommendationByTag의 비동기 버전"""
+    if not user_id:
+        print("❌ 로그인되지 않은 사용자")
+        return [1000, 1001, 1002, 1003]
+    
+    if recommender is None or not recommender.trained:
+        print("❌ 추천 시스템이 초기화되지 않음")
+        return [1000, 1001, 1002, 1003]
+    
+    try:
+        cache_key = (user_id, tag_name, recommender_version)
+        loadSolvedCount = solvedCountLoaderAsync(user_id)
+        cached = await recommendation_cache.get_async(cache_key, loadSolvedCount)
+        if cached is not None:
+            print(f"⚡ 캐시된 추천 사용: {list(cached)}")
+            return list(cached)
+        
+        print(f"🎯 사용자 '{user_id}'에게 문제 추천 중... (비동기)")
+        solved_count = await loadSolvedCount()
+        
+        with timed('fetch_solved_problems'):
+            history = await getUserHistoryAsync(user_id, solved_count)
+        
+        if history is None or len(history) == 0:
+            print(f"⚠️ 사용자 '{user_id}'의 풀이 기록을 찾을 수 없음")
+            return [1000, 1001, 1002, 1003]
+        
+        recommendations = await runBlocking(
+            recommendExecutor, computeRecommendation, user_id, history.problems(), tag_name
+        )
+        
+        if not recommendations:
+            print(f"⚠️ 사용자 '{user_id}'에 대한 추천이 없음")
+            return [1000, 1001, 1002, 1003]
+        
+        problem_ids = [rec['problem_id'] for rec in recommendations]
+        print(f"✅ 추천 완료: {problem_ids}")
+        
+        recommendation_cache.put(cache_key, tuple(problem_ids), history.solved_count)
+        return problem_ids
+        
+    except Exception as e:
+        print(f"❌ 추천 생성 중 오류: {e}")
+        return [1000, 1001, 1002, 1003]
+
+async def recommendedProblemsAsync(tag_name=None):
+    """추천 목록과 각 문제 정보를 함께 가져와 응답 형식({"items": [...]})으로 반환"""
+    problemList = await getRecommendationAsync(currentUserId(), tag_name)
+    with timed('problem_details'):
+        parsed = [problem_info for problem_info in await findProblemsAsync(problemList) if problem_info]
+    return {"items": parsed}
+
+if ASYNC_VIEWS_AVAILABLE:
+    @app.route('/async/search', methods=['POST'])
+    async def searchAsync():
+        return jsonify(await recommendedProblemsAsync())
+
+    @app.route('/async/getRecommendation', methods=['GET'])
+    async def parseRecommendationAsync():
+        with timed('request_recommendation'):
+            return jsonify(await recommendedProblemsAsync())
+
+    @app.route('/async/getRecommendationByTag', methods=['POST'])
+    async def parseRecommendationByTagAsync():
+        tag_name = request.get_json().get('tag')
+        with timed('request_recommendation_by_tag'):
+            return jsonify(await recommendedProblemsAsync(tag_name))
+
 import pvp
 pvpManager = pvp.PvpManager()
 
@@ -488,13 +1106,13 @@ def pvp():
 @app.route('/pvp/start', methods = ['POST'])
 def pvpStart():
     data = request.get_json()
-    pvpManager.newPvp(user, data.get("problemId"))
+    pvpManager.newPvp(currentUserId(), data.get("problemId"))
 
 @app.route('/pvp/get', methods = ['POST'])
 def pvpGet():
-    return jsonify({"items": pvpManager.findPvp(user)})
+    return jsonify({"items": pvpManager.findPvp(currentUserId())})
 
 if __name__ == '__main__':
     print("Flask 앱 시작...")
     initialize_recommender()
-    app.run(debug=True)
+    app.run(debug=True, threaded=True)
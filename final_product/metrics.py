@@ -0,0 +1,228 @@
+"""
+요청 처리 단계별 지연 시간과 카운터를 모아 두는 가벼운 메트릭 저장소
+
+timed(stage)           : with 블록의 실행 시간을 단계별 히스토그램에 기록
+increment(name, ...)   : 업스트림 호출 수, 캐시 적중 수 등의 카운터 증가
+cache_lookups(cache)   : 요청 하나의 캐시 조회를 모아 with 블록이 끝날 때 한 번에 기록
+METRICS.to_dict()      : /api/metrics JSON 응답
+METRICS.to_prometheus(): /api/metrics?format=prometheus 텍스트 응답
+
+기록은 고정된 버킷에 숫자 하나를 더하는 것뿐이고 집계/포맷팅은 누군가 조회할 때만 하므로
+조회하지 않는 동안의 부담은 거의 없음
+"""
+import threading
+import time
+from bisect import bisect_left
+
+METRIC_PREFIX = "recommender"
+
+# 히스토그램 버킷 상한 (초)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+STAGE_HISTOGRAM = "stage_duration_seconds"
+
+
+class Histogram:
+    """버킷별 관측 수와 합계만 저장하는 누적 히스토그램"""
+
+    __slots__ = ('buckets', 'counts', 'total', 'count')
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 칸은 +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative_counts(self):
+        result = []
+        running = 0
+        for count in self.counts:
+            running += count
+            result.append(running)
+        return result
+
+
+class MetricsRegistry:
+    """
+    이름과 라벨 조합별 히스토그램/카운터 저장소
+    키는 (이름, ((라벨, 값), ...)) 튜플
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def increment(self, name, amount=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def timed(self, stage):
+        return _StageTimer(self, stage)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def _snapshot(self):
+        with self._lock:
+            histograms = {
+                key: (histogram.cumulative_counts(), histogram.total, histogram.count)
+                for key, histogram in self._histograms.items()
+            }
+            counters = dict(self._counters)
+        return histograms, counters
+
+    def to_dict(self):
+        """JSON 응답용 딕셔너리 (히스토그램은 누적 버킷 수 포함)"""
+        histograms, counters = self._snapshot()
+
+        result = {'histograms': {}, 'counters': {}}
+        for (name, labels), (cumulative, total, count) in sorted(histograms.items()):
+            bucket_names = [str(bound) for bound in self.buckets] + ['+Inf']
+            result['histograms'].setdefault(name, []).append({
+                'labels': dict(labels),
+                'count': count,
+                'sum': total,
+                'mean': total / count if count else 0.0,
+                'buckets': dict(zip(bucket_names, cumulative)),
+            })
+        for (name, labels), value in sorted(counters.items()):
+            result['counters'].setdefault(name, []).append({
+                'labels': dict(labels),
+                'value': value,
+            })
+        return result
+
+    def to_prometheus(self):
+        """Prometheus 텍스트 노출 형식 (version 0.0.4)"""
+        histograms, counters = self._snapshot()
+        lines = []
+
+        current_name = None
+        for (name, labels), (cumulative, total, count) in sorted(histograms.items()):
+            metric = f"{METRIC_PREFIX}_{name}"
+            if name != current_name:
+                lines.append(f"# TYPE {metric} histogram")
+                current_name = name
+            for bound, value in zip(list(self.buckets) + ['+Inf'], cumulative):
+                lines.append(f"{metric}_bucket{_format_labels(labels + (('le', str(bound)),))} {value}")
+            lines.append(f"{metric}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{metric}_count{_format_labels(labels)} {count}")
+
+        current_name = None
+        for (name, labels), value in sorted(counters.items()):
+            metric = f"{METRIC_PREFIX}_{name}"
+            if name != current_name:
+                lines.append(f"# TYPE {metric} counter")
+                current_name = name
+            lines.append(f"{metric}{_format_labels(labels)} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels) + "}"
+
+
+class _StageTimer:
+    """with 블록 실행 시간을 단계 히스토그램에 기록 (예외가 나도 기록)"""
+
+    __slots__ = ('registry', 'stage', 'start')
+
+    def __init__(self, registry, stage):
+        self.registry = registry
+        self.stage = stage
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.observe(STAGE_HISTOGRAM, time.perf_counter() - self.start, stage=self.stage)
+        return False
+
+
+class _CacheLookupTally:
+    """
+    후보마다 저장소 잠금을 잡지 않도록 적중/실패 수를 지역 변수로 세고
+    with 블록이 끝날 때 카운터를 한 번씩만 증가 (예외가 나도 기록)
+    """
+
+    __slots__ = ('registry', 'cache', 'hits', 'misses')
+
+    def __init__(self, registry, cache):
+        self.registry = registry
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.hits:
+            self.registry.increment("cache_lookups_total", self.hits, cache=self.cache, result="hit")
+        if self.misses:
+            self.registry.increment("cache_lookups_total", self.misses, cache=self.cache, result="miss")
+        return False
+
+
+# 프로세스 전체에서 함께 쓰는 저장소
+METRICS = MetricsRegistry()
+
+
+def timed(stage):
+    return METRICS.timed(stage)
+
+
+def increment(name, amount=1, **labels):
+    METRICS.increment(name, amount, **labels)
+
+
+def count_upstream_request(endpoint, ok):
+    """solved.ac 호출 수 (엔드포인트 경로와 성공 여부별)"""
+    increment("upstream_requests_total", endpoint=endpoint, result="ok" if ok else "error")
+
+
+def count_cache_lookup(cache, hit):
+    """캐시 조회 결과 (적중/실패)"""
+    increment("cache_lookups_total", cache=cache, result="hit" if hit else "miss")
+
+
+def cache_lookups(cache):
+    """반복문 안의 캐시 조회용: with 블록 동안 record(hit)로 모았다가 끝날 때 한 번에 기록"""
+    return _CacheLookupTally(METRICS, cache)
@@ -0,0 +1,552 @@
+"""
+추천 모델을 mmap으로 바로 열 수 있는 바이너리 디렉터리 형식으로 저장/로드
+
+모델 디렉터리 구성
+  CURRENT                      : 현재 모델 버전 디렉터리 이름 (os.replace로 한 번에 교체)
+  {시각}-{pid}/                 : 저장할 때마다 새로 만드는 버전 디렉터리 (아래 파일들)
+
+저장은 새 버전 디렉터리를 다 쓴 뒤 CURRENT만 바꾸므로 도중에 멈춰도 이전 모델이 그대로 남고,
+실행 중인 프로세스가 mmap으로 열어 둔 버전 디렉터리는 교체 직후 지우지 않음
+(바로 이전 버전까지 남기고 그보다 오래된 버전만 삭제)
+
+버전 디렉터리 구성 (FORMAT_VERSION = 1)
+  meta.json                    : 형식 버전, 사용자/문제 수, 이웃 설정
+  user_handles.npy             : 사용자 핸들 (UTF-8 바이트, 정렬됨) - 행 번호 = 사용자 인덱스
+  problem_ids.npy              : 문제 ID (정렬됨) - 열 번호 = 문제 인덱스
+  csr_indptr/indices/data.npy  : 사용자 x 문제 풀이 기록 (CSR, data = 난이도)
+  csc_indptr/indices/data.npy  : 문제 x 사용자 역색인 (CSC)
+  user_norms.npy               : 사용자별 벡터 크기
+  neighbor_ids/scores/counts.npy : 사용자별 top-K 이웃
+  popular_*.npy                : 인기 문제 순위 (전체 / 태그별 위치 목록)
+
+모든 배열은 numpy.load(mmap_mode=...)로 열기 때문에 로드 시간이 모델 크기와 무관하고,
+여러 워커 프로세스가 같은 페이지를 공유함
+"""
+import json
+import os
+import shutil
+import time
+from collections.abc import MutableMapping
+
+import numpy as np
+
+from neighbor_store import NeighborStore
+
+FORMAT_VERSION = 1
+CURRENT_FILE = 'CURRENT'
+
+
+def _load_array(model_dir, name, mmap_mode='r'):
+    path = os.path.join(model_dir, f"{name}.npy")
+    try:
+        return np.load(path, mmap_mode=mmap_mode)
+    except ValueError:
+        # 크기가 0인 배열은 mmap할 수 없으므로 그냥 읽음
+        return np.load(path)
+
+
+class SortedHandles:
+    """정렬된 핸들 바이트 배열에서 이진 탐색으로 행 번호를 찾는 조회 테이블"""
+
+    def __init__(self, handles):
+        self.handles = handles
+
+    def __len__(self):
+        return len(self.handles)
+
+    def find(self, handle):
+        if not isinstance(handle, str) or len(self.handles) == 0:
+            return None
+        key = handle.encode('utf-8')
+        row = int(np.searchsorted(self.handles, key))
+        if row < len(self.handles) and self.handles[row] == key:
+            return row
+        return None
+
+    def decode(self, row):
+        return self.handles[row].decode('utf-8')
+
+    def __iter__(self):
+        for handle in self.handles:
+            yield handle.decode('utf-8')
+
+
+class OverlayMapping(MutableMapping):
+    """
+    읽기 전용 배열 위에 변경 사항(overlay)과 삭제 표시(removed)를 덧씌운 매핑
+    하위 클래스는 _base_get / _base_has / _base_keys / _base_len 을 구현
+    """
+
+    def __init__(self):
+        self._overlay = {}
+        self._removed = set()
+
+    def __getitem__(self, key):
+        if key in self._overlay:
+            return self._overlay[key]
+        if key in self._removed:
+            raise KeyError(key)
+        return self._base_get(key)
+
+    def __contains__(self, key):
+        if key in self._overlay:
+            return True
+        return key not in self._removed and self._base_has(key)
+
+    def __setitem__(self, key, value):
+        self._overlay[key] = value
+        self._removed.discard(key)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._overlay.pop(key, None)
+        if self._base_has(key):
+            self._removed.add(key)
+
+    def __iter__(self):
+        for key in self._base_keys():
+            if key not in self._removed and key not in self._overlay:
+                yield key
+        yield from self._overlay
+
+    def __len__(self):
+        added = sum(1 for key in self._overlay if not self._base_has(key))
+        return self._base_len() - len(self._removed) + added
+
+
+class UserItemView(OverlayMapping):
+    """CSR 배열을 {사용자: {문제 ID: 난이도}} 딕셔너리처럼 읽는 뷰"""
+
+    def __init__(self, handles, problem_ids, indptr, indices, data):
+        super().__init__()
+        self.handles = handles
+        self.problem_ids = problem_ids
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+
+    def _base_get(self, user):
+        row = self.handles.find(user)
+        if row is None:
+            raise KeyError(user)
+        start, end = self.indptr[row], self.indptr[row + 1]
+        problems = self.problem_ids[self.indices[start:end]].tolist()
+        return dict(zip(problems, self.data[start:end].tolist()))
+
+    def _base_has(self, user):
+        return self.handles.find(user) is not None
+
+    def _base_keys(self):
+        return iter(self.handles)
+
+    def _base_len(self):
+        return len(self.handles)
+
+
+class ProblemSolversView(OverlayMapping):
+    """CSC 배열을 {문제 ID: [(사용자, 난이도), ...]} 역색인처럼 읽는 뷰"""
+
+    def __init__(self, handles, problem_ids, indptr, indices, data):
+        super().__init__()
+        self.handles = handles
+        self.problem_ids = problem_ids
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+
+    def _column(self, problem):
+        try:
+            key = int(problem)
+        except (TypeError, ValueError):
+            return None
+        column = int(np.searchsorted(self.problem_ids, key))
+        if column < len(self.problem_ids) and self.problem_ids[column] == key:
+            return column
+        return None
+
+    def _base_get(self, problem):
+        column = self._column(problem)
+        if column is None:
+            raise KeyError(problem)
+        start, end = self.indptr[column], self.indptr[column + 1]
+        users = [self.handles.decode(row) for row in self.indices[start:end].tolist()]
+        return list(zip(users, self.data[start:end].tolist()))
+
+    def _base_has(self, problem):
+        return self._column(problem) is not None
+
+    def _base_keys(self):
+        return iter(self.problem_ids.tolist())
+
+    def _base_len(self):
+        return len(self.problem_ids)
+
+
+class UserNormView(OverlayMapping):
+    """사용자별 벡터 크기 배열을 {사용자: norm} 딕셔너리처럼 읽는 뷰"""
+
+    def __init__(self, handles, norms):
+        super().__init__()
+        self.handles = handles
+        self.norms = norms
+
+    def _base_get(self, user):
+        row = self.handles.find(user)
+        if row is None:
+            raise KeyError(user)
+        return float(self.norms[row])
+
+    def _base_has(self, user):
+        return self.handles.find(user) is not None
+
+    def _base_keys(self):
+        return iter(self.handles)
+
+    def _base_len(self):
+        return len(self.handles)
+
+
+class TagPopularityView(OverlayMapping):
+    """태그별 인기 순위를 전체 순위의 위치 목록으로 저장해 두고 필요할 때만 꺼내는 뷰"""
+
+    def __init__(self, tag_names, indptr, positions, popular_problems):
+        super().__init__()
+        self.tag_index = {tag_name: i for i, tag_name in enumerate(tag_names)}
+        self.indptr = indptr
+        self.positions = positions
+        self.popular_problems = popular_problems
+
+    def _base_get(self, tag_name):
+        i = self.tag_index.get(tag_name)
+        if i is None:
+            raise KeyError(tag_name)
+        positions = self.positions[self.indptr[i]:self.indptr[i + 1]]
+        return {
+            'problem_ids': self.popular_problems['problem_ids'][positions],
+            'scores': self.popular_problems['scores'][positions]
+        }
+
+    def _base_has(self, tag_name):
+        return tag_name in self.tag_index
+
+    def _base_keys(self):
+        return iter(self.tag_index)
+
+    def _base_len(self):
+        return len(self.tag_index)
+
+
+class HandleList:
+    """NeighborStore.user_ids 대용: 정렬된 핸들 배열 + 이후 추가/삭제된 사용자"""
+
+    def __init__(self, handles):
+        self.handles = handles
+        self._changed = {}
+        self._appended = []
+
+    def __len__(self):
+        return len(self.handles) + len(self._appended)
+
+    def __getitem__(self, row):
+        if row in self._changed:
+            return self._changed[row]
+        if row < len(self.handles):
+            return self.handles.decode(row)
+        return self._appended[row - len(self.handles)]
+
+    def __setitem__(self, row, user):
+        if row < len(self.handles):
+            self._changed[row] = user
+        else:
+            self._appended[row - len(self.handles)] = user
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self[row]
+
+    def append(self, user):
+        self._appended.append(user)
+
+
+class HandleIndex(OverlayMapping):
+    """NeighborStore.user_index 대용: 핸들 -> 행 번호"""
+
+    def __init__(self, handles):
+        super().__init__()
+        self.handles = handles
+
+    def _base_get(self, user):
+        row = self.handles.find(user)
+        if row is None:
+            raise KeyError(user)
+        return row
+
+    def _base_has(self, user):
+        return self.handles.find(user) is not None
+
+    def _base_keys(self):
+        return iter(self.handles)
+
+    def _base_len(self):
+        return len(self.handles)
+
+
+def _build_csc(n_problems, indptr, indices, data):
+    """CSR 배열을 문제 기준(CSC)으로 뒤집음"""
+    rows = np.repeat(np.arange(len(indptr) - 1, dtype=np.int32), np.diff(indptr))
+    order = np.argsort(indices, kind='stable')
+    csc_indptr = np.zeros(n_problems + 1, dtype=np.int64)
+    np.cumsum(np.bincount(indices, minlength=n_problems), out=csc_indptr[1:])
+    return csc_indptr, rows[order], data[order]
+
+
+def save_binary_model(recommender, model_dir):
+    """학습된 추천 모델을 바이너리 디렉터리 형식으로 저장"""
+    handles = sorted(user.encode('utf-8') for user in recommender.user_item_matrix.keys())
+    max_length = max((len(handle) for handle in handles), default=1)
+    user_handles = np.array(handles, dtype=f'S{max(max_length, 1)}')
+    user_rows = {handle.decode('utf-8'): row for row, handle in enumerate(handles)}
+
+    problems = set()
+    for user_problems in recommender.user_item_matrix.values():
+        problems.update(int(problem) for problem in user_problems)
+    problem_ids = np.array(sorted(problems), dtype=np.int64)
+    problem_columns = {problem: column for column, problem in enumerate(problem_ids.tolist())}
+
+    # 사용자 x 문제 CSR (열은 문제 인덱스 순으로 정렬)
+    indptr = np.zeros(len(handles) + 1, dtype=np.int64)
+    indices = []
+    data = []
+    for row, handle in enumerate(handles):
+        user_problems = recommender.user_item_matrix[handle.decode('utf-8')]
+        columns = sorted((problem_columns[int(problem)], level) for problem, level in user_problems.items())
+        indices.extend(column for column, _ in columns)
+        data.extend(level for _, level in columns)
+        indptr[row + 1] = len(indices)
+    indices = np.array(indices, dtype=np.int32)
+    data = np.array(data, dtype=np.int16)
+    csc_indptr, csc_indices, csc_data = _build_csc(len(problem_ids), indptr, indices, data)
+
+    user_norms = np.array(
+        [recommender.user_norms[handle.decode('utf-8')] for handle in handles], dtype=np.float64
+    )
+
+    # 이웃 저장소는 정렬된 핸들 순서로 행을 다시 배치
+    store = recommender.neighbors
+    n_store_rows = len(store.user_ids)
+    row_map = np.full(n_store_rows + 1, -1, dtype=np.int32)  # 마지막 칸은 빈 자리(-1)용
+    new_to_old = np.zeros(len(handles), dtype=np.int64)
+    has_row = np.zeros(len(handles), dtype=bool)
+    for old_row, user in enumerate(store.user_ids):
+        if user is not None and user in user_rows:
+            row_map[old_row] = user_rows[user]
+            new_to_old[user_rows[user]] = old_row
+            has_row[user_rows[user]] = True
+
+    neighbor_ids = np.full((len(handles), store.k), -1, dtype=np.int32)
+    neighbor_scores = np.zeros((len(handles), store.k), dtype=store.neighbor_scores.dtype)
+    neighbor_counts = np.zeros(len(handles), dtype=np.int32)
+    old_rows = new_to_old[has_row]
+    neighbor_ids[has_row] = row_map[store.neighbor_ids[old_rows]]
+    neighbor_scores[has_row] = store.neighbor_scores[old_rows]
+    neighbor_counts[has_row] = store.neighbor_counts[old_rows]
+
+    # 태그별 인기 순위는 전체 순위에서의 위치 목록으로 저장
+    popular = recommender.popular_problems
+    ranking_positions = {problem: i for i, problem in enumerate(popular['problem_ids'].tolist())}
+    tag_names = sorted(recommender.popular_problems_by_tag.keys())
+    tag_indptr = np.zeros(len(tag_names) + 1, dtype=np.int64)
+    tag_positions = []
+    for i, tag_name in enumerate(tag_names):
+        tag_problems = recommender.popular_problems_by_tag[tag_name]['problem_ids'].tolist()
+        tag_positions.extend(ranking_positions[problem] for problem in tag_problems)
+        tag_indptr[i + 1] = len(tag_positions)
+
+    arrays = {
+        'user_handles': user_handles,
+        'problem_ids': problem_ids,
+        'csr_indptr': indptr,
+        'csr_indices': indices,
+        'csr_data': data,
+        'csc_indptr': csc_indptr,
+        'csc_indices': csc_indices,
+        'csc_data': csc_data,
+        'user_norms': user_norms,
+        'neighbor_ids': neighbor_ids,
+        'neighbor_scores': neighbor_scores,
+        'neighbor_counts': neighbor_counts,
+        'popular_problem_ids': np.asarray(popular['problem_ids'], dtype=np.int64),
+        'popular_scores': np.asarray(popular['scores'], dtype=np.float64),
+        'popular_counts': np.asarray(popular['counts'], dtype=np.int64),
+        'popular_tag_indptr': tag_indptr,
+        'popular_tag_positions': np.array(tag_positions, dtype=np.int64),
+    }
+    meta = {
+        'format_version': FORMAT_VERSION,
+        'n_users': len(handles),
+        'n_problems': len(problem_ids),
+        'n_interactions': len(indices),
+        'n_neighbors': store.k,
+        'quantize': store.quantize,
+        'popular_tag_names': tag_names,
+    }
+
+    # 새 버전 디렉터리에 다 쓴 다음 CURRENT를 바꿔서 반쯤 쓰인 모델을 읽는 일이 없도록 함
+    # (버전 이름에 pid를 넣어 여러 워커가 동시에 저장해도 겹치지 않음)
+    previous = _current_version(model_dir)
+    version = f"{time.time_ns():020d}-{os.getpid()}"
+    tmp_dir = os.path.join(model_dir, f".{version}.tmp")
+    os.makedirs(tmp_dir)
+
+    try:
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), array)
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_dir, os.path.join(model_dir, version))
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    pointer_tmp = os.path.join(model_dir, f".{CURRENT_FILE}.tmp-{os.getpid()}")
+    with open(pointer_tmp, 'w', encoding='utf-8') as f:
+        f.write(version)
+    os.replace(pointer_tmp, os.path.join(model_dir, CURRENT_FILE))
+
+    # 교체가 끝난 뒤 바로 이전 버전보다 오래된 버전만 삭제
+    # (이전 버전은 아직 다시 로드하지 않은 워커가 열어 두고 있을 수 있고,
+    #  동시에 저장 중인 다른 워커의 버전은 항상 이전 버전보다 새것이므로 지워지지 않음)
+    if previous is not None:
+        for name in _versions(model_dir):
+            if name < previous:
+                shutil.rmtree(os.path.join(model_dir, name), ignore_errors=True)
+    _remove_legacy_files(model_dir)
+
+    return meta
+
+
+def _versions(model_dir):
+    """완성된 버전 디렉터리 이름 목록 (오래된 순)"""
+    if not os.path.isdir(model_dir):
+        return []
+    return sorted(
+        name for name in os.listdir(model_dir)
+        if not name.startswith('.') and os.path.isfile(os.path.join(model_dir, name, 'meta.json'))
+    )
+
+
+def _current_version(model_dir):
+    """CURRENT가 가리키는 버전 이름 (없거나 가리키는 디렉터리가 없으면 가장 최근 버전, 그것도 없으면 None)"""
+    try:
+        with open(os.path.join(model_dir, CURRENT_FILE), encoding='utf-8') as f:
+            version = f.read().strip()
+        if version and os.path.isfile(os.path.join(model_dir, version, 'meta.json')):
+            return version
+    except FileNotFoundError:
+        pass
+    versions = _versions(model_dir)
+    return versions[-1] if versions else None
+
+
+def _remove_legacy_files(model_dir):
+    """버전 디렉터리 없이 model_dir에 바로 저장하던 이전 형식의 파일 삭제 (새 버전으로 교체한 뒤에만 호출)"""
+    for name in os.listdir(model_dir):
+        if name == 'meta.json' or name.endswith('.npy'):
+            os.remove(os.path.join(model_dir, name))
+
+
+def current_model_path(model_dir):
+    """로드할 모델 파일이 있는 디렉터리 (버전이 없으면 이전 형식의 model_dir 자체, 모델이 없으면 None)"""
+    version = _current_version(model_dir)
+    if version is not None:
+        return os.path.join(model_dir, version)
+    if os.path.isfile(os.path.join(model_dir, 'meta.json')):
+        return model_dir
+    return None
+
+
+def binary_model_exists(model_dir):
+    return current_model_path(model_dir) is not None
+
+
+def load_binary_model(recommender, model_dir):
+    """바이너리 디렉터리 형식의 모델(CURRENT가 가리키는 버전)을 mmap으로 열어 추천 시스템에 연결"""
+    version_dir = current_model_path(model_dir)
+    if version_dir is None:
+        raise FileNotFoundError(f"❌ {model_dir}에서 저장된 모델을 찾을 수 없습니다!")
+    model_dir = version_dir
+    meta_path = os.path.join(model_dir, 'meta.json')
+
+    with open(meta_path, encoding='utf-8') as f:
+        meta = json.load(f)
+
+    if meta.get('format_version') != FORMAT_VERSION:
+        raise ValueError(
+            f"❌ 지원하지 않는 모델 형식 버전입니다: {meta.get('format_version')} "
+            f"(지원: {FORMAT_VERSION})"
+        )
+
+    handles = SortedHandles(_load_array(model_dir, 'user_handles'))
+    problem_ids = _load_array(model_dir, 'problem_ids')
+    csr_indices = _load_array(model_dir, 'csr_indices')
+
+    # meta.json과 배열이 다른 저장에서 온 것이면 (일부 파일만 바뀐 경우) 로드하지 않음
+    sizes = {'n_users': len(handles), 'n_problems': len(problem_ids), 'n_interactions': len(csr_indices)}
+    mismatched = {key: (meta.get(key), size) for key, size in sizes.items() if meta.get(key) != size}
+    if mismatched:
+        raise ValueError(f"❌ 모델 메타 정보와 배열 크기가 다릅니다: {mismatched}")
+
+    recommender.user_item_matrix = UserItemView(
+        handles, problem_ids,
+        _load_array(model_dir, 'csr_indptr'),
+        csr_indices,
+        _load_array(model_dir, 'csr_data')
+    )
+    recommender.problem_solvers = ProblemSolversView(
+        handles, problem_ids,
+        _load_array(model_dir, 'csc_indptr'),
+        _load_array(model_dir, 'csc_indices'),
+        _load_array(model_dir, 'csc_data')
+    )
+    recommender.user_norms = UserNormView(handles, _load_array(model_dir, 'user_norms'))
+
+    # 이웃 배열은 증분 갱신으로 수정될 수 있으므로 copy-on-write로 엶
+    recommender.neighbors = NeighborStore.from_arrays(
+        HandleList(handles),
+        HandleIndex(handles),
+        k=meta['n_neighbors'],
+        quantize=meta['quantize'],
+        neighbor_ids=_load_array(model_dir, 'neighbor_ids', mmap_mode='c'),
+        neighbor_scores=_load_array(model_dir, 'neighbor_scores', mmap_mode='c'),
+        neighbor_counts=_load_array(model_dir, 'neighbor_counts', mmap_mode='c')
+    )
+
+    recommender.popular_problems = {
+        'problem_ids': _load_array(model_dir, 'popular_problem_ids'),
+        'scores': _load_array(model_dir, 'popular_scores'),
+        'counts': _load_array(model_dir, 'popular_counts')
+    }
+    recommender.popular_problems_by_tag = TagPopularityView(
+        meta['popular_tag_names'],
+        _load_array(model_dir, 'popular_tag_indptr'),
+        _load_array(model_dir, 'popular_tag_positions'),
+        recommender.popular_problems
+    )
+
+    recommender.problem_data = None
+    recommender.pending_updates = []
+    recommender.trained = True
+
+    return meta
+
+
+if __name__ == "__main__":
+    import sys
+    from simple_recommendation_engine import convert_model_to_binary
+
+    if len(sys.argv) != 3:
+        print("사용법: python model_store.py <기존 모델.pkl> <저장할 디렉터리>")
+        sys.exit(1)
+
+    convert_model_to_binary(sys.argv[1], sys.argv[2])
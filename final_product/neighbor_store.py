@@ -0,0 +1,213 @@
+import numpy as np
+
+DEFAULT_TOP_K = 10
+
+
+def select_top_k(indices, scores, k, exclude=None):
+    """
+    한 사용자의 유사도 목록에서 유사도가 0보다 큰 상위 k개만 골라
+    (유사도 내림차순, 동점이면 인덱스 오름차순) 으로 정렬해 반환
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    scores = np.asarray(scores, dtype=np.float64)
+
+    mask = scores > 0
+    if exclude is not None:
+        mask &= indices != exclude
+    indices = indices[mask]
+    scores = scores[mask]
+
+    if len(scores) > k:
+        top = np.argpartition(-scores, k - 1)[:k]
+        indices = indices[top]
+        scores = scores[top]
+
+    order = np.lexsort((indices, -scores))
+    return indices[order], scores[order]
+
+
+class NeighborStore:
+    """
+    사용자별 상위 K명의 이웃만 평행 배열로 저장하는 압축 유사도 저장소
+    neighbor_ids[i]     : i번째 사용자의 이웃 인덱스 (없으면 -1)
+    neighbor_scores[i]  : 이웃별 유사도 (quantize=True면 float16)
+    neighbor_counts[i]  : 실제 이웃 수
+    삭제된 사용자의 자리는 user_ids에 None으로 남음 (재학습 때 정리)
+    """
+
+    def __init__(self, user_ids, k=DEFAULT_TOP_K, quantize=False):
+        self.user_ids = list(user_ids)
+        self.user_index = {user: i for i, user in enumerate(self.user_ids)}
+        self.k = k
+        self.quantize = quantize
+
+        n_users = len(self.user_ids)
+        score_dtype = np.float16 if quantize else np.float32
+        self.neighbor_ids = np.full((n_users, k), -1, dtype=np.int32)
+        self.neighbor_scores = np.zeros((n_users, k), dtype=score_dtype)
+        self.neighbor_counts = np.zeros(n_users, dtype=np.int32)
+
+    def set_row(self, row, indices, scores):
+        """정렬된 이웃 목록을 row번째 사용자 자리에 기록"""
+        count = min(len(indices), self.k)
+        self.neighbor_ids[row, :] = -1
+        self.neighbor_scores[row, :] = 0
+        self.neighbor_ids[row, :count] = indices[:count]
+        self.neighbor_scores[row, :count] = scores[:count]
+        self.neighbor_counts[row] = count
+
+    def set_block(self, start, neighbor_ids, neighbor_scores, neighbor_counts):
+        """start번째 행부터 블록 단위로 계산한 이웃 배열을 한 번에 기록"""
+        end = start + len(neighbor_counts)
+        self.neighbor_ids[start:end] = neighbor_ids
+        self.neighbor_scores[start:end] = neighbor_scores
+        self.neighbor_counts[start:end] = neighbor_counts
+
+    def set_from_scores(self, row, indices, scores):
+        """정렬되지 않은 유사도 목록에서 상위 K개를 골라 기록 (자기 자신은 제외)"""
+        top_indices, top_scores = select_top_k(indices, scores, self.k, exclude=row)
+        self.set_row(row, top_indices, top_scores)
+
+    def _ensure_capacity(self, n_rows):
+        """행 수가 n_rows 이상이 되도록 배열을 두 배씩 늘림"""
+        capacity = self.neighbor_ids.shape[0]
+        if n_rows <= capacity:
+            return
+
+        new_capacity = max(n_rows, capacity * 2, 16)
+        neighbor_ids = np.full((new_capacity, self.k), -1, dtype=np.int32)
+        neighbor_scores = np.zeros((new_capacity, self.k), dtype=self.neighbor_scores.dtype)
+        neighbor_counts = np.zeros(new_capacity, dtype=np.int32)
+
+        neighbor_ids[:capacity] = self.neighbor_ids
+        neighbor_scores[:capacity] = self.neighbor_scores
+        neighbor_counts[:capacity] = self.neighbor_counts
+
+        self.neighbor_ids = neighbor_ids
+        self.neighbor_scores = neighbor_scores
+        self.neighbor_counts = neighbor_counts
+
+    def add_user(self, user):
+        """새 사용자의 (빈) 행을 추가하고 행 번호 반환 (이미 있으면 기존 행 번호)"""
+        if user in self.user_index:
+            return self.user_index[user]
+
+        row = len(self.user_ids)
+        self._ensure_capacity(row + 1)
+        self.user_ids.append(user)
+        self.user_index[user] = row
+        return row
+
+    def remove_user(self, user, affected_users=()):
+        """
+        사용자를 삭제하고 affected_users의 이웃 목록에서도 제거
+        (유사도가 0보다 크려면 공통 문제가 있어야 하므로 겹치는 사용자만 넘기면 충분)
+        """
+        row = self.user_index.pop(user, None)
+        if row is None:
+            return
+
+        self.user_ids[row] = None
+        self.set_row(row, [], [])
+
+        for other in affected_users:
+            other_row = self.user_index.get(other)
+            if other_row is not None:
+                self.update_row(other_row, row, 0)
+
+    def update_neighbor(self, user, other, score):
+        """user의 이웃 목록에서 other의 유사도를 갱신 (score가 0 이하이면 목록에서 제거)"""
+        row = self.user_index.get(user)
+        other_row = self.user_index.get(other)
+        if row is None or other_row is None or row == other_row:
+            return
+        self.update_row(row, other_row, score)
+
+    def update_row(self, row, other_row, score):
+        """
+        행 번호 기준 update_neighbor
+        목록 밖으로 밀려난 K+1번째 이웃은 알 수 없으므로 재학습 전까지는 근사값
+        """
+        count = self.neighbor_counts[row]
+        indices = self.neighbor_ids[row, :count].astype(np.int64)
+        scores = self.neighbor_scores[row, :count].astype(np.float64)
+
+        keep = indices != other_row
+        if keep.all() and (score <= 0 or (count == self.k and score < scores[-1])):
+            return
+
+        indices = indices[keep]
+        scores = scores[keep]
+        if score > 0:
+            indices = np.append(indices, other_row)
+            scores = np.append(scores, score)
+
+        self.set_from_scores(row, indices, scores)
+
+    def neighbors(self, user):
+        """사용자의 이웃 목록을 [(사용자, 유사도), ...] 형태로 반환 (유사도 내림차순)"""
+        row = self.user_index.get(user)
+        if row is None:
+            return []
+
+        count = self.neighbor_counts[row]
+        ids = self.neighbor_ids[row, :count].tolist()
+        scores = self.neighbor_scores[row, :count].tolist()
+        return [(self.user_ids[i], score) for i, score in zip(ids, scores)]
+
+    @property
+    def nbytes(self):
+        """이웃 배열이 차지하는 메모리 (바이트)"""
+        return (self.neighbor_ids.nbytes
+                + self.neighbor_scores.nbytes
+                + self.neighbor_counts.nbytes)
+
+    def to_dict(self):
+        """모델 파일 저장용 딕셔너리로 변환"""
+        n_users = len(self.user_ids)
+        return {
+            'user_ids': self.user_ids,
+            'k': self.k,
+            'quantize': self.quantize,
+            'neighbor_ids': self.neighbor_ids[:n_users],
+            'neighbor_scores': self.neighbor_scores[:n_users],
+            'neighbor_counts': self.neighbor_counts[:n_users],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """to_dict()로 저장한 딕셔너리에서 복원"""
+        store = cls([], k=data['k'], quantize=data['quantize'])
+        store.user_ids = list(data['user_ids'])
+        store.user_index = {user: i for i, user in enumerate(store.user_ids) if user is not None}
+        store.neighbor_ids = data['neighbor_ids']
+        store.neighbor_scores = data['neighbor_scores']
+        store.neighbor_counts = data['neighbor_counts']
+        return store
+
+    @classmethod
+    def from_arrays(cls, user_ids, user_index, k, quantize, neighbor_ids, neighbor_scores, neighbor_counts):
+        """
+        이미 만들어진 사용자 목록/색인과 배열(mmap 포함)로 바로 구성
+        user_ids는 시퀀스, user_index는 매핑처럼 동작하면 됨
+        """
+        store = cls([], k=k, quantize=quantize)
+        store.user_ids = user_ids
+        store.user_index = user_index
+        store.neighbor_ids = neighbor_ids
+        store.neighbor_scores = neighbor_scores
+        store.neighbor_counts = neighbor_counts
+        return store
+
+    @classmethod
+    def from_similarity_dict(cls, user_similarity, k=DEFAULT_TOP_K, quantize=False):
+        """이전 버전의 {user1: {user2: 유사도}} 딕셔너리에서 변환"""
+        store = cls(user_similarity.keys(), k=k, quantize=quantize)
+
+        for row, user in enumerate(store.user_ids):
+            similarities = user_similarity[user]
+            indices = [store.user_index[other] for other in similarities if other in store.user_index]
+            scores = [similarities[other] for other in similarities if other in store.user_index]
+            store.set_from_scores(row, indices, scores)
+
+        return store
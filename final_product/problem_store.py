@@ -0,0 +1,139 @@
+import os
+import threading
+from collections import defaultdict
+
+
+def parse_tag_names(tags):
+    """
+    solved.ac API의 tags 목록을 영문 짧은 이름 목록으로 변환
+    (crawler.py가 TAGS_NM 컬럼에 저장하는 형식과 동일하게 공백은 '_'로 치환)
+    """
+    tag_names = []
+    for tag in tags or []:
+        display_names = tag.get("displayNames") if tag else None
+        if not isinstance(display_names, list) or len(display_names) <= 1:
+            continue
+        try:
+            tag_names.append(display_names[1].get("short").replace(' ', '_'))
+        except (TypeError, AttributeError):
+            # 예기치 않은 태그 구조는 건너뜀
+            continue
+    return tag_names
+
+
+class ProblemStore:
+    """
+    problem_all.csv를 한 번만 읽어 메모리에 올려두는 문제 정보 저장소
+    tag_problems   : 태그 -> 문제 ID 집합
+    problem_tags   : 문제 ID -> 태그 집합
+    problem_titles : 문제 ID -> 제목
+    problem_levels : 문제 ID -> 난이도
+
+    웹 서버의 요청 스레드와 추천 엔진(읽기 잠금만 잡은 요청)이 함께 읽고 쓰므로
+    모든 읽기/쓰기를 저장소 자체 잠금 안에서 처리함 (태그를 바꾸는 도중의 상태가 보이지 않음)
+    """
+
+    def __init__(self, csv_file_path=None):
+        self.tag_problems = defaultdict(set)
+        self.problem_tags = {}
+        self.problem_titles = {}
+        self.problem_levels = {}
+        self._lock = threading.Lock()
+
+        if csv_file_path and os.path.exists(csv_file_path):
+            self.load_csv(csv_file_path)
+
+    def load_csv(self, csv_file_path):
+        """problem_all.csv에서 태그 색인과 문제 정보(제목, 난이도) 생성"""
+        # pandas는 CSV 적재에만 필요하므로 여기서 불러옴
+        import pandas as pd
+
+        print(f"🏷️ 태그 색인 로드 중: {csv_file_path}")
+
+        data = pd.read_csv(
+            csv_file_path,
+            usecols=['PROBLEM_ID', 'TITLE_NM', 'TAGS_NM', 'SOLVED_LVL'],
+            dtype={'PROBLEM_ID': 'int64', 'TITLE_NM': 'string', 'TAGS_NM': 'string', 'SOLVED_LVL': 'Int64'}
+        )
+
+        for problem_id, title, tags, level in zip(
+            data['PROBLEM_ID'].tolist(),
+            data['TITLE_NM'].tolist(),
+            data['TAGS_NM'].tolist(),
+            data['SOLVED_LVL'].tolist()
+        ):
+            tag_names = tags.split() if isinstance(tags, str) else []
+            self.add_problem(
+                problem_id,
+                tag_names,
+                title=title if isinstance(title, str) else None,
+                level=level if isinstance(level, int) else None
+            )
+
+        print(f"✅ 태그 색인 로드 완료: 문제 {len(self.problem_tags)}개, 태그 {len(self.tag_problems)}개")
+
+    def add_problem(self, problem_id, tag_names, title=None, level=None):
+        """문제 하나의 태그 정보를 색인에 추가 (이미 있으면 갱신, 제목/난이도는 주어진 경우만)"""
+        problem_id = int(problem_id)
+        tag_names = frozenset(tag_names)
+
+        with self._lock:
+            if title is not None:
+                self.problem_titles[problem_id] = title
+            if level is not None:
+                self.problem_levels[problem_id] = int(level)
+
+            for tag_name in self.problem_tags.get(problem_id, ()):
+                self.tag_problems[tag_name].discard(problem_id)
+
+            self.problem_tags[problem_id] = tag_names
+            for tag_name in tag_names:
+                self.tag_problems[tag_name].add(problem_id)
+
+    def add_problem_info(self, problem_info, problem_id=None):
+        """solved.ac problem/show 응답을 그대로 받아 저장소에 추가 (응답에 ID가 없으면 problem_id 사용)"""
+        self.add_problem(
+            problem_info.get("problemId", problem_id),
+            parse_tag_names(problem_info.get("tags", [])),
+            title=problem_info.get("titleKo"),
+            level=problem_info.get("level")
+        )
+
+    def get_problem(self, problem_id):
+        """
+        문제 정보를 solved.ac 응답과 같은 키 (problemId, titleKo, level) 로 반환
+        제목을 모르는 문제는 None
+        """
+        try:
+            problem_id = int(problem_id)
+        except (TypeError, ValueError):
+            return None
+
+        with self._lock:
+            title = self.problem_titles.get(problem_id)
+            level = self.problem_levels.get(problem_id)
+        if title is None:
+            return None
+        return {
+            "problemId": problem_id,
+            "titleKo": title,
+            "level": level
+        }
+
+    def has_problem(self, problem_id):
+        with self._lock:
+            return int(problem_id) in self.problem_tags
+
+    def has_tag(self, problem_id, tag_name):
+        with self._lock:
+            return int(problem_id) in self.tag_problems.get(tag_name, ())
+
+    def tags_of(self, problem_id):
+        """문제의 태그 집합 (색인에 없는 문제는 None)"""
+        with self._lock:
+            return self.problem_tags.get(int(problem_id))
+
+    def problems_with_tag(self, tag_name):
+        """태그가 붙은 문제 ID 집합의 복사본 (다른 스레드가 색인을 고쳐도 안전하게 순회할 수 있음)"""
+        with self._lock:
+            return frozenset(self.tag_problems.get(tag_name, ()))
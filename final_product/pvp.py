@@ -1,4 +1,5 @@
 import datetime
+import threading
 
 class PvpMatch:
     def __init__(self, host, problemId):
@@ -27,20 +28,25 @@ class PvpMatch:
 class PvpManager:
     def __init__(self):
         self.pvps = []
+        # 여러 요청 스레드가 같은 목록을 읽고 고치므로 잠금으로 보호
+        self.lock = threading.Lock()
     def findPvp(self, user):
         pvpList = []
-        for pvp in self.pvps:
-            if(pvp.host == user or pvp.opponent == user):
-                pvpList.append(pvp)
+        with self.lock:
+            for pvp in self.pvps:
+                if(pvp.host == user or pvp.opponent == user):
+                    pvpList.append(pvp)
         return pvpList
     def newPvp(self, user, problemId):
-        for pvp in self.pvps:
-            if(pvp.problemId == problemId and pvp.opponent == None):
-                pvp.setOpponent(user)
+        with self.lock:
+            for pvp in self.pvps:
+                if(pvp.problemId == problemId and pvp.opponent == None):
+                    pvp.setOpponent(user)
     def endPvp(self, user, problemId):
-        for pvp in self.pvps:
-            if(pvp.problemId == problemId):
-                if(pvp.host == user):
-                    pvp.endHost()
-                elif(pvp.opponent == user):
-                    pvp.endOpponent()
\ No newline at end of file
+        with self.lock:
+            for pvp in self.pvps:
+                if(pvp.problemId == problemId):
+                    if(pvp.host == user):
+                        pvp.endHost()
+                    elif(pvp.opponent == user):
+                        pvp.endOpponent()
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""
+사용자별 추천 결과 캐시 (LRU + TTL)
+
+키는 (핸들, 태그, 엔진 버전) 튜플이고 값과 함께 계산 당시의 풀이 수를 저장함
+- ttl_seconds가 지난 항목은 버림
+- revalidate_after가 지나지 않은 항목은 그대로 사용
+- 그 사이의 항목은 현재 풀이 수가 저장된 값과 같을 때만 사용 (호출하는 쪽에서 확인)
+- max_entries를 넘으면 가장 오래 쓰이지 않은 항목부터 버림
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import count_cache_lookup
+
+
+class CacheEntry:
+    __slots__ = ('value', 'solved_count', 'checked_at', 'created_at')
+
+    def __init__(self, value, solved_count, now):
+        self.value = value
+        self.solved_count = solved_count
+        self.checked_at = now
+        self.created_at = now
+
+
+class RecommendationCache:
+    def __init__(self, max_entries=1024, ttl_seconds=600, revalidate_after=60, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.revalidate_after = revalidate_after
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _lookup(self, key, now):
+        """만료되지 않은 항목 (없으면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry.created_at >= self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        return entry
+
+    def _needs_revalidation(self, entry, now):
+        return entry is not None and now - entry.checked_at >= self.revalidate_after
+
+    def _revalidate(self, key, entry, solved_count, now):
+        """현재 풀이 수가 저장된 값과 같으면 항목을 계속 쓰고, 아니면 삭제"""
+        if solved_count is not None and solved_count == entry.solved_count:
+            entry.checked_at = now
+            return entry
+        self.invalidate(key)
+        return None
+
+    def _result(self, entry):
+        count_cache_lookup('recommendation', hit=entry is not None)
+        return entry.value if entry is not None else None
+
+    def get(self, key, solved_count_loader=None):
+        """
+        캐시된 값 반환 (없거나 만료되었거나 풀이 수가 바뀌었으면 None)
+        solved_count_loader: 재검증이 필요할 때만 호출되는 현재 풀이 수 조회 함수
+        """
+        now = self.clock()
+        entry = self._lookup(key, now)
+        if self._needs_revalidation(entry, now):
+            # 업스트림 조회는 잠금 밖에서 수행
+            solved_count = solved_count_loader() if solved_count_loader else None
+            entry = self._revalidate(key, entry, solved_count, now)
+        return self._result(entry)
+
+    async def get_async(self, key, solved_count_loader=None):
+        """get()과 같지만 solved_count_loader가 코루틴 함수 (비동기 경로용)"""
+        now = self.clock()
+        entry = self._lookup(key, now)
+        if self._needs_revalidation(entry, now):
+            solved_count = await solved_count_loader() if solved_count_loader else None
+            entry = self._revalidate(key, entry, solved_count, now)
+        return self._result(entry)
+
+    def put(self, key, value, solved_count):
+        entry = CacheEntry(value, solved_count, self.clock())
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_user(self, handle):
+        """한 사용자의 모든 태그/엔진 버전 항목 삭제"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == handle]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
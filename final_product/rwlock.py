@@ -0,0 +1,60 @@
+"""
+여러 스레드가 동시에 읽고, 쓸 때만 혼자 사용하는 읽기/쓰기 잠금
+
+추천 계산처럼 모델을 읽기만 하는 작업은 동시에 실행하고
+사용자 풀이 기록 반영이나 모델 교체처럼 모델을 고치는 작업만 다른 작업이 끝나길 기다림
+쓰기를 기다리는 스레드가 있으면 새 읽기는 그 뒤로 미뤄 쓰기가 계속 밀리지 않게 함
+"""
+import threading
+from contextlib import contextmanager
+
+
+class ReadWriteLock:
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    def acquire_read(self):
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._condition:
+            self._readers -= 1
+            if self._readers == 0:
+                self._condition.notify_all()
+
+    def acquire_write(self):
+        with self._condition:
+            self._waiting_writers += 1
+            try:
+                while self._writer or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = True
+
+    def release_write(self):
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+
+    @contextmanager
+    def read_locked(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
@@ -1,66 +1,205 @@
-import pandas as pd
 import pickle
+from collections.abc import Mapping
 import os
+from itertools import islice
 from collections import defaultdict, Counter
 import math
-import requests
-import json
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from neighbor_store import NeighborStore, DEFAULT_TOP_K, select_top_k
+from problem_store import ProblemStore, parse_tag_names
+from interaction_store import InteractionStore
+from metrics import timed, cache_lookups
+from solvedac_client import get_client
+import model_store
 
-class SimpleCollaborativeRecommender:
-    def __init__(self, csv_file_path=None):
+# 희소 행렬 연산은 scipy가 있을 때만 사용 (없으면 순수 Python 학습으로 대체)
+try:
+    from scipy import sparse
+    SPARSE_AVAILABLE = True
+except ImportError:
+    SPARSE_AVAILABLE = False
+
+# 병렬 학습 워커 프로세스가 공유하는 읽기 전용 행렬 (워커마다 한 번만 mmap으로 엶)
+_worker_matrices = None
+
+def _similarity_block_top_k(normalized, normalized_t, start, end, k):
+    """
+    [start, end) 사용자 블록의 유사도를 계산해 사용자별 top-K 이웃 배열로 반환
+    순차 학습과 병렬 학습이 같은 함수를 쓰므로 결과가 항상 같음
+    """
+    # 결과도 희소 행렬로 유지해 (블록 x 전체) 밀집 배열을 만들지 않음
+    block = normalized[start:end].dot(normalized_t).tocsr()
+    
+    neighbor_ids = np.full((end - start, k), -1, dtype=np.int32)
+    neighbor_scores = np.zeros((end - start, k), dtype=np.float64)
+    neighbor_counts = np.zeros(end - start, dtype=np.int32)
+    
+    for offset in range(end - start):
+        row_start, row_end = block.indptr[offset], block.indptr[offset + 1]
+        indices, scores = select_top_k(
+            block.indices[row_start:row_end],
+            block.data[row_start:row_end],
+            k,
+            exclude=start + offset
+        )
+        neighbor_ids[offset, :len(indices)] = indices
+        neighbor_scores[offset, :len(scores)] = scores
+        neighbor_counts[offset] = len(indices)
+    
+    return neighbor_ids, neighbor_scores, neighbor_counts
+
+def _load_shared_csr(matrix_dir, name, shape):
+    arrays = [
+        np.load(os.path.join(matrix_dir, f"{name}_{part}.npy"), mmap_mode='r')
+        for part in ('data', 'indices', 'indptr')
+    ]
+    return sparse.csr_matrix(tuple(arrays), shape=shape, copy=False)
+
+def _init_training_worker(matrix_dir, shape):
+    """워커 프로세스 시작 시 정규화된 행렬을 mmap으로 열어 둠"""
+    global _worker_matrices
+    _worker_matrices = (
+        _load_shared_csr(matrix_dir, 'normalized', shape),
+        _load_shared_csr(matrix_dir, 'normalized_t', (shape[1], shape[0]))
+    )
+
+def _train_block_worker(args):
+    start, end, k = args
+    normalized, normalized_t = _worker_matrices
+    return start, _similarity_block_top_k(normalized, normalized_t, start, end, k)
+
+# 세 엔진(사용자 기반/문제 기반/ALS)이 함께 쓰는 부분: 데이터 적재, 증분 갱신, 인기 순위, pickle 저장
+# 기본 구현은 사용자 기반 협업 필터링이고, 다른 엔진은 학습/추천/저장 메서드를 다시 정의함
+class CollaborativeRecommenderBase:
+    def __init__(self, csv_file_path=None, n_neighbors=DEFAULT_TOP_K, quantize=False):
         """
-        순수 Python으로 구현한 간단한 협업 필터링 추천 시스템
-        numpy, sklearn 없이 동작
+        간단한 사용자 기반 협업 필터링 추천 시스템
+        scipy가 있으면 희소 행렬로, 없으면 순수 Python으로 학습
+        
+        n_neighbors: 사용자별로 저장할 유사 사용자 수 (top-K)
+        quantize: True면 이웃 유사도를 float16으로 저장
         """
         self.trained = False
         self.problem_data = None
-        self.user_item_matrix = {}
-        self.user_similarity = {}
+        
+        # 핸들/문제 ID를 정수로 인터닝해 배열로 저장하는 풀이 기록 (딕셔너리처럼 읽음)
+        self.user_item_matrix = InteractionStore()
+        
+        # 사용자별 상위 K명의 이웃만 저장하는 유사도 저장소
+        self.n_neighbors = n_neighbors
+        self.quantize = quantize
+        self.neighbors = None
+        
+        # 정수 인덱스 변환 테이블 (희소 행렬 학습용)
+        self.user_ids = []
+        self.user_index = {}
+        self.problem_ids = []
+        self.problem_index = {}
+        
+        # 문제 -> [(사용자, 난이도), ...] 역색인 (신규 사용자 유사도 계산용)
+        self.problem_solvers = {}
+        
+        # 사용자별 벡터 크기(norm) 캐시
+        self.user_norms = {}
+        
+        # problem_all.csv 기반 로컬 태그 색인 (load_tag_index로 로드)
+        self.problem_store = None
+        
+        # 학습 시점에 미리 계산한 인기 문제 순위 (전체 / 태그별)
+        self.popular_problems = None
+        self.popular_problems_by_tag = {}
+        
+        # 아직 증분 갱신 파일에 쓰지 않은 갱신 기록 [(동작, 사용자, 풀이 기록), ...]
+        self.pending_updates = []
+        
+        # 마지막 재학습(compact) 이후 반영한 증분 갱신 수 (정리 시점 판단용)
+        self.updates_since_compact = 0
         
         if csv_file_path and os.path.exists(csv_file_path):
             self.load_data(csv_file_path)
     
-    def load_data(self, csv_file_path):
-        """CSV 파일에서 데이터 로드"""
-        print(f"📊 데이터 로드 중: {csv_file_path}")
+    def load_data(self, csv_file_path, chunk_size=200_000):
+        """
+        CSV 파일에서 데이터 로드
+        필요한 세 컬럼만 작은 dtype으로 chunk_size행씩 읽어 청크마다 바로 InteractionStore에 추가하므로
+        파일 전체를 담는 DataFrame이나 전체 길이의 임시 배열을 만들지 않음
+        """
+        # pandas는 오프라인 데이터 적재에만 필요하므로 여기서 불러옴 (웹 서버 시작/요청 경로에서는 불필요)
+        import pandas as pd
         
-        # CSV 파일 읽기
-        self.problem_data = pd.read_csv(csv_file_path)
+        print(f"📊 데이터 로드 중: {csv_file_path}")
         
         # 필요한 컬럼만 선택
         required_columns = ['SOLVER_HANDLE', 'PROBLEM_ID', 'SOLVED_LVL']
-        self.problem_data = self.problem_data[required_columns]
         
-        # 중복 제거
-        self.problem_data = self.problem_data.drop_duplicates(
-            subset=['SOLVER_HANDLE', 'PROBLEM_ID']
-        )
+        store = InteractionStore()
+        for chunk in pd.read_csv(
+            csv_file_path,
+            usecols=required_columns,
+            dtype={'SOLVER_HANDLE': 'object', 'PROBLEM_ID': 'int32', 'SOLVED_LVL': 'int8'},
+            chunksize=chunk_size
+        ):
+            # 청크 안에서 핸들을 정수로 바꿔 추가 (같은 사용자-문제 쌍은 파일에서 처음 나온 기록만 사용)
+            codes, uniques = pd.factorize(chunk['SOLVER_HANDLE'])
+            store.add_arrays(uniques, codes, chunk['PROBLEM_ID'].to_numpy(), chunk['SOLVED_LVL'].to_numpy())
+        store.sort_problem_columns()
+        
+        # 원본 DataFrame은 보관하지 않음 (풀이 기록은 InteractionStore에만 있음)
+        self.problem_data = None
         
         print(f"✅ 데이터 로드 완료:")
-        print(f"   - 사용자 수: {self.problem_data['SOLVER_HANDLE'].nunique()}")
-        print(f"   - 문제 수: {self.problem_data['PROBLEM_ID'].nunique()}")
-        print(f"   - 총 풀이 기록: {len(self.problem_data)}")
+        print(f"   - 사용자 수: {len(store)}")
+        print(f"   - 문제 수: {len(store.problem_ids)}")
+        print(f"   - 총 풀이 기록: {store.n_interactions()}")
         
         # 사용자-문제 매트릭스 생성
-        self._create_user_item_matrix()
+        self._create_user_item_matrix(store)
     
-    def _create_user_item_matrix(self):
-        """사용자-문제 매트릭스 생성 (딕셔너리 사용)"""
+    def _create_user_item_matrix(self, store):
+        """청크 단위로 채운 InteractionStore를 사용자-문제 매트릭스로 사용하고 norm/역색인 계산"""
         print("🔧 사용자-문제 매트릭스 생성 중...")
         
-        self.user_item_matrix = defaultdict(dict)
-        
-        for _, row in self.problem_data.iterrows():
-            user = row['SOLVER_HANDLE']
-            problem = row['PROBLEM_ID']
-            level = row['SOLVED_LVL']
-            
-            self.user_item_matrix[user][problem] = level
+        self.user_item_matrix = store
         
         print(f"   - 매트릭스 생성 완료: {len(self.user_item_matrix)}명의 사용자")
+        
+        self.user_norms = store.norms()
+        
+        self._build_problem_solvers_index()
     
-    def _cosine_similarity(self, user1_problems, user2_problems):
-        """두 사용자 간의 코사인 유사도 계산"""
+    def _compute_user_norms(self):
+        """모든 사용자의 벡터 크기를 한 번만 계산해 캐시"""
+        self.user_norms = {
+            user: math.sqrt(sum(level ** 2 for level in user_problems.values()))
+            for user, user_problems in self.user_item_matrix.items()
+        }
+    
+    def update_user_norm(self, user):
+        """풀이 기록이 바뀐 사용자 한 명의 벡터 크기만 다시 계산"""
+        if user in self.user_item_matrix:
+            user_problems = self.user_item_matrix[user]
+            self.user_norms[user] = math.sqrt(sum(level ** 2 for level in user_problems.values()))
+        else:
+            self.user_norms.pop(user, None)
+    
+    def _build_problem_solvers_index(self):
+        """문제별로 그 문제를 푼 사용자 목록(posting list) 생성"""
+        if isinstance(self.user_item_matrix, InteractionStore):
+            self.problem_solvers = self.user_item_matrix.build_solvers_index()
+            return
+        
+        problem_solvers = defaultdict(list)
+        
+        for user, user_problems in self.user_item_matrix.items():
+            for problem, level in user_problems.items():
+                problem_solvers[problem].append((user, level))
+        
+        self.problem_solvers = dict(problem_solvers)
+    
+    def _cosine_similarity(self, user1_problems, user2_problems, norm1=None, norm2=None):
+        """두 사용자 간의 코사인 유사도 계산 (norm을 넘기면 캐시된 값을 사용)"""
         # 공통 문제 찾기
         common_problems = set(user1_problems.keys()) & set(user2_problems.keys())
         
@@ -71,38 +210,352 @@ class SimpleCollaborativeRecommender:
         dot_product = sum(user1_problems[p] * user2_problems[p] for p in common_problems)
         
         # 벡터 크기 계산
-        norm1 = math.sqrt(sum(user1_problems[p] ** 2 for p in user1_problems))
-        norm2 = math.sqrt(sum(user2_problems[p] ** 2 for p in user2_problems))
+        if norm1 is None:
+            norm1 = math.sqrt(sum(user1_problems[p] ** 2 for p in user1_problems))
+        if norm2 is None:
+            norm2 = math.sqrt(sum(user2_problems[p] ** 2 for p in user2_problems))
         
         if norm1 == 0 or norm2 == 0:
             return 0.0
         
         return dot_product / (norm1 * norm2)
     
-    def train_model(self):
-        """모델 학습 (사용자 간 유사도 계산)"""
+    def _find_similar_users(self, new_user_problems, exclude_user=None):
+        """
+        역색인을 이용해 새 사용자와 겹치는 문제가 있는 기존 사용자들과의 유사도 계산
+        공통 문제가 없는 사용자는 유사도가 0이므로 아예 방문하지 않음
+        exclude_user: 결과에서 뺄 사용자 (모델에 이미 들어 있는 요청자 본인)
+        """
+        dot_products = defaultdict(float)
+        
+        for problem, level in new_user_problems.items():
+            for existing_user, existing_level in self.problem_solvers.get(problem, ()):
+                dot_products[existing_user] += level * existing_level
+        
+        dot_products.pop(exclude_user, None)
+        
+        new_user_norm = math.sqrt(sum(level ** 2 for level in new_user_problems.values()))
+        if new_user_norm == 0:
+            return {}
+        
+        user_similarities = {}
+        for existing_user, dot_product in dot_products.items():
+            if dot_product <= 0:
+                continue
+            
+            existing_norm = self.user_norms[existing_user]
+            if existing_norm == 0:
+                continue
+            
+            user_similarities[existing_user] = dot_product / (new_user_norm * existing_norm)
+        
+        return user_similarities
+    
+    def _build_interaction_arrays(self):
+        """
+        사용자/문제를 정수 인덱스로 변환하고 CSR 배열 (indptr, indices, data) 생성
+        행 = self.user_ids 순서, 열 = self.problem_ids 순서
+        """
+        if isinstance(self.user_item_matrix, InteractionStore):
+            self.user_ids, self.problem_ids, indptr, indices, data = self.user_item_matrix.to_csr()
+            self.user_index = {user: i for i, user in enumerate(self.user_ids)}
+            self.problem_index = {problem: j for j, problem in enumerate(self.problem_ids)}
+            return indptr, indices, data
+        
+        self.user_ids = list(self.user_item_matrix.keys())
+        self.user_index = {user: i for i, user in enumerate(self.user_ids)}
+        
+        problems = set()
+        for user_problems in self.user_item_matrix.values():
+            problems.update(user_problems.keys())
+        self.problem_ids = sorted(problems)
+        self.problem_index = {problem: j for j, problem in enumerate(self.problem_ids)}
+        
+        indptr = [0]
+        indices = []
+        data = []
+        for user in self.user_ids:
+            for problem, level in self.user_item_matrix[user].items():
+                indices.append(self.problem_index[problem])
+                data.append(level)
+            indptr.append(len(indices))
+        
+        return (np.asarray(indptr, dtype=np.int64),
+                np.asarray(indices, dtype=np.int32),
+                np.asarray(data, dtype=np.float64))
+    
+    def _build_sparse_matrix(self):
+        """사용자-문제 CSR 희소 행렬 생성"""
+        indptr, indices, data = self._build_interaction_arrays()
+        return sparse.csr_matrix(
+            (data, indices, indptr),
+            shape=(len(self.user_ids), len(self.problem_ids))
+        )
+    
+    def train_model(self, block_size=1024, n_workers=1):
+        """
+        모델 학습 (사용자 간 유사도 계산)
+        
+        block_size: 한 번에 유사도를 계산할 사용자 수
+        n_workers: 2 이상이면 사용자 블록을 여러 프로세스로 나눠 계산 (None이면 CPU 수만큼)
+        """
         if not self.user_item_matrix:
             raise ValueError("❌ 먼저 데이터를 로드해주세요!")
         
         print("🤖 모델 학습 시작...")
         
+        if n_workers is None:
+            n_workers = os.cpu_count() or 1
+        
+        if SPARSE_AVAILABLE:
+            self._train_sparse(block_size, n_workers)
+        else:
+            self._train_pure_python()
+        
+        self._build_popularity()
+        self.trained = True
+        print("\n✅ 모델 학습 완료!")
+    
+    def _train_sparse(self, block_size, n_workers=1):
+        """
+        희소 행렬 곱으로 모든 사용자 쌍의 코사인 유사도를 블록 단위로 계산
+        행을 미리 정규화해 두면 (블록 x 전체) 행렬 곱 한 번이 곧 유사도 블록이 됨
+        """
+        matrix = self._build_sparse_matrix()
+        users = self.user_ids
+        n_users = len(users)
+        
+        norms = np.asarray([self.user_norms[user] for user in users], dtype=np.float64)
+        inv_norms = np.zeros_like(norms)
+        nonzero = norms > 0
+        inv_norms[nonzero] = 1.0 / norms[nonzero]
+        
+        normalized = sparse.diags(inv_norms).dot(matrix).tocsr()
+        normalized_t = normalized.T.tocsr()
+        
+        self.neighbors = NeighborStore(users, k=self.n_neighbors, quantize=self.quantize)
+        self._compute_neighbor_blocks(self.neighbors, normalized, normalized_t, block_size, n_workers)
+    
+    def _compute_neighbor_blocks(self, store, normalized, normalized_t, block_size, n_workers):
+        """정규화된 행렬의 행 블록마다 top-K 이웃을 계산해 store에 기록"""
+        n_users = normalized.shape[0]
+        blocks = [
+            (start, min(start + block_size, n_users), store.k)
+            for start in range(0, n_users, block_size)
+        ]
+        
+        if n_workers > 1 and len(blocks) > 1:
+            self._train_blocks_parallel(store, normalized, normalized_t, blocks, n_workers)
+            return
+        
+        for start, end, k in blocks:
+            print(f"   진행률: {end}/{n_users}", end='\r')
+            store.set_block(start, *_similarity_block_top_k(normalized, normalized_t, start, end, k))
+    
+    def _train_blocks_parallel(self, store, normalized, normalized_t, blocks, n_workers):
+        """
+        행 블록을 ProcessPoolExecutor로 나눠 계산
+        정규화된 행렬은 임시 .npy 파일로 한 번만 써 두고 워커들이 mmap으로 공유해 읽음
+        결과는 블록 시작 위치에 그대로 기록하므로 워커 수와 관계없이 항상 같은 결과가 나옴
+        """
+        n_users = normalized.shape[0]
+        print(f"   워커 {n_workers}개로 {len(blocks)}개 블록 병렬 계산")
+        
+        with tempfile.TemporaryDirectory(prefix="recommender_train_") as matrix_dir:
+            for name, matrix in (('normalized', normalized), ('normalized_t', normalized_t)):
+                np.save(os.path.join(matrix_dir, f"{name}_data.npy"), matrix.data)
+                np.save(os.path.join(matrix_dir, f"{name}_indices.npy"), matrix.indices)
+                np.save(os.path.join(matrix_dir, f"{name}_indptr.npy"), matrix.indptr)
+            
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=_init_training_worker,
+                initargs=(matrix_dir, normalized.shape)
+            ) as executor:
+                done = 0
+                for start, block_result in executor.map(_train_block_worker, blocks):
+                    store.set_block(start, *block_result)
+                    done += len(block_result[2])
+                    print(f"   진행률: {done}/{n_users}", end='\r')
+    
+    def _train_pure_python(self):
+        """scipy가 없을 때 사용하는 순수 Python 학습 (역색인으로 겹치는 사용자만 계산)"""
         users = list(self.user_item_matrix.keys())
-        self.user_similarity = defaultdict(dict)
+        self.neighbors = NeighborStore(users, k=self.n_neighbors, quantize=self.quantize)
         
-        # 모든 사용자 쌍에 대해 유사도 계산
         for i, user1 in enumerate(users):
             print(f"   진행률: {i+1}/{len(users)}", end='\r')
             
-            for user2 in users:
-                if user1 != user2:
-                    similarity = self._cosine_similarity(
-                        self.user_item_matrix[user1],
-                        self.user_item_matrix[user2]
-                    )
-                    self.user_similarity[user1][user2] = similarity
+            similarities = self._find_similar_users(self.user_item_matrix[user1])
+            indices = [self.neighbors.user_index[user2] for user2 in similarities]
+            self.neighbors.set_from_scores(i, indices, list(similarities.values()))
+    
+    def _overlapping_users(self, user_problems):
+        """주어진 문제 중 하나라도 푼 사용자 집합"""
+        users = set()
+        for problem in user_problems:
+            for user, _ in self.problem_solvers.get(problem, ()):
+                users.add(user)
+        return users
+    
+    def _add_postings(self, user, user_problems):
+        # 역색인이 mmap 뷰일 수도 있으므로 목록을 제자리에서 고치지 않고 다시 대입
+        for problem, level in user_problems.items():
+            solvers = list(self.problem_solvers.get(problem, ()))
+            solvers.append((user, level))
+            self.problem_solvers[problem] = solvers
+    
+    def _remove_postings(self, user, user_problems):
+        for problem in user_problems:
+            solvers = self.problem_solvers.get(problem)
+            if solvers is None:
+                continue
+            solvers = [entry for entry in solvers if entry[0] != user]
+            if solvers:
+                self.problem_solvers[problem] = solvers
+            else:
+                del self.problem_solvers[problem]
+    
+    def upsert_user(self, user, solved):
+        """
+        전체 재학습 없이 사용자 한 명을 추가하거나 풀이 기록을 갱신
+        이 사용자와 공통 문제가 있는 사용자들의 이웃 목록만 고치므로 비용은 겹치는 사용자 수에 비례
+        인기 순위와 밀려난 이웃은 compact() 때 다시 계산
         
-        self.trained = True
-        print("\n✅ 모델 학습 완료!")
+        Parameters:
+        solved: {문제 ID: 난이도} 딕셔너리
+        
+        반환값: 모델이 실제로 바뀌었으면 True
+        """
+        if not self.trained:
+            raise ValueError("❌ 먼저 모델을 학습해주세요!")
+        
+        solved = {int(problem): level for problem, level in solved.items()}
+        old_problems = self.user_item_matrix.get(user)
+        if old_problems == solved:
+            return False
+        
+        # 이전 기록 기준으로 겹치던 사용자도 이웃 목록을 고쳐야 함
+        affected_users = set()
+        if old_problems is not None:
+            affected_users = self._overlapping_users(old_problems)
+            self._remove_postings(user, old_problems)
+        
+        self.user_item_matrix[user] = solved
+        self._add_postings(user, solved)
+        self.update_user_norm(user)
+        
+        similarities = self._find_similar_users(solved, exclude_user=user)
+        affected_users.discard(user)
+        affected_users.update(similarities.keys())
+        
+        row = self.neighbors.add_user(user)
+        indices = [self.neighbors.user_index[other] for other in similarities]
+        self.neighbors.set_from_scores(row, indices, list(similarities.values()))
+        
+        for other in affected_users:
+            self.neighbors.update_neighbor(other, user, similarities.get(other, 0))
+        
+        self._record_update('upsert', user, solved)
+        return True
+    
+    def remove_user(self, user):
+        """
+        사용자 한 명을 모델에서 삭제 (겹치는 사용자들의 이웃 목록에서도 제거)
+        반환값: 삭제했으면 True
+        """
+        old_problems = self.user_item_matrix.get(user)
+        if old_problems is None:
+            return False
+        
+        affected_users = self._overlapping_users(old_problems)
+        affected_users.discard(user)
+        
+        self._remove_postings(user, old_problems)
+        del self.user_item_matrix[user]
+        self.update_user_norm(user)
+        self.neighbors.remove_user(user, affected_users)
+        
+        self._record_update('remove', user, None)
+        return True
+    
+    def has_user_history(self, user, solved):
+        """
+        모델에 있는 사용자 풀이 기록이 solved와 같으면 True (upsert_user가 아무것도 바꾸지 않는 경우)
+        모델을 고치지 않으므로 읽기 잠금만 잡고 호출할 수 있음
+        """
+        return self.user_item_matrix.get(user) == self._solved_mapping(solved)
+    
+    def _record_update(self, action, user, solved):
+        self.pending_updates.append((action, user, solved))
+        self.updates_since_compact += 1
+    
+    def take_pending_updates(self):
+        """아직 파일에 쓰지 않은 갱신 기록을 꺼내고 비움 (모델을 고치는 잠금 안에서 호출)"""
+        updates, self.pending_updates = self.pending_updates, []
+        return updates
+    
+    def compact(self, n_workers=1):
+        """
+        쌓인 증분 갱신 정리: 전체 재학습으로 이웃 목록과 인기 순위를 다시 계산하고
+        삭제된 사용자 자리를 없앰
+        """
+        print(f"🧹 증분 갱신 {self.updates_since_compact}건 정리 중...")
+        self.train_model(n_workers=n_workers)
+        self.pending_updates = []
+        self.updates_since_compact = 0
+    
+    def save_delta(self, delta_path="simple_recommendation_delta.pkl", updates=None):
+        """
+        증분 갱신 기록을 파일 끝에 덧붙임 (이미 쓴 기록은 다시 쓰지 않으므로 비용은 새 기록 수에 비례)
+        updates: 쓸 기록 (없으면 take_pending_updates()로 꺼낸 기록)
+        반환값: 쓴 기록 수
+        """
+        if updates is None:
+            updates = self.take_pending_updates()
+        if not updates:
+            return 0
+        
+        # 기록마다 pickle 하나씩 이어 붙이고 한 번에 써서 다른 쓰기와 섞이지 않게 함
+        payload = b''.join(pickle.dumps(update) for update in updates)
+        with open(delta_path, 'ab') as f:
+            f.write(payload)
+        return len(updates)
+    
+    @staticmethod
+    def _read_delta(delta_path):
+        """증분 갱신 파일의 기록을 순서대로 읽음 (마지막 기록이 쓰다 만 상태면 그 앞까지만)"""
+        updates = []
+        with open(delta_path, 'rb') as f:
+            while True:
+                try:
+                    record = pickle.load(f)
+                except EOFError:
+                    break
+                except pickle.UnpicklingError:
+                    print(f"⚠️ {delta_path}의 마지막 기록이 손상되어 건너뜁니다.")
+                    break
+                # 이전 형식은 {'updates': [...]} 하나로 저장됨
+                if isinstance(record, dict):
+                    updates.extend(record['updates'])
+                else:
+                    updates.append(record)
+        return updates
+    
+    def load_delta(self, delta_path="simple_recommendation_delta.pkl"):
+        """저장된 증분 갱신 기록을 현재 모델에 순서대로 적용"""
+        if not os.path.exists(delta_path):
+            raise FileNotFoundError(f"❌ {delta_path} 파일을 찾을 수 없습니다!")
+        
+        applied = 0
+        for action, user, solved in self._read_delta(delta_path):
+            if action == 'upsert':
+                applied += self.upsert_user(user, solved)
+            elif action == 'remove':
+                applied += self.remove_user(user)
+        
+        print(f"📦 증분 갱신 {applied}건을 {delta_path}에서 적용했습니다.")
+        return applied
     
     def get_user_recommendations(self, user_id, n_recommendations=10):
         """특정 사용자에게 문제 추천"""
@@ -112,7 +565,7 @@ class SimpleCollaborativeRecommender:
         # 사용자가 존재하는지 확인
         if user_id not in self.user_item_matrix:
             print(f"⚠️ 사용자 '{user_id}'를 찾을 수 없습니다.")
-            available_users = list(self.user_item_matrix.keys())[:5]
+            available_users = list(islice(self.user_item_matrix.keys(), 5))
             print(f"   사용 가능한 사용자 예시: {available_users}")
             return []
         
@@ -122,35 +575,32 @@ class SimpleCollaborativeRecommender:
         solved_problems = set(self.user_item_matrix[user_id].keys())
         print(f"   - 이미 푼 문제 수: {len(solved_problems)}")
         
-        # 유사한 사용자들 찾기
-        similar_users = sorted(
-            self.user_similarity[user_id].items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:10]  # 상위 10명의 유사한 사용자
+        # 유사한 사용자들 찾기 (이웃 저장소는 유사도 내림차순으로 정렬되어 있음)
+        similar_users = self.neighbors.neighbors(user_id)[:10]  # 상위 10명의 유사한 사용자
         
         # 추천 점수 계산
-        recommendations = defaultdict(float)
+        with timed('scoring'):
+            recommendations = defaultdict(float)
         
-        for similar_user, similarity_score in similar_users:
-            if similarity_score <= 0:
-                continue
+            for similar_user, similarity_score in similar_users:
+                if similarity_score <= 0:
+                    continue
                 
-            for problem, rating in self.user_item_matrix[similar_user].items():
-                if problem not in solved_problems:
-                    recommendations[problem] += similarity_score * rating
+                for problem, rating in self.user_item_matrix[similar_user].items():
+                    if problem not in solved_problems:
+                        recommendations[problem] += similarity_score * rating
+        
+            # 추천 점수 기준으로 정렬
+            sorted_recommendations = sorted(
+                recommendations.items(),
+                key=lambda x: x[1],
+                reverse=True
+            )
         
         if not recommendations:
             print("   - 추천할 수 있는 문제가 없습니다.")
             return []
         
-        # 추천 점수 기준으로 정렬
-        sorted_recommendations = sorted(
-            recommendations.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-        
         # 결과 포맷팅
         result = []
         for problem_id, score in sorted_recommendations[:n_recommendations]:
@@ -164,6 +614,24 @@ class SimpleCollaborativeRecommender:
         
         return result
     
+    @staticmethod
+    def _solved_mapping(solved):
+        """
+        풀이 기록을 {문제 ID: 난이도} 딕셔너리로 변환
+        solved: {문제 ID: 난이도} 매핑 또는 (문제 ID 배열, 난이도 배열) 쌍
+        """
+        if isinstance(solved, Mapping):
+            return {int(problem_id): level for problem_id, level in solved.items()}
+        problem_ids, levels = solved
+        return {int(problem_id): level for problem_id, level in zip(problem_ids, levels)}
+    
+    def _new_user_problems(self, new_user_df):
+        """DataFrame(['SOLVER_HANDLE', 'PROBLEM_ID', 'SOLVED_LVL'])에서 (핸들, {문제 ID: 난이도}) 추출"""
+        user_handle = new_user_df['SOLVER_HANDLE'].iloc[0]
+        return user_handle, self._solved_mapping(
+            (new_user_df['PROBLEM_ID'].tolist(), new_user_df['SOLVED_LVL'].tolist())
+        )
+    
     def get_recommendations_for_new_user(self, new_user_df, n_recommendations=10):
         """
         새로운 사용자 데이터를 받아서 실시간 추천 생성
@@ -172,34 +640,40 @@ class SimpleCollaborativeRecommender:
         new_user_df: pandas DataFrame with columns ['SOLVER_HANDLE', 'PROBLEM_ID', 'SOLVED_LVL']
         n_recommendations: 추천할 문제 수
         """
+        if new_user_df is None or len(new_user_df) == 0:
+            if not self.trained:
+                raise ValueError("❌ 먼저 모델을 학습해주세요!")
+            print("❌ 사용자 데이터가 비어있습니다.")
+            return []
+        
+        user_handle, new_user_problems = self._new_user_problems(new_user_df)
+        return self.get_recommendations_for_user_history(user_handle, new_user_problems, n_recommendations)
+    
+    def get_recommendations_for_user_history(self, user_handle, solved, n_recommendations=10):
+        """
+        DataFrame 없이 풀이 기록만으로 실시간 추천 생성
+        
+        Parameters:
+        user_handle: 사용자 핸들 (유사 사용자 검색에서 본인 제외에 사용)
+        solved: {문제 ID: 난이도} 매핑 또는 (문제 ID 배열, 난이도 배열) 쌍
+        n_recommendations: 추천할 문제 수
+        """
         if not self.trained:
             raise ValueError("❌ 먼저 모델을 학습해주세요!")
         
-        if new_user_df is None or len(new_user_df) == 0:
+        new_user_problems = self._solved_mapping(solved)
+        if not new_user_problems:
             print("❌ 사용자 데이터가 비어있습니다.")
             return []
         
-        # 새 사용자 정보 추출
-        user_handle = new_user_df['SOLVER_HANDLE'].iloc[0]
         print(f"🎯 새 사용자 '{user_handle}'을 위한 추천 생성 중...")
         
-        # 새 사용자의 문제-난이도 매핑 생성
-        new_user_problems = {}
-        for _, row in new_user_df.iterrows():
-            problem_id = row['PROBLEM_ID']
-            level = row['SOLVED_LVL']
-            new_user_problems[problem_id] = level
-        
         solved_problems = set(new_user_problems.keys())
         print(f"   - 새 사용자가 푼 문제 수: {len(solved_problems)}")
         
-        # 기존 사용자들과의 유사도 계산
-        user_similarities = {}
-        
-        for existing_user, existing_problems in self.user_item_matrix.items():
-            similarity = self._cosine_similarity(new_user_problems, existing_problems)
-            if similarity > 0:  # 유사도가 0보다 큰 경우만
-                user_similarities[existing_user] = similarity
+        # 기존 사용자들과의 유사도 계산 (유사도가 0보다 큰 경우만, 본인 제외)
+        with timed('similarity_scan'):
+            user_similarities = self._find_similar_users(new_user_problems, exclude_user=user_handle)
         
         if not user_similarities:
             print("   - 유사한 사용자를 찾을 수 없습니다.")
@@ -215,24 +689,25 @@ class SimpleCollaborativeRecommender:
         print(f"   - 유사한 사용자 {len(similar_users)}명 발견")
         
         # 추천 점수 계산
-        recommendations = defaultdict(float)
+        with timed('scoring'):
+            recommendations = defaultdict(float)
         
-        for similar_user, similarity_score in similar_users:
-            for problem, rating in self.user_item_matrix[similar_user].items():
-                if problem not in solved_problems:  # 아직 안 푼 문제만
-                    recommendations[problem] += similarity_score * rating
+            for similar_user, similarity_score in similar_users:
+                for problem, rating in self.user_item_matrix[similar_user].items():
+                    if problem not in solved_problems:  # 아직 안 푼 문제만
+                        recommendations[problem] += similarity_score * rating
+        
+            # 추천 점수 기준으로 정렬
+            sorted_recommendations = sorted(
+                recommendations.items(),
+                key=lambda x: x[1],
+                reverse=True
+            )
         
         if not recommendations:
             print("   - 추천할 수 있는 문제가 없습니다.")
             return self._get_popular_recommendations(solved_problems, n_recommendations)
         
-        # 추천 점수 기준으로 정렬
-        sorted_recommendations = sorted(
-            recommendations.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-        
         # 결과 포맷팅
         result = []
         for problem_id, score in sorted_recommendations[:n_recommendations]:
@@ -248,38 +723,110 @@ class SimpleCollaborativeRecommender:
         
         return result
     
-    def _get_popular_recommendations(self, solved_problems, n_recommendations):
+    def _build_popularity(self):
         """
-        유사한 사용자를 찾을 수 없을 때 인기 문제 추천
+        인기도 점수(풀이 수 * 평균 난이도) 기준으로 모든 문제의 순위를 미리 계산
+        인기 문제 추천은 이 순위를 앞에서부터 훑기만 하면 됨
         """
-        print("   - 인기 문제를 추천합니다...")
-        
-        # 전체 사용자들이 많이 푼 문제들 중에서 추천
         problem_counts = defaultdict(int)
-        problem_avg_levels = defaultdict(list)
+        problem_level_sums = defaultdict(float)
         
         for user_problems in self.user_item_matrix.values():
             for problem, level in user_problems.items():
-                if problem not in solved_problems:
-                    problem_counts[problem] += 1
-                    problem_avg_levels[problem].append(level)
+                problem_counts[problem] += 1
+                problem_level_sums[problem] += level
+        
+        n_problems = len(problem_counts)
+        problem_ids = np.fromiter(problem_counts.keys(), dtype=np.int64, count=n_problems)
+        counts = np.fromiter(problem_counts.values(), dtype=np.int64, count=n_problems)
+        level_sums = np.fromiter(problem_level_sums.values(), dtype=np.float64, count=n_problems)
+        
+        avg_levels = level_sums / np.maximum(counts, 1)
+        scores = counts * avg_levels  # 인기도 * 평균 난이도
+        
+        # 점수가 같으면 먼저 등장한 문제가 앞에 오도록 안정 정렬
+        order = np.argsort(-scores, kind='stable')
+        self.popular_problems = {
+            'problem_ids': problem_ids[order],
+            'scores': scores[order],
+            'counts': counts[order]
+        }
         
-        # 인기도와 평균 난이도를 고려한 점수 계산
+        self.popular_problems_by_tag = {}
+        if self.problem_store is not None:
+            self._build_tag_popularity()
+    
+    def _build_tag_popularity(self):
+        """로컬 태그 색인을 이용해 전체 인기 순위를 태그별 순위로 분리"""
+        ranked_ids = self.popular_problems['problem_ids'].tolist()
+        positions_by_tag = defaultdict(list)
+        
+        for position, problem_id in enumerate(ranked_ids):
+            for tag_name in self.problem_store.tags_of(problem_id) or ():
+                positions_by_tag[tag_name].append(position)
+        
+        self.popular_problems_by_tag = {
+            tag_name: self._select_popular_positions(positions)
+            for tag_name, positions in positions_by_tag.items()
+        }
+    
+    def _select_popular_positions(self, positions):
+        positions = np.asarray(positions, dtype=np.int64)
+        return {
+            'problem_ids': self.popular_problems['problem_ids'][positions],
+            'scores': self.popular_problems['scores'][positions]
+        }
+    
+    def _get_tag_popularity(self, tag_name):
+        """
+        미리 계산된 태그별 인기 순위 반환 (없으면 None)
+        태그 색인이 있으면 학습/로드 때 모든 태그의 순위를 계산해 두므로, 여기 없는 태그는 순위가 빈 태그
+        요청 처리 중(읽기 잠금)에 호출되므로 공유 상태를 고치지 않음
+        """
+        tag_popularity = self.popular_problems_by_tag.get(tag_name)
+        if tag_popularity is None and self.problem_store is not None:
+            return self._select_popular_positions([])
+        return tag_popularity
+    
+    def _walk_popular_ranking(self, problem_ids, scores, solved_problems, n_recommendations, min_counts=None,
+                              include=None):
+        """
+        미리 계산된 순위를 앞에서부터 훑으며 이미 푼 문제를 건너뛰고 N개 선택
+        include: 주어지면 include(문제 ID)가 참인 문제만 선택 (N개를 채우면 더 확인하지 않음)
+        """
         popular_problems = []
-        for problem, count in problem_counts.items():
-            if count >= 2:  # 최소 2명 이상이 푼 문제
-                avg_level = sum(problem_avg_levels[problem]) / len(problem_avg_levels[problem])
-                popularity_score = count * avg_level  # 인기도 * 평균 난이도
-                popular_problems.append({
-                    'problem_id': int(problem),
-                    'estimated_rating': float(popularity_score),
-                    'actual_rating': None
-                })
         
-        # 인기도 기준으로 정렬
-        popular_problems.sort(key=lambda x: x['estimated_rating'], reverse=True)
+        for position, problem_id in enumerate(problem_ids.tolist()):
+            if len(popular_problems) >= n_recommendations:
+                break
+            if problem_id in solved_problems:
+                continue
+            if min_counts is not None and min_counts[position] < 2:  # 최소 2명 이상이 푼 문제
+                continue
+            if include is not None and not include(problem_id):
+                continue
+            
+            popular_problems.append({
+                'problem_id': int(problem_id),
+                'estimated_rating': float(scores[position]),
+                'actual_rating': None
+            })
         
-        return popular_problems[:n_recommendations]
+        return popular_problems
+    
+    def _get_popular_recommendations(self, solved_problems, n_recommendations):
+        """
+        유사한 사용자를 찾을 수 없을 때 인기 문제 추천
+        """
+        print("   - 인기 문제를 추천합니다...")
+        
+        return self._walk_popular_ranking(
+            self.popular_problems['problem_ids'],
+            self.popular_problems['scores'],
+            solved_problems,
+            n_recommendations,
+            min_counts=self.popular_problems['counts']
+        )
     
     def get_user_stats(self, user_id):
         """사용자 통계 정보"""
@@ -301,34 +848,38 @@ class SimpleCollaborativeRecommender:
         """
         새로운 사용자에게 특정 태그 문제만 추천
         """
+        if new_user_df is None or len(new_user_df) == 0:
+            if not self.trained:
+                raise ValueError("❌ 먼저 모델을 학습해주세요!")
+            print("❌ 사용자 데이터가 비어있습니다.")
+            return []
+        
+        user_handle, new_user_problems = self._new_user_problems(new_user_df)
+        return self.get_recommendations_for_user_history_by_tag(
+            user_handle, new_user_problems, tag_name, n_recommendations
+        )
+    
+    def get_recommendations_for_user_history_by_tag(self, user_handle, solved, tag_name, n_recommendations=10):
+        """
+        DataFrame 없이 풀이 기록만으로 특정 태그 문제 추천
+        solved: {문제 ID: 난이도} 매핑 또는 (문제 ID 배열, 난이도 배열) 쌍
+        """
         if not self.trained:
             raise ValueError("❌ 먼저 모델을 학습해주세요!")
         
-        if new_user_df is None or len(new_user_df) == 0:
+        new_user_problems = self._solved_mapping(solved)
+        if not new_user_problems:
             print("❌ 사용자 데이터가 비어있습니다.")
             return []
         
-        # 새 사용자 정보 추출
-        user_handle = new_user_df['SOLVER_HANDLE'].iloc[0]
         print(f"🎯 새 사용자 '{user_handle}'에게 '{tag_name}' 태그 문제 추천 중...")
         
-        # 새 사용자의 문제-난이도 매핑 생성
-        new_user_problems = {}
-        for _, row in new_user_df.iterrows():
-            problem_id = row['PROBLEM_ID']
-            level = row['SOLVED_LVL']
-            new_user_problems[problem_id] = level
-        
         solved_problems = set(new_user_problems.keys())
         print(f"   - 새 사용자가 푼 문제 수: {len(solved_problems)}")
         
-        # 기존 사용자들과의 유사도 계산
-        user_similarities = {}
-
-        for existing_user, existing_problems in self.user_item_matrix.items():
-            similarity = self._cosine_similarity(new_user_problems, existing_problems)
-            if similarity > 0:  # 유사도가 0보다 큰 경우만
-                user_similarities[existing_user] = similarity
+        # 기존 사용자들과의 유사도 계산 (유사도가 0보다 큰 경우만, 본인 제외)
+        with timed('similarity_scan'):
+            user_similarities = self._find_similar_users(new_user_problems, exclude_user=user_handle)
         
         if not user_similarities:
             print("   - 유사한 사용자를 찾을 수 없습니다.")
@@ -344,26 +895,27 @@ class SimpleCollaborativeRecommender:
         print(f"   - 유사한 사용자 {len(similar_users)}명 발견")
         
         # 추천 점수 계산 (태그별 필터링 포함)
-        recommendations = defaultdict(float)
-        
-        for similar_user, similarity_score in similar_users:
-            for problem, rating in self.user_item_matrix[similar_user].items():
-                if problem not in solved_problems:  # 아직 안 푼 문제만
-                    # 간단한 태그 필터링 (문제 번호 범위 기반)
-                    if self._is_tag_problem(problem, tag_name):
-                        recommendations[problem] += similarity_score * rating
+        with timed('scoring'), cache_lookups('tag_index') as lookups:
+            recommendations = defaultdict(float)
+        
+            for similar_user, similarity_score in similar_users:
+                for problem, rating in self.user_item_matrix[similar_user].items():
+                    if problem not in solved_problems:  # 아직 안 푼 문제만
+                        # 태그 필터링: 로컬 태그 색인(ProblemStore)에서 확인하고, 색인에 없는 문제만 solved.ac에서 조회
+                        if self._is_tag_problem(problem, tag_name, lookups):
+                            recommendations[problem] += similarity_score * rating
 
+            # 추천 점수 기준으로 정렬
+            sorted_recommendations = sorted(
+                recommendations.items(),
+                key=lambda x: x[1],
+                reverse=True
+            )
+        
         if not recommendations:
             print(f"   - '{tag_name}' 태그 문제를 찾을 수 없습니다.")
             return self._get_popular_recommendations_by_tag(solved_problems, tag_name, n_recommendations)
         
-        # 추천 점수 기준으로 정렬
-        sorted_recommendations = sorted(
-            recommendations.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-        
         # 결과 포맷팅
         result = []
         for problem_id, score in sorted_recommendations[:n_recommendations]:
@@ -379,40 +931,46 @@ class SimpleCollaborativeRecommender:
         
         return result
             
-    def makeRequest(self, url, querystring):
-        headers = {"Content-Type": "application/json"}
-        try:
-            response = requests.request("GET", url, headers=headers, params=querystring)
-            response.raise_for_status()
-            return response
-        except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
-            print(f"API Error: {e}")
+    def load_tag_index(self, csv_file_path):
+        """problem_all.csv에서 태그 -> 문제 ID 색인 로드"""
+        self.set_problem_store(ProblemStore(csv_file_path))
+    
+    def set_problem_store(self, problem_store):
+        """이미 로드된 문제 정보 저장소를 태그 색인으로 사용 (웹 서버와 같은 저장소를 공유)"""
+        self.problem_store = problem_store
+        
+        # 태그 색인이 생겼으므로 태그별 인기 순위를 미리 계산 (모델에 이미 있으면 그대로 사용)
+        if self.popular_problems is not None and not self.popular_problems_by_tag:
+            self._build_tag_popularity()
+    
+    def _fetch_problem_tags(self, problem_id):
+        """solved.ac에서 문제 하나의 태그 목록 조회 (실패 시 None)"""
+        problem_info = get_client().get_json("problem/show", {"problemId": problem_id})
+        if problem_info is None:
             return None
+        
+        # 조회한 문제는 제목/난이도까지 색인에 추가해 다음부터는 로컬에서 처리
+        if self.problem_store is not None:
+            self.problem_store.add_problem_info(problem_info, problem_id)
+        
+        # tags가 없는 경우를 대비해 기본값으로 빈 리스트([])를 사용
+        return parse_tag_names(problem_info.get("tags", []))
     
-    def _is_tag_problem(self, problem_id, tag_name):
-        response = self.makeRequest("https://solved.ac/api/v3/problem/show", {"problemId": problem_id})
-        if response is None:
+    def _is_tag_problem(self, problem_id, tag_name, lookups):
+        # 로컬 색인에 있는 문제는 메모리에서 바로 확인
+        # 색인 적중/실패는 lookups(cache_lookups('tag_index'))에 모아 요청당 한 번만 기록
+        tags = self.problem_store.tags_of(problem_id) if self.problem_store is not None else None
+        lookups.record(tags is not None)
+        if tags is not None:
+            return tag_name in tags
+        
+        # 색인에 없는 문제만 solved.ac에서 조회
+        # 결과는 _fetch_problem_tags가 색인에 추가 (읽기 잠금만 잡은 요청끼리도 저장소 자체 잠금으로 보호됨)
+        tag_list = self._fetch_problem_tags(problem_id)
+        if tag_list is None:
             return False
         
-        # JSON 객체를 직접 사용하고, tags가 없는 경우를 대비해 기본값으로 빈 리스트([])를 사용
-        problem_info = response.json()
-        tags = problem_info.get("tags", [])
-
-        # 태그가 없는 문제일 경우
-        if not tags:
-            return False
-
-        # 리스트 컴프리헨션을 더 안전하게 변경
-        try:
-            tag_list = [
-                tag.get("displayNames")[1].get("short").replace(' ', '_')
-                for tag in tags
-                if tag and isinstance(tag.get("displayNames"), list) and len(tag.get("displayNames")) > 1
-            ]
-            return tag_name in tag_list
-        except (TypeError, IndexError, AttributeError):
-            # 예기치 않은 태그 구조에 대한 예외 처리
-            return False
+        return tag_name in tag_list
     
     def _get_popular_recommendations_by_tag(self, solved_problems, tag_name, n_recommendations):
         """
@@ -420,50 +978,54 @@ class SimpleCollaborativeRecommender:
         """
         print(f"   - '{tag_name}' 태그 인기 문제를 추천합니다...")
         
-        # 전체 사용자들이 많이 푼 문제들 중에서 태그별 필터링
-        problem_counts = defaultdict(int)
-        problem_avg_levels = defaultdict(list)
-        
-        for user_problems in self.user_item_matrix.values():
-            for problem, level in user_problems.items():
-                if problem not in solved_problems and self._is_tag_problem(problem, tag_name):
-                    problem_counts[problem] += 1
-                    problem_avg_levels[problem].append(level)
-        
-        # 인기도와 평균 난이도를 고려한 점수 계산
-        popular_problems = []
-        for problem, count in problem_counts.items():
-            if count >= 1:  # 최소 1명 이상이 푼 문제
-                avg_level = sum(problem_avg_levels[problem]) / len(problem_avg_levels[problem])
-                popularity_score = count * avg_level  # 인기도 * 평균 난이도
-                popular_problems.append({
-                    'problem_id': int(problem),
-                    'estimated_rating': float(popularity_score),
-                    'actual_rating': None
-                })
-        
-        # 인기도 기준으로 정렬
-        popular_problems.sort(key=lambda x: x['estimated_rating'], reverse=True)
-        
-        return popular_problems[:n_recommendations]
+        tag_popularity = self._get_tag_popularity(tag_name)
+        if tag_popularity is None:
+            # 태그 색인이 없으면 전체 순위를 앞에서부터 훑으며 N개를 채울 때까지만 태그를 확인
+            with cache_lookups('tag_index') as lookups:
+                return self._walk_popular_ranking(
+                    self.popular_problems['problem_ids'],
+                    self.popular_problems['scores'],
+                    solved_problems,
+                    n_recommendations,
+                    include=lambda problem_id: self._is_tag_problem(problem_id, tag_name, lookups)
+                )
+        
+        return self._walk_popular_ranking(
+            tag_popularity['problem_ids'],
+            tag_popularity['scores'],
+            solved_problems,
+            n_recommendations
+        )
 
 
     
+    def _user_item_dict(self):
+        """모델 파일에는 이전 버전과 같은 {사용자: {문제 ID: 난이도}} 딕셔너리로 저장"""
+        return {user: dict(user_problems.items()) for user, user_problems in self.user_item_matrix.items()}
+    
     def save_model(self, model_path="simple_recommendation_model.pkl"):
         """학습된 모델 저장"""
         if not self.trained:
             raise ValueError("❌ 저장할 학습된 모델이 없습니다!")
         
         model_data = {
-            'user_item_matrix': dict(self.user_item_matrix),
-            'user_similarity': dict(self.user_similarity),
+            'user_item_matrix': self._user_item_dict(),
+            'neighbors': self.neighbors.to_dict(),
+            'user_norms': dict(self.user_norms),
+            'popular_problems': self.popular_problems,
+            'popular_problems_by_tag': self.popular_problems_by_tag,
             'problem_data': self.problem_data
         }
         
         with open(model_path, 'wb') as f:
             pickle.dump(model_data, f)
         
+        # 저장된 모델에 증분 갱신이 모두 반영되었으므로 기록을 비움
+        self.pending_updates = []
+        
         print(f"💾 모델이 {model_path}에 저장되었습니다.")
+        print(f"   - 이웃 저장소 크기: {self.neighbors.nbytes:,} bytes "
+              f"(사용자당 {self.neighbors.k}명)")
     
     def load_model(self, model_path="simple_recommendation_model.pkl"):
         """저장된 모델 로드"""
@@ -473,13 +1035,94 @@ class SimpleCollaborativeRecommender:
         with open(model_path, 'rb') as f:
             model_data = pickle.load(f)
         
-        self.user_item_matrix = defaultdict(dict, model_data['user_item_matrix'])
-        self.user_similarity = defaultdict(dict, model_data['user_similarity'])
+        self.user_item_matrix = InteractionStore.from_dict(model_data['user_item_matrix'])
         self.problem_data = model_data['problem_data']
+        self._build_problem_solvers_index()
+        
+        # 이전 버전 모델 파일에는 norm이 없으므로 새로 계산
+        if 'user_norms' in model_data:
+            self.user_norms = dict(model_data['user_norms'])
+        else:
+            self._compute_user_norms()
+        
+        # 이전 버전 모델 파일은 전체 유사도 딕셔너리를 이웃 저장소로 변환
+        if 'neighbors' in model_data:
+            self.neighbors = NeighborStore.from_dict(model_data['neighbors'])
+        else:
+            self.neighbors = NeighborStore.from_similarity_dict(
+                model_data['user_similarity'], k=self.n_neighbors, quantize=self.quantize
+            )
+        
+        if model_data.get('popular_problems') is not None:
+            self.popular_problems = model_data['popular_problems']
+            self.popular_problems_by_tag = model_data.get('popular_problems_by_tag', {})
+        else:
+            self._build_popularity()
         self.trained = True
         
         print(f"📦 모델이 {model_path}에서 로드되었습니다.")
 
+# 사용자 기반 협업 필터링 엔진
+# mmap 바이너리 모델 형식(model_store)은 사용자 이웃 배열 구조에 맞춰져 있어 이 엔진만 지원함
+class SimpleCollaborativeRecommender(CollaborativeRecommenderBase):
+    def save_model_binary(self, model_dir="simple_recommendation_model"):
+        """학습된 모델을 mmap으로 열 수 있는 바이너리 디렉터리 형식으로 저장"""
+        if not self.trained:
+            raise ValueError("❌ 저장할 학습된 모델이 없습니다!")
+        
+        meta = model_store.save_binary_model(self, model_dir)
+        print(f"💾 바이너리 모델이 {model_dir}에 저장되었습니다. "
+              f"(사용자 {meta['n_users']}명, 풀이 기록 {meta['n_interactions']}개)")
+    
+    def load_model_binary(self, model_dir="simple_recommendation_model"):
+        """
+        바이너리 디렉터리 형식의 모델을 mmap으로 로드
+        배열은 실제로 접근할 때 읽히므로 로드 시간이 모델 크기와 무관함
+        """
+        model_store.load_binary_model(self, model_dir)
+        print(f"📦 바이너리 모델이 {model_dir}에서 로드되었습니다.")
+    
+    @staticmethod
+    def has_model_binary(model_dir="simple_recommendation_model"):
+        """로드할 수 있는 바이너리 모델이 있는지 (디렉터리만 있고 완성된 버전이 없으면 False)"""
+        return model_store.binary_model_exists(model_dir)
+
+def convert_model_to_binary(model_path, model_dir):
+    """기존 pickle 모델 파일(simple_recommendation_model.pkl)을 바이너리 형식으로 변환"""
+    recommender = SimpleCollaborativeRecommender()
+    recommender.load_model(model_path)
+    recommender.save_model_binary(model_dir)
+    return recommender
+
+def report_model_size(legacy_model_path, n_neighbors=DEFAULT_TOP_K, quantize=False):
+    """
+    이전 버전 모델 파일(전체 user_similarity 딕셔너리)과
+    top-K 이웃 저장소의 pickle 크기 비교
+    """
+    with open(legacy_model_path, 'rb') as f:
+        model_data = pickle.load(f)
+    
+    if 'user_similarity' not in model_data:
+        raise ValueError(f"❌ {legacy_model_path}는 이전 버전 모델 파일이 아닙니다!")
+    
+    dense_size = len(pickle.dumps(dict(model_data['user_similarity'])))
+    store = NeighborStore.from_similarity_dict(
+        model_data['user_similarity'], k=n_neighbors, quantize=quantize
+    )
+    store_size = len(pickle.dumps(store.to_dict()))
+    
+    print(f"📏 유사도 저장 크기 비교 ({len(store.user_ids)}명의 사용자)")
+    print(f"   - 기존 user_similarity 딕셔너리: {dense_size:,} bytes")
+    print(f"   - top-{n_neighbors} 이웃 저장소{' (float16)' if quantize else ''}: {store_size:,} bytes")
+    print(f"   - 이웃 배열 메모리: {store.nbytes:,} bytes")
+    
+    return {
+        'n_users': len(store.user_ids),
+        'dense_pickle_bytes': dense_size,
+        'neighbor_pickle_bytes': store_size,
+        'neighbor_array_bytes': store.nbytes
+    }
+
 # 🎯 사용 예시 함수
 def demo_simple_recommendation_system():
     """간단한 추천 시스템 데모"""
@@ -528,6 +1171,7 @@ def create_test_data():
     print("📝 테스트 데이터 생성 중...")
     
     import random
+    import pandas as pd
     
     # 가상의 사용자와 문제 데이터 생성
     users = [f"user{i}" for i in range(1, 21)]  # 20명의 사용자
@@ -0,0 +1,122 @@
+"""
+사용자별 풀이 기록을 SQLite 파일에 저장하는 저장소
+
+solved_history 테이블 한 행이 사용자 한 명의 기록
+- handle       : 사용자 핸들 (기본 키)
+- solved_count : 기록을 가져올 때의 풀이 수
+- fetched_at   : 기록을 가져온 시각 (유닉스 시간, 초)
+- problem_ids  : 문제 ID 오름차순 array('i') 바이트
+- levels       : 같은 순서의 난이도 array('b') 바이트
+
+요청 처리 중에는 저장된 기록을 바로 쓰고, 오래되었는지는 is_stale()로 판단해 호출하는 쪽에서 갱신함
+여러 스레드/프로세스가 같은 파일을 함께 쓸 수 있도록 WAL 모드로 연다
+"""
+import sqlite3
+import threading
+import time
+from array import array
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS solved_history (
+    handle       TEXT PRIMARY KEY,
+    solved_count INTEGER NOT NULL,
+    fetched_at   REAL NOT NULL,
+    problem_ids  BLOB NOT NULL,
+    levels       BLOB NOT NULL
+)
+"""
+
+
+class SolvedHistory:
+    """저장된 사용자 한 명의 풀이 기록"""
+
+    __slots__ = ('handle', 'solved_count', 'fetched_at', 'problem_ids', 'levels')
+
+    def __init__(self, handle, solved_count, fetched_at, problem_ids, levels):
+        self.handle = handle
+        self.solved_count = solved_count
+        self.fetched_at = fetched_at
+        self.problem_ids = problem_ids
+        self.levels = levels
+
+    def problems(self):
+        """{문제 ID: 난이도} 딕셔너리"""
+        return dict(zip(self.problem_ids, self.levels))
+
+    def entries(self):
+        """문제 ID 순 [(문제 ID, 난이도), ...]"""
+        return list(zip(self.problem_ids, self.levels))
+
+    def __len__(self):
+        return len(self.problem_ids)
+
+
+class SolvedHistoryStore:
+    def __init__(self, path, stale_after=600, clock=time.time):
+        """
+        path: SQLite 파일 경로 (":memory:"면 메모리에만 보관)
+        stale_after: 가져온 뒤 이 시간(초)이 지난 기록은 갱신 대상
+        """
+        self.path = path
+        self.stale_after = stale_after
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10.0, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(SCHEMA)
+
+    def get(self, handle):
+        """저장된 기록 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT solved_count, fetched_at, problem_ids, levels FROM solved_history WHERE handle = ?",
+                (handle,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        solved_count, fetched_at, problem_blob, level_blob = row
+        problem_ids = array('i')
+        problem_ids.frombytes(problem_blob)
+        levels = array('b')
+        levels.frombytes(level_blob)
+        return SolvedHistory(handle, solved_count, fetched_at, problem_ids, levels)
+
+    def put(self, handle, solved_count, entries, fetched_at=None):
+        """
+        [(문제 ID, 난이도), ...] 기록을 저장하고 SolvedHistory로 반환
+        같은 핸들의 이전 기록은 덮어씀
+        """
+        entries = sorted((int(problem_id), int(level or 0)) for problem_id, level in entries)
+        problem_ids = array('i', (problem_id for problem_id, _ in entries))
+        levels = array('b', (level for _, level in entries))
+        if fetched_at is None:
+            fetched_at = self.clock()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO solved_history (handle, solved_count, fetched_at, problem_ids, levels) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (handle, int(solved_count), fetched_at, problem_ids.tobytes(), levels.tobytes())
+            )
+        return SolvedHistory(handle, int(solved_count), fetched_at, problem_ids, levels)
+
+    def is_stale(self, history, solved_count=None):
+        """가져온 지 오래되었거나 현재 풀이 수(알고 있을 때)와 다르면 True"""
+        if solved_count is not None and solved_count != history.solved_count:
+            return True
+        return self.clock() - history.fetched_at >= self.stale_after
+
+    def delete(self, handle):
+        with self._lock:
+            self._conn.execute("DELETE FROM solved_history WHERE handle = ?", (handle,))
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM solved_history").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,228 @@
+"""
+solved.ac API 공용 HTTP 클라이언트
+
+- requests.Session 하나로 연결을 재사용 (keep-alive 연결 풀)
+- 모든 요청에 (연결, 읽기) 타임아웃 적용
+- 429/5xx 응답과 연결 오류는 지수 백오프로 제한된 횟수만큼 재시도 (Retry-After 헤더가 있으면 따름)
+- 기본 주소는 SOLVEDAC_BASE_URL 환경 변수나 configure(base_url=...)로 바꿀 수 있어
+  테스트/벤치마크에서 로컬 스텁 서버를 가리키게 할 수 있음
+- 여러 요청을 동시에 보낼 때는 RateLimiter로 초당 요청 수를 제한
+
+main.py, 추천 엔진, crawler.py가 모두 get_client()로 같은 클라이언트를 사용함
+"""
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import timed, increment, count_upstream_request
+
+DEFAULT_BASE_URL = "https://solved.ac/api/v3"
+
+# 재시도할 응답 코드
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def _retry_after_seconds(response):
+    """Retry-After 헤더 (초 또는 HTTP 날짜)를 대기 시간(초)으로 변환 (없으면 None)"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateLimiter:
+    """
+    초당 rate번까지만 통과시키는 토큰 버킷 (여러 스레드가 함께 사용)
+    burst만큼은 기다리지 않고 바로 통과하고, 그 뒤로는 1/rate초 간격으로 통과함
+    """
+
+    def __init__(self, rate, burst=1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """토큰 하나를 쓰고 기다려야 할 시간(초) 반환"""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # 토큰을 미리 빼 두어 대기 중인 스레드끼리 순서대로 간격을 두고 통과하게 함
+            self._tokens -= 1.0
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self):
+        """토큰 하나를 쓰고, 모자라면 차례가 올 때까지 대기"""
+        wait = self._reserve()
+        if wait > 0:
+            self.sleep(wait)
+
+    async def acquire_async(self):
+        """acquire()와 같지만 스레드 대신 이벤트 루프에서 대기 (동기 경로와 같은 한도를 나눠 씀)"""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class RetryState:
+    """
+    요청 하나의 재시도 규칙 (동기/비동기 클라이언트가 함께 씀)
+    클라이언트는 요청을 보내고 결과를 next_delay()에 넘긴 뒤, 반환된 시간만큼 기다렸다가 다시 보냄
+    next_delay()가 None을 반환하면 끝이고 결과는 response (실패 시 None)
+    """
+
+    def __init__(self, client, path):
+        self.client = client
+        self.endpoint = path.strip('/')
+        self.attempt = 0
+        self.response = None
+
+    def next_delay(self, response, error, transient):
+        """
+        response: 받은 응답 (요청 자체가 실패했으면 None)
+        error: 요청 중 발생한 예외 (응답을 받았으면 None)
+        transient: 요청 실패가 연결 오류/타임아웃처럼 다시 시도할 만한 것인지
+        반환값: 다음 요청 전에 기다릴 시간(초), 끝났으면 None
+        """
+        delay = None
+        if error is None:
+            error = self.client._status_error(response)
+            if error is None:
+                count_upstream_request(self.endpoint, ok=True)
+                self.response = response
+                return None
+            transient = response.status_code in RETRY_STATUSES
+            if transient:
+                delay = _retry_after_seconds(response)
+
+        if not transient or self.attempt == self.client.max_retries:
+            print(f"API Error: {error}")
+            count_upstream_request(self.endpoint, ok=False)
+            return None
+
+        if delay is None:
+            delay = self.client._backoff(self.attempt)
+        self.attempt += 1
+        increment("upstream_retries_total", endpoint=self.endpoint)
+        return min(delay, self.client.max_backoff)
+
+
+class SolvedAcClient:
+    def __init__(self, base_url=None, timeout=(3.05, 10.0), max_retries=3, backoff_factor=0.5,
+                 max_backoff=30.0, pool_maxsize=20, session=None, sleep=time.sleep):
+        """
+        base_url: API 기본 주소 (없으면 SOLVEDAC_BASE_URL 환경 변수, 그것도 없으면 solved.ac)
+        timeout: requests 타임아웃 (초 하나 또는 (연결, 읽기) 튜플)
+        max_retries: 첫 요청 이후 추가로 시도할 최대 횟수
+        backoff_factor: n번째 재시도 전 대기 시간 = backoff_factor * 2^n (Retry-After가 있으면 그 값)
+        max_backoff: 한 번에 기다리는 최대 시간 (초)
+        """
+        self.base_url = (base_url or os.environ.get("SOLVEDAC_BASE_URL") or DEFAULT_BASE_URL).rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.sleep = sleep
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        session.headers.update({"Content-Type": "application/json", "Accept": "application/json"})
+        self.session = session
+
+    def url(self, path):
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def _backoff(self, attempt):
+        return self.backoff_factor * (2 ** attempt)
+
+    def _status_error(self, response):
+        """오류 응답이면 HTTPError, 아니면 None"""
+        try:
+            response.raise_for_status()
+        except requests.exceptions.HTTPError as e:
+            return e
+        return None
+
+    def _send(self, url, params):
+        """요청 한 번 (응답, 예외, 다시 시도할 만한 예외인지)"""
+        try:
+            with timed('upstream_request'):
+                return self.session.get(url, params=params, timeout=self.timeout), None, False
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            return None, e, True
+        except requests.exceptions.RequestException as e:
+            return None, e, False
+
+    def get(self, path, params=None):
+        """
+        GET 요청을 보내고 성공한 응답을 반환
+        재시도를 모두 써도 실패하거나 4xx 응답이면 None
+        """
+        url = self.url(path)
+        retry = RetryState(self, path)
+        while True:
+            delay = retry.next_delay(*self._send(url, params))
+            if delay is None:
+                return retry.response
+            self.sleep(delay)
+
+    def get_json(self, path, params=None):
+        """get()의 응답 본문을 JSON으로 읽어 반환 (실패 시 None)"""
+        response = self.get(path, params)
+        if response is None:
+            return None
+        try:
+            return response.json()
+        except ValueError as e:
+            print(f"API Error: {e}")
+            return None
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """프로세스 전체에서 함께 쓰는 클라이언트 (처음 호출할 때 생성)"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = SolvedAcClient()
+    return _client
+
+
+def configure(**kwargs):
+    """공용 클라이언트를 새 설정으로 교체 (예: configure(base_url="http://localhost:8000"))"""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = SolvedAcClient(**kwargs)
+    return _client
@@ -0,0 +1,201 @@
+"""
+solved.ac 태그 목록 (영문/한글 짧은 이름) 캐시
+
+- 마지막으로 가져온 목록을 JSON 파일에 저장해 두고 프로세스가 시작되면 파일에서 읽음
+- 요청에는 메모리에 있는 목록과 미리 만들어 둔 응답 본문/ETag를 그대로 돌려줌
+- refresh_interval이 지난 목록은 요청 경로 밖(백그라운드)에서 tag/list 페이지를 동시에 가져와 교체
+- 저장된 목록이 아예 없을 때만 첫 갱신이 끝날 때까지 기다림
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import count_cache_lookup
+from solvedac_client import get_client
+
+
+def _short_name(display_names, index):
+    if len(display_names) <= index or not isinstance(display_names[index], dict):
+        return None
+    short = display_names[index].get("short")
+    return short.replace(' ', '_') if isinstance(short, str) and short else None
+
+
+def _tag_entry(tag):
+    """
+    tag/list 항목을 {"en": 영문 이름, "ko": 한글 이름}으로 변환 (공백은 '_')
+    이름을 읽을 수 없는 항목은 None
+    """
+    display_names = tag.get("displayNames") if isinstance(tag, dict) else None
+    if not isinstance(display_names, list):
+        return None
+    en = _short_name(display_names, 1)
+    ko = _short_name(display_names, 0)
+    if en is None or ko is None:
+        return None
+    return {"en": en, "ko": ko}
+
+
+def _page_items(response):
+    """tag/list 응답 한 페이지의 항목 목록 (응답이 없거나 형식이 다르면 None)"""
+    if not isinstance(response, dict):
+        return None
+    items = response.get("items", [])
+    return list(items) if isinstance(items, list) else None
+
+
+def _valid_items(items):
+    """저장된 목록에서 {"en": str, "ko": str} 형식의 항목만 남김"""
+    return [
+        item for item in items
+        if isinstance(item, dict) and isinstance(item.get("en"), str) and isinstance(item.get("ko"), str)
+    ]
+
+
+class TagCatalogSnapshot:
+    """한 시점의 태그 목록과 그 응답 본문/ETag (만든 뒤에는 바뀌지 않음)"""
+
+    __slots__ = ('items', 'fetched_at', 'body', 'etag')
+
+    def __init__(self, items, fetched_at):
+        self.items = items
+        self.fetched_at = fetched_at
+        self.body = json.dumps({"items": items}, ensure_ascii=False).encode('utf-8')
+        self.etag = hashlib.sha1(self.body).hexdigest()
+
+
+class TagCatalog:
+    def __init__(self, path, refresh_interval=86400, retry_interval=300, page_workers=4, clock=time.time):
+        """
+        path: 태그 목록을 저장할 JSON 파일 경로 (None이면 저장하지 않음)
+        refresh_interval: 이 시간(초)이 지난 목록은 백그라운드에서 갱신
+        retry_interval: 갱신을 시도한 뒤 다시 시도하기까지 기다리는 최소 시간(초)
+        page_workers: tag/list 페이지를 동시에 가져올 요청 수
+        """
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.retry_interval = retry_interval
+        self.clock = clock
+        self._attempted_at = None
+        self._snapshot = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._refreshing = None
+        self._refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tag-refresh")
+        self._page_executor = ThreadPoolExecutor(max_workers=page_workers, thread_name_prefix="tag-page")
+
+    def _load(self):
+        """저장된 태그 목록 파일 읽기 (없거나 깨졌으면 무시)"""
+        if not self.path or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            items = _valid_items(data["items"])
+            if not items and data["items"]:
+                raise ValueError("올바른 태그 항목이 없음")
+            return TagCatalogSnapshot(items, float(data["fetched_at"]))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"⚠️ 태그 목록 파일 읽기 실패: {e}")
+            return None
+
+    def _save(self, snapshot):
+        """임시 파일에 쓴 뒤 교체해 읽는 쪽이 쓰다 만 파일을 보지 않게 함"""
+        if not self.path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tag_list_")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"fetched_at": snapshot.fetched_at, "items": snapshot.items}, f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ 태그 목록 파일 저장 실패: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _fetch_page(self, page):
+        return get_client().get_json("tag/list", {"page": page})
+
+    def fetch(self):
+        """
+        solved.ac에서 태그 목록 전체를 가져옴 (한 페이지라도 실패하면 None)
+        첫 페이지의 전체 개수로 페이지 수를 계산해 나머지 페이지는 동시에 요청
+        """
+        first = self._fetch_page(1)
+        items = _page_items(first)
+        if items is None:
+            return None
+        count = first.get("count")
+        if not isinstance(count, int):
+            count = len(items)
+        if not items:
+            return []
+
+        page_count = -(-count // len(items))
+        pages = list(range(2, page_count + 1))
+        for response in self._page_executor.map(self._fetch_page, pages):
+            page_items = _page_items(response)
+            if page_items is None:
+                return None
+            items.extend(page_items)
+
+        # 형식이 깨진 항목은 건너뛰고, 하나도 읽지 못하면 실패로 보고 이전 목록을 유지
+        entries = [entry for entry in map(_tag_entry, items) if entry is not None]
+        if len(entries) < len(items):
+            print(f"⚠️ 형식이 잘못된 태그 항목 {len(items) - len(entries)}개를 건너뜀")
+        return entries or None
+
+    def refresh(self):
+        """태그 목록을 다시 가져와 교체하고 저장 (실패하면 이전 목록 유지)"""
+        items = self.fetch()
+        if items is None:
+            print("⚠️ 태그 목록 갱신 실패, 이전 목록을 계속 사용")
+            return self._snapshot
+
+        snapshot = TagCatalogSnapshot(items, self.clock())
+        self._snapshot = snapshot
+        self._save(snapshot)
+        print(f"🏷️ 태그 목록 갱신 완료: {len(items)}개")
+        return snapshot
+
+    def refresh_async(self):
+        """백그라운드 갱신 시작 (이미 진행 중이면 그 작업을 반환)"""
+        with self._lock:
+            if self._refreshing is None or self._refreshing.done():
+                self._attempted_at = self.clock()
+                self._refreshing = self._refresh_executor.submit(self.refresh)
+            return self._refreshing
+
+    def _recently_attempted(self):
+        """업스트림 장애 중에 요청마다 갱신을 다시 시도하지 않도록 함"""
+        return self._attempted_at is not None and self.clock() - self._attempted_at < self.retry_interval
+
+    def is_stale(self, snapshot):
+        return self.clock() - snapshot.fetched_at >= self.refresh_interval
+
+    def get(self):
+        """
+        현재 태그 목록 (TagCatalogSnapshot)
+        오래된 목록은 그대로 반환하면서 갱신을 시작하고, 목록이 없을 때만 갱신을 기다림
+        가져오지 못하면 None
+        """
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._snapshot = self._load()
+                    self._loaded = True
+
+        snapshot = self._snapshot
+        count_cache_lookup('tag_catalog', hit=snapshot is not None)
+        if snapshot is None:
+            if self._recently_attempted() and self._refreshing.done():
+                return None
+            return self.refresh_async().result()
+        if self.is_stale(snapshot) and not self._recently_attempted():
+            self.refresh_async()
+        return snapshot
@@ -0,0 +1,55 @@
+"""
+pytest 공용 설정
+
+final_product의 모듈은 서로를 최상위 모듈로 불러오므로 (예: from metrics import timed)
+테스트에서도 final_product 디렉터리를 import 경로에 넣어 둠
+"""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def write_interactions_csv(path, n_users=30, n_problems=60, seed=0):
+    """SOLVER_HANDLE, PROBLEM_ID, SOLVED_LVL 컬럼의 작은 풀이 기록 CSV 생성 (시드가 같으면 같은 파일)"""
+    rng = random.Random(seed)
+    problems = list(range(1000, 1000 + n_problems))
+    lines = ["SOLVER_HANDLE,PROBLEM_ID,SOLVED_LVL"]
+    for i in range(n_users):
+        for problem in rng.sample(problems, rng.randint(5, 20)):
+            lines.append(f"user{i},{problem},{rng.randint(1, 30)}")
+    with open(path, 'w') as f:
+        f.write("\n".join(lines) + "\n")
+    return path
+
+
+def parity_problem_store(n_problems=60):
+    """짝수 문제는 'math', 홀수 문제는 'dp' 태그가 붙은 문제 정보 저장소 (write_interactions_csv의 문제 번호와 같음)"""
+    from problem_store import ProblemStore
+
+    store = ProblemStore()
+    for problem in range(1000, 1000 + n_problems):
+        store.add_problem(problem, ['math'] if problem % 2 == 0 else ['dp'])
+    return store
+
+
+def no_http(problem_id):
+    """태그 색인에 있는 문제만 다루는 테스트에서 solved.ac 요청을 막는 _fetch_problem_tags 대체 함수"""
+    raise AssertionError(f"unexpected solved.ac request for {problem_id}")
+
+
+@pytest.fixture
+def interactions_csv(tmp_path):
+    return write_interactions_csv(str(tmp_path / "problem_for_each_user.csv"))
+
+
+@pytest.fixture
+def main_module(tmp_path, monkeypatch):
+    """웹 서버 모듈 (import할 때 static/ 아래에 풀이 기록 저장소를 열므로 임시 디렉터리에서 불러옴)"""
+    (tmp_path / "static").mkdir()
+    monkeypatch.chdir(tmp_path)
+    import main
+    return main
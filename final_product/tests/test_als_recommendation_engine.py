@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+from als_recommendation_engine import ALSRecommender
+from conftest import no_http, parity_problem_store
+
+
+@pytest.fixture
+def recommender(interactions_csv):
+    recommender = ALSRecommender(interactions_csv, n_factors=8, n_iterations=5)
+    recommender.train_model()
+    return recommender
+
+
+def _least_squares_user_vector(recommender, solved):
+    """문제 벡터를 고정한 암시적 피드백 ALS 사용자 벡터를 정규방정식으로 직접 계산"""
+    Y = recommender.item_factors.astype(np.float64)
+    columns = [recommender.factor_problem_index[problem] for problem in solved]
+    confidence = 1.0 + recommender.alpha * np.array(list(solved.values()), dtype=np.float64)
+    C = np.ones(len(Y))
+    C[columns] = confidence
+    preference = np.zeros(len(Y))
+    preference[columns] = 1.0
+    A = (Y.T * C).dot(Y) + recommender.regularization * np.eye(Y.shape[1])
+    return np.linalg.solve(A, (Y.T * C).dot(preference))
+
+
+def test_fold_in_solves_unseen_user_exactly(recommender):
+    solved = {1000: 5, 1003: 12, 1010: 1}
+    vector = recommender.fold_in({**solved, 999999: 30})
+    assert vector == pytest.approx(_least_squares_user_vector(recommender, solved))
+    assert recommender.fold_in({999999: 30}) is None
+
+
+def test_unseen_user_recommendations_rank_by_folded_vector(recommender):
+    solved = {1000: 5, 1003: 12, 1010: 1}
+    recommendations = recommender.get_recommendations_for_user_history("newcomer", solved, n_recommendations=5)
+    assert "newcomer" not in recommender.user_item_matrix
+
+    scores = recommender.item_factors.dot(recommender.fold_in(solved).astype(np.float32))
+    ranked = [int(recommender.factor_problem_ids[column]) for column in np.argsort(-scores, kind='stable')]
+    assert [rec['problem_id'] for rec in recommendations] == [p for p in ranked if p not in solved][:5]
+
+
+def test_tag_filter_keeps_order_of_tagged_candidates(recommender, monkeypatch):
+    recommender.set_problem_store(parity_problem_store())
+    monkeypatch.setattr(recommender, '_fetch_problem_tags', no_http)
+    solved = {1000: 5, 1003: 12, 1010: 1}
+
+    everything = recommender.get_recommendations_for_user_history("someone", solved, n_recommendations=60)
+    tagged = recommender.get_recommendations_for_user_history_by_tag("someone", solved, 'math', n_recommendations=4)
+    assert tagged == [rec for rec in everything if rec['problem_id'] % 2 == 0][:4]
+
+
+def test_pickle_round_trip_keeps_recommendations(tmp_path, recommender):
+    model_path = str(tmp_path / "als_recommendation_model.pkl")
+    recommender.save_model(model_path)
+
+    loaded = ALSRecommender()
+    loaded.load_model(model_path)
+    solved = dict(recommender.user_item_matrix["user0"].items())
+    assert (loaded.get_recommendations_for_user_history("someone", solved)
+            == recommender.get_recommendations_for_user_history("someone", solved))
+
+
+@pytest.mark.parametrize('batch_elements', [1, 1024, 1 << 22])
+def test_batched_solve_matches_per_row_solve(recommender, batch_elements):
+    indptr, indices, data = recommender._build_interaction_arrays()
+    confidence = 1.0 + recommender.alpha * data
+    fixed = recommender.item_factors.astype(np.float64)
+    gram = fixed.T.dot(fixed)
+
+    batched = recommender._solve_factors(fixed, indptr, indices, confidence, batch_elements)
+    for row in range(len(indptr) - 1):
+        start, end = indptr[row], indptr[row + 1]
+        expected = recommender._solve_one(fixed, gram, indices[start:end], confidence[start:end])
+        assert batched[row] == pytest.approx(expected)
+
+
+def test_batched_solve_leaves_empty_rows_zero(recommender):
+    fixed = recommender.item_factors.astype(np.float64)
+    indptr = np.array([0, 0, 2, 2], dtype=np.int64)
+    result = recommender._solve_factors(fixed, indptr, np.array([0, 1]), np.array([3.0, 5.0]))
+    assert not result[0].any() and not result[2].any()
+    assert result[1].any()
+
+
+def test_batch_size_is_bounded_by_normal_equation_size(monkeypatch, recommender):
+    # 기록이 하나뿐인 행이 많아도 (행 수, k, k) 배열이 상한을 넘지 않아야 함
+    n_rows, n_factors = 5000, recommender.n_factors
+    fixed = recommender.item_factors.astype(np.float64)
+    indptr = np.arange(n_rows + 1, dtype=np.int64)
+    indices = np.arange(n_rows) % len(fixed)
+    confidence = np.full(n_rows, 2.0)
+
+    solve = np.linalg.solve
+    batch_sizes = []
+
+    def recording_solve(A, b):
+        batch_sizes.append(A.shape[0])
+        return solve(A, b)
+
+    monkeypatch.setattr(np.linalg, 'solve', recording_solve)
+    batch_elements = 64 * n_factors * n_factors
+    result = recommender._solve_factors(fixed, indptr, indices, confidence, batch_elements)
+
+    assert sum(batch_sizes) == n_rows
+    assert max(batch_sizes) == 64
+    monkeypatch.undo()
+    gram = fixed.T.dot(fixed)
+    assert result[0] == pytest.approx(recommender._solve_one(fixed, gram, indices[:1], confidence[:1]))
@@ -0,0 +1,63 @@
+import asyncio
+import threading
+
+import pytest
+
+from problem_store import ProblemStore
+from solved_history_store import SolvedHistory
+
+
+class RecordingHistoryStore:
+    """풀이 기록 저장소 호출이 어느 스레드에서 실행됐는지 기록"""
+
+    def __init__(self, history):
+        self.history = history
+        self.threads = []
+
+    def get(self, handle):
+        self.threads.append(threading.current_thread())
+        return self.history
+
+    def is_stale(self, history, solved_count=None):
+        return False
+
+
+class RecordingProblemStore(ProblemStore):
+    def __init__(self):
+        super().__init__()
+        self.threads = []
+
+    def get_problem(self, problem_id):
+        self.threads.append(threading.current_thread())
+        return super().get_problem(problem_id)
+
+
+@pytest.fixture
+def main(main_module, monkeypatch):
+    history = SolvedHistory("alice", 2, 0.0, [1000, 1001], [5, 7])
+    monkeypatch.setattr(main_module, 'solvedHistoryStore', RecordingHistoryStore(history))
+    store = RecordingProblemStore()
+    store.add_problem(1000, ['math'], title="A", level=5)
+    monkeypatch.setattr(main_module, 'problem_store', store)
+    return main_module
+
+
+def _run_on_loop(coro):
+    """코루틴을 새 이벤트 루프에서 실행하고 (결과, 루프 스레드) 반환"""
+    async def run():
+        return await coro, threading.current_thread()
+    return asyncio.run(run())
+
+
+def test_stored_history_is_read_off_the_event_loop(main):
+    history, loop_thread = _run_on_loop(main.getUserHistoryAsync("alice", 2))
+    assert history.problems() == {1000: 5, 1001: 7}
+    assert main.solvedHistoryStore.threads
+    assert loop_thread not in main.solvedHistoryStore.threads
+
+
+def test_problem_store_is_read_off_the_event_loop(main):
+    problems, loop_thread = _run_on_loop(main.findProblemsAsync([1000]))
+    assert problems == [{"problemId": 1000, "titleKo": "A", "level": 5}]
+    assert main.problem_store.threads
+    assert loop_thread not in main.problem_store.threads
@@ -0,0 +1,116 @@
+import os
+import pickle
+
+import pytest
+
+from delta_log import DeltaLog
+from simple_recommendation_engine import SimpleCollaborativeRecommender
+
+
+@pytest.fixture
+def recommender(interactions_csv):
+    recommender = SimpleCollaborativeRecommender(interactions_csv)
+    recommender.train_model()
+    return recommender
+
+
+def test_upsert_matches_full_retrain(interactions_csv, recommender):
+    recommender.upsert_user("newcomer", {1000: 5, 1001: 7, 1002: 3})
+    recommender.upsert_user("user0", {1003: 4, 1004: 9})
+    recommender.remove_user("user1")
+
+    retrained = SimpleCollaborativeRecommender()
+    retrained.user_item_matrix = recommender.user_item_matrix
+    retrained.user_norms = recommender.user_norms
+    retrained.problem_solvers = recommender.problem_solvers
+    retrained.train_model()
+
+    assert "user1" not in recommender.user_item_matrix
+    for user in ("newcomer", "user0"):
+        expected = dict(retrained.neighbors.neighbors(user))
+        actual = dict(recommender.neighbors.neighbors(user))
+        assert actual.keys() == expected.keys()
+        for other, score in expected.items():
+            assert actual[other] == pytest.approx(score)
+
+
+def test_upsert_same_history_is_noop(recommender):
+    solved = dict(recommender.user_item_matrix["user0"].items())
+    assert recommender.upsert_user("user0", solved) is False
+    assert recommender.pending_updates == []
+    assert recommender.updates_since_compact == 0
+
+
+def test_save_delta_appends_only_new_records(tmp_path, recommender):
+    delta_path = str(tmp_path / "delta.pkl")
+    recommender.upsert_user("a", {1000: 1})
+    assert recommender.save_delta(delta_path) == 1
+    size = os.path.getsize(delta_path)
+
+    # 이미 쓴 기록은 메모리에서도 비워지고 다시 쓰이지 않음
+    assert recommender.pending_updates == []
+    assert recommender.save_delta(delta_path) == 0
+    assert os.path.getsize(delta_path) == size
+
+    recommender.upsert_user("b", {1001: 2})
+    recommender.remove_user("a")
+    assert recommender.save_delta(delta_path) == 2
+    assert recommender._read_delta(delta_path) == [
+        ('upsert', 'a', {1000: 1}),
+        ('upsert', 'b', {1001: 2}),
+        ('remove', 'a', None),
+    ]
+    assert recommender.updates_since_compact == 3
+
+
+def test_load_delta_replays_updates(tmp_path, interactions_csv, recommender):
+    delta_path = str(tmp_path / "delta.pkl")
+    recommender.upsert_user("newcomer", {1000: 5, 1001: 7})
+    recommender.remove_user("user2")
+    recommender.save_delta(delta_path)
+
+    restored = SimpleCollaborativeRecommender(interactions_csv)
+    restored.train_model()
+    assert restored.load_delta(delta_path) == 2
+    assert dict(restored.user_item_matrix["newcomer"].items()) == {1000: 5, 1001: 7}
+    assert "user2" not in restored.user_item_matrix
+
+
+def test_load_delta_reads_legacy_format_and_skips_torn_tail(tmp_path, recommender):
+    delta_path = tmp_path / "delta.pkl"
+    payload = pickle.dumps({'updates': [('upsert', 'a', {1000: 1})]})
+    payload += pickle.dumps(('upsert', 'b', {1001: 2}))[:-3]
+    delta_path.write_bytes(payload)
+    assert recommender._read_delta(str(delta_path)) == [('upsert', 'a', {1000: 1})]
+
+
+def test_compact_retrains_and_resets_counters(recommender):
+    recommender.upsert_user("newcomer", {1000: 5})
+    recommender.compact()
+    assert recommender.pending_updates == []
+    assert recommender.updates_since_compact == 0
+    assert "newcomer" in recommender.neighbors.user_index
+
+
+def test_delta_log_keeps_one_file_per_process(tmp_path, recommender):
+    log = DeltaLog(str(tmp_path / "delta"))
+    recommender.upsert_user("a", {1000: 1})
+    log.append(recommender.take_pending_updates())
+    assert not os.path.exists(log.active_path())
+    assert log.flush(recommender) == 1
+    assert os.path.basename(log.active_path()) == f"{os.getpid()}.pkl"
+
+    # 살아 있는 프로세스의 파일은 정리 대상이 아니고, 닫은 뒤에만 정리함
+    assert log.sealed_files() == []
+    log.seal()
+    sealed = log.sealed_files()
+    assert len(sealed) == 1 and not os.path.exists(log.active_path())
+    assert recommender._read_delta(sealed[0]) == [('upsert', 'a', {1000: 1})]
+
+    # 종료된 프로세스가 남긴 파일도 정리 대상
+    dead_path = os.path.join(log.directory, "999999999.pkl")
+    recommender.save_delta(dead_path, [('remove', 'a', None)])
+    assert dead_path in log.sealed_files()
+
+    log.remove(log.sealed_files())
+    assert log.sealed_files() == []
@@ -0,0 +1,42 @@
+import numpy as np
+
+from interaction_store import InteractionStore
+
+
+def _as_dict(store):
+    return {user: dict(store[user].items()) for user in store}
+
+
+def test_add_arrays_keeps_first_record_within_and_across_chunks():
+    store = InteractionStore()
+    store.add_arrays(['a', 'b'], np.array([0, 0, 1, 0]), np.array([1002, 1000, 1000, 1002]), np.array([1, 2, 3, 9]))
+    store.add_arrays(['b', 'a'], np.array([1, 0, 0]), np.array([1000, 1000, 1001]), np.array([7, 4, 5]))
+
+    assert list(store) == ['a', 'b']
+    assert _as_dict(store) == {'a': {1000: 2, 1002: 1}, 'b': {1000: 3, 1001: 5}}
+    assert store.n_interactions() == 4
+
+
+def test_sort_problem_columns_orders_rows_by_problem_id():
+    store = InteractionStore()
+    store.add_arrays(['a'], np.array([0, 0]), np.array([1005, 1003]), np.array([1, 2]))
+    store.add_arrays(['b'], np.array([0, 0]), np.array([1001, 1004]), np.array([3, 4]))
+    before = _as_dict(store)
+
+    store.sort_problem_columns()
+    assert store.problem_ids == [1001, 1003, 1004, 1005]
+    assert [problem for problem, _ in store['a'].items()] == [1003, 1005]
+    assert _as_dict(store) == before
+    assert store['b'][1004] == 4
+
+
+def test_from_arrays_matches_from_dict():
+    handles = ['a', 'b', 'c']
+    user_codes = np.array([2, 0, 1, 0, 2])
+    problem_ids = np.array([1001, 1003, 1000, 1001, 1003])
+    levels = np.array([5, 1, 2, 3, 4])
+
+    store = InteractionStore.from_arrays(handles, user_codes, problem_ids, levels)
+    expected = InteractionStore.from_dict({'c': {1001: 5, 1003: 4}, 'a': {1003: 1, 1001: 3}, 'b': {1000: 2}})
+    assert _as_dict(store) == _as_dict(expected)
+    assert store.norms()['c'] == np.sqrt(5 ** 2 + 4 ** 2)
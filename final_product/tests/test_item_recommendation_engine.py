@@ -0,0 +1,75 @@
+import math
+
+import pytest
+
+from conftest import no_http, parity_problem_store
+from item_recommendation_engine import ItemCollaborativeRecommender
+
+
+@pytest.fixture
+def recommender(interactions_csv):
+    # 문제 60개뿐이므로 top-K를 크게 잡아 유사도가 0보다 큰 이웃을 모두 저장
+    recommender = ItemCollaborativeRecommender(interactions_csv, n_item_neighbors=100)
+    recommender.train_model()
+    return recommender
+
+
+def _item_cosine(recommender, problem, other):
+    """두 문제를 푼 사용자들의 난이도 벡터 간 코사인 유사도"""
+    solvers = dict(recommender.problem_solvers[problem])
+    other_solvers = dict(recommender.problem_solvers[other])
+    dot = sum(level * other_solvers[user] for user, level in solvers.items() if user in other_solvers)
+    norm = math.sqrt(sum(level ** 2 for level in solvers.values()))
+    other_norm = math.sqrt(sum(level ** 2 for level in other_solvers.values()))
+    return dot / (norm * other_norm)
+
+
+@pytest.mark.parametrize("problem", [1000, 1017, 1042])
+def test_item_neighbors_match_brute_force_cosine(recommender, problem):
+    expected = {}
+    for other in recommender.problem_solvers:
+        if other != problem:
+            score = _item_cosine(recommender, problem, other)
+            if score > 0:
+                expected[other] = score
+
+    neighbors = recommender.item_neighbors.neighbors(problem)
+    assert dict(neighbors) == pytest.approx(expected)
+    scores = [score for _, score in neighbors]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_history_recommendations_sum_neighbor_scores(recommender):
+    solved = {1000: 5, 1001: 7, 1002: 3}
+    recommendations = recommender.get_recommendations_for_user_history("someone", solved, n_recommendations=5)
+    assert len(recommendations) == 5
+    for rec in recommendations:
+        problem = rec['problem_id']
+        assert problem not in solved
+        expected = sum(dict(recommender.item_neighbors.neighbors(solved_problem)).get(problem, 0.0) * level
+                       for solved_problem, level in solved.items())
+        assert rec['estimated_rating'] == pytest.approx(expected)
+    ratings = [rec['estimated_rating'] for rec in recommendations]
+    assert ratings == sorted(ratings, reverse=True)
+
+
+def test_tag_filter_keeps_order_of_tagged_candidates(recommender, monkeypatch):
+    recommender.set_problem_store(parity_problem_store())
+    monkeypatch.setattr(recommender, '_fetch_problem_tags', no_http)
+    solved = {1000: 5, 1001: 7, 1002: 3}
+
+    everything = recommender.get_recommendations_for_user_history("someone", solved, n_recommendations=60)
+    tagged = recommender.get_recommendations_for_user_history_by_tag("someone", solved, 'dp', n_recommendations=4)
+    assert tagged == [rec for rec in everything if rec['problem_id'] % 2 == 1][:4]
+
+
+def test_pickle_round_trip_keeps_recommendations(tmp_path, recommender):
+    model_path = str(tmp_path / "item_recommendation_model.pkl")
+    recommender.save_model(model_path)
+
+    loaded = ItemCollaborativeRecommender()
+    loaded.load_model(model_path)
+    solved = dict(recommender.user_item_matrix["user0"].items())
+    assert (loaded.get_recommendations_for_user_history("someone", solved)
+            == recommender.get_recommendations_for_user_history("someone", solved))
+    assert loaded.get_user_recommendations("user0") == recommender.get_user_recommendations("user0")
@@ -0,0 +1,134 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+import model_store
+from delta_log import DeltaLog
+from rwlock import ReadWriteLock
+from simple_recommendation_engine import SimpleCollaborativeRecommender
+
+
+class CountingLock(ReadWriteLock):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def acquire_write(self):
+        self.writes += 1
+        super().acquire_write()
+
+
+@pytest.fixture
+def app_main(tmp_path, monkeypatch, interactions_csv, main_module):
+    main = main_module
+    model = SimpleCollaborativeRecommender(interactions_csv)
+    model.train_model()
+    monkeypatch.setattr(main, 'recommender', model)
+    monkeypatch.setattr(main, 'recommenderLock', CountingLock())
+    monkeypatch.setattr(main, 'deltaLog', DeltaLog(str(tmp_path / "delta")))
+    monkeypatch.setattr(main, 'COMPACT_AFTER_UPDATES', 10 ** 9)
+    return main
+
+
+def test_unchanged_history_takes_only_the_read_lock(app_main):
+    solved = dict(app_main.recommender.user_item_matrix["user0"].items())
+    for _ in range(5):
+        app_main.updateRecommenderUser("user0", solved)
+    assert app_main.recommenderLock.writes == 0
+    assert not os.path.exists(app_main.deltaLog.active_path())
+
+
+def test_changed_history_is_applied_and_logged(app_main):
+    app_main.updateRecommenderUser("newcomer", {1000: 5, 1001: 7})
+    app_main.updateRecommenderUser("newcomer", {1000: 5, 1001: 7})
+    app_main.updateRecommenderUser("newcomer", {1000: 5, 1001: 7, 1002: 1})
+
+    assert app_main.recommenderLock.writes == 2
+    assert dict(app_main.recommender.user_item_matrix["newcomer"].items()) == {1000: 5, 1001: 7, 1002: 1}
+    assert app_main.recommender.pending_updates == []
+    assert app_main.recommender._read_delta(app_main.deltaLog.active_path()) == [
+        ('upsert', 'newcomer', {1000: 5, 1001: 7}),
+        ('upsert', 'newcomer', {1000: 5, 1001: 7, 1002: 1}),
+    ]
+
+
+def _stale_cache(app_main, monkeypatch, key):
+    # 재검증이 필요하고 저장된 풀이 수가 현재와 다른 항목 하나
+    cache = app_main.RecommendationCache(revalidate_after=0)
+    cache.put(key, (1000,), solved_count=1)
+    monkeypatch.setattr(app_main, 'recommendation_cache', cache)
+
+
+@pytest.mark.parametrize("tag_name", [None, "math"])
+def test_revalidation_miss_fetches_solved_count_once(app_main, monkeypatch, tag_name):
+    _stale_cache(app_main, monkeypatch, ("user0", tag_name, app_main.recommender_version))
+    calls = []
+    monkeypatch.setattr(app_main, 'getUserSolvedCount', lambda handle: calls.append(handle) or 2)
+    monkeypatch.setattr(app_main, 'getUserHistory', lambda handle, solved_count=None: None)
+
+    if tag_name is None:
+        app_main.getRecommendation("user0")
+    else:
+        app_main.getRecommendationByTag("user0", tag_name)
+    assert calls == ["user0"]
+
+
+def test_async_revalidation_miss_fetches_solved_count_once(app_main, monkeypatch):
+    _stale_cache(app_main, monkeypatch, ("user0", None, app_main.recommender_version))
+    calls = []
+
+    async def solved_count(handle):
+        calls.append(handle)
+        return 2
+
+    async def history(handle, solved_count=None):
+        return None
+
+    monkeypatch.setattr(app_main, 'getUserSolvedCountAsync', solved_count)
+    monkeypatch.setattr(app_main, 'getUserHistoryAsync', history)
+    asyncio.run(app_main.getRecommendationAsync("user0"))
+    assert calls == ["user0"]
+
+
+def test_compaction_while_serving_swaps_model_and_keeps_old_mapping_readable(app_main, monkeypatch):
+    # 서버 시작: 바이너리 모델을 mmap으로 로드
+    monkeypatch.setattr(app_main, 'recommendation_cache', app_main.RecommendationCache())
+    model_dir = app_main.RECOMMENDER_ENGINES['user'][1]
+    app_main.recommender.save_model_binary(model_dir)
+    served = app_main.initialize_recommender('user')
+    assert isinstance(served.user_item_matrix, model_store.UserItemView)
+
+    app_main.updateRecommenderUser("newcomer", {1000: 5, 1001: 7})
+    solved = dict(served.user_item_matrix["user0"].items())
+    expected = served.get_recommendations_for_user_history("someone", solved)
+
+    stop = threading.Event()
+    errors = []
+
+    def serve():
+        try:
+            while not stop.is_set():
+                app_main.computeRecommendation("someone", solved)
+        except Exception as e:
+            errors.append(e)
+
+    readers = [threading.Thread(target=serve) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    try:
+        # 두 번 정리하면 처음 로드한 버전 디렉터리는 삭제됨
+        for _ in range(2):
+            assert app_main.initialize_recommender('user') is not None
+    finally:
+        stop.set()
+        for thread in readers:
+            thread.join()
+
+    assert errors == []
+    assert app_main.recommender is not served
+    assert dict(app_main.recommender.user_item_matrix["newcomer"].items()) == {1000: 5, 1001: 7}
+    assert app_main.deltaLog.sealed_files() == []
+    # 교체 전 모델을 아직 쓰고 있는 요청도 같은 결과를 냄
+    assert served.get_recommendations_for_user_history("someone", solved) == expected
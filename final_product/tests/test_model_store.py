@@ -0,0 +1,184 @@
+import json
+import os
+
+import pytest
+
+import model_store
+from conftest import write_interactions_csv
+from simple_recommendation_engine import SimpleCollaborativeRecommender
+
+
+@pytest.fixture
+def recommender(interactions_csv):
+    recommender = SimpleCollaborativeRecommender(interactions_csv)
+    recommender.train_model()
+    return recommender
+
+
+def _recommend(recommender, solved):
+    return recommender.get_recommendations_for_user_history("someone", solved, n_recommendations=10)
+
+
+def _versions(model_dir):
+    return sorted(name for name in os.listdir(model_dir) if name != model_store.CURRENT_FILE)
+
+
+def test_save_switches_current_version_and_keeps_previous(tmp_path, recommender):
+    model_dir = str(tmp_path / "model")
+    for _ in range(3):
+        recommender.save_model_binary(model_dir)
+        assert not [name for name in os.listdir(model_dir) if name.startswith('.')]
+
+    # 현재 버전과 바로 이전 버전만 남음
+    versions = _versions(model_dir)
+    assert len(versions) == 2
+    with open(os.path.join(model_dir, model_store.CURRENT_FILE)) as f:
+        assert f.read() == versions[-1]
+    assert model_store.current_model_path(model_dir) == os.path.join(model_dir, versions[-1])
+
+
+def test_loaded_model_survives_later_saves(tmp_path, recommender):
+    model_dir = str(tmp_path / "model")
+    recommender.save_model_binary(model_dir)
+    loaded = SimpleCollaborativeRecommender()
+    loaded.load_model_binary(model_dir)
+    solved = dict(recommender.user_item_matrix["user0"].items())
+    expected = _recommend(loaded, solved)
+
+    # 열어 둔 버전이 지워질 때까지 저장해도 mmap으로 연 배열은 그대로 읽힘
+    recommender.upsert_user("user0", {1000: 1})
+    for _ in range(3):
+        recommender.save_model_binary(model_dir)
+    assert _recommend(loaded, solved) == expected
+
+    reloaded = SimpleCollaborativeRecommender()
+    reloaded.load_model_binary(model_dir)
+    assert dict(reloaded.user_item_matrix["user0"].items()) == {1000: 1}
+
+
+def test_interrupted_save_keeps_current_model(tmp_path, recommender, monkeypatch):
+    model_dir = str(tmp_path / "model")
+    recommender.save_model_binary(model_dir)
+    current = model_store.current_model_path(model_dir)
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(model_store.np, 'save', fail)
+    with pytest.raises(OSError):
+        recommender.save_model_binary(model_dir)
+    monkeypatch.undo()
+
+    assert model_store.current_model_path(model_dir) == current
+    assert sorted(os.listdir(model_dir)) == sorted([os.path.basename(current), model_store.CURRENT_FILE])
+    loaded = SimpleCollaborativeRecommender()
+    loaded.load_model_binary(model_dir)
+    assert loaded.trained
+
+
+def test_missing_pointer_falls_back_to_latest_version(tmp_path, recommender):
+    model_dir = str(tmp_path / "model")
+    recommender.save_model_binary(model_dir)
+    os.remove(os.path.join(model_dir, model_store.CURRENT_FILE))
+    assert SimpleCollaborativeRecommender.has_model_binary(model_dir)
+    assert not SimpleCollaborativeRecommender.has_model_binary(str(tmp_path / "missing"))
+
+
+def test_legacy_layout_loads_and_is_replaced_on_save(tmp_path, recommender):
+    model_dir = str(tmp_path / "model")
+    recommender.save_model_binary(model_dir)
+    # 이전 형식: 버전 디렉터리 없이 파일을 model_dir에 바로 저장
+    legacy_dir = str(tmp_path / "legacy")
+    os.replace(model_store.current_model_path(model_dir), legacy_dir)
+
+    loaded = SimpleCollaborativeRecommender()
+    loaded.load_model_binary(legacy_dir)
+    solved = dict(recommender.user_item_matrix["user1"].items())
+    assert _recommend(loaded, solved) == _recommend(recommender, solved)
+
+    recommender.save_model_binary(legacy_dir)
+    assert not os.path.exists(os.path.join(legacy_dir, 'meta.json'))
+    assert len(_versions(legacy_dir)) == 1
+
+
+@pytest.fixture
+def large_recommender(tmp_path):
+    path = write_interactions_csv(str(tmp_path / "large.csv"), n_users=200, n_problems=150, seed=3)
+    recommender = SimpleCollaborativeRecommender(path)
+    recommender.train_model()
+    return recommender
+
+
+def _load(model_dir):
+    loaded = SimpleCollaborativeRecommender()
+    loaded.load_model_binary(model_dir)
+    return loaded
+
+
+def test_binary_round_trip_matches_pickle(tmp_path, large_recommender):
+    model_dir = str(tmp_path / "model")
+    pickle_path = str(tmp_path / "model.pkl")
+    large_recommender.save_model_binary(model_dir)
+    large_recommender.save_model(pickle_path)
+    binary = _load(model_dir)
+    pickled = SimpleCollaborativeRecommender()
+    pickled.load_model(pickle_path)
+
+    for i in range(0, 200, 7):
+        user = f"user{i}"
+        solved = dict(large_recommender.user_item_matrix[user].items())
+        assert dict(binary.user_item_matrix[user].items()) == solved
+        assert binary.user_norms[user] == pytest.approx(large_recommender.user_norms[user])
+        assert _recommend(binary, solved) == _recommend(pickled, solved)
+        assert (binary.get_user_recommendations(user, n_recommendations=10)
+                == pickled.get_user_recommendations(user, n_recommendations=10))
+    assert binary._get_popular_recommendations(set(), 10) == pickled._get_popular_recommendations(set(), 10)
+
+
+def test_rejects_unknown_format_version(tmp_path, recommender):
+    model_dir = str(tmp_path / "model")
+    recommender.save_model_binary(model_dir)
+    meta_path = os.path.join(model_store.current_model_path(model_dir), 'meta.json')
+    with open(meta_path) as f:
+        meta = json.load(f)
+    meta['format_version'] = model_store.FORMAT_VERSION + 1
+    with open(meta_path, 'w') as f:
+        json.dump(meta, f)
+
+    with pytest.raises(ValueError):
+        _load(model_dir)
+
+
+def test_rejects_meta_that_does_not_match_arrays(tmp_path, recommender):
+    model_dir = str(tmp_path / "model")
+    recommender.save_model_binary(model_dir)
+    meta_path = os.path.join(model_store.current_model_path(model_dir), 'meta.json')
+    with open(meta_path) as f:
+        meta = json.load(f)
+    meta['n_users'] += 1
+    with open(meta_path, 'w') as f:
+        json.dump(meta, f)
+
+    with pytest.raises(ValueError, match="n_users"):
+        _load(model_dir)
+
+
+def test_overlay_updates_match_in_memory_model(tmp_path, large_recommender):
+    model_dir = str(tmp_path / "model")
+    large_recommender.save_model_binary(model_dir)
+    binary = _load(model_dir)
+
+    for model in (large_recommender, binary):
+        model.upsert_user("newcomer", {1000: 5, 1001: 7, 1002: 3})
+        model.upsert_user("user3", {1004: 9, 1005: 2})
+        model.remove_user("user5")
+
+    assert "user5" not in binary.user_item_matrix and "user5" not in binary.user_norms
+    assert dict(binary.user_item_matrix["user3"].items()) == {1004: 9, 1005: 2}
+    assert len(binary.user_item_matrix) == len(large_recommender.user_item_matrix)
+    assert set(binary.user_item_matrix) == set(large_recommender.user_item_matrix)
+    assert sorted(binary.problem_solvers[1004]) == sorted(large_recommender.problem_solvers[1004])
+    for user in ("newcomer", "user3", "user0"):
+        assert dict(binary.neighbors.neighbors(user)) == pytest.approx(dict(large_recommender.neighbors.neighbors(user)))
+        assert (binary.get_user_recommendations(user, n_recommendations=10)
+                == large_recommender.get_user_recommendations(user, n_recommendations=10))
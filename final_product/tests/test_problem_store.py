@@ -0,0 +1,61 @@
+import sys
+import threading
+
+import pytest
+
+from problem_store import ProblemStore
+
+
+@pytest.fixture
+def fast_switching():
+    # 스레드 전환을 자주 일으켜 잠금이 없을 때의 경쟁 상태가 드러나게 함
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_add_problem_retags_problem():
+    store = ProblemStore()
+    store.add_problem(1000, ['math'], title="A", level=3)
+    store.add_problem(1000, ['dp'])
+
+    assert store.tags_of(1000) == {'dp'}
+    assert store.problems_with_tag('math') == set()
+    assert store.has_tag(1000, 'dp')
+    assert store.get_problem(1000) == {"problemId": 1000, "titleKo": "A", "level": 3}
+    assert store.tags_of(1001) is None
+
+
+def test_readers_can_iterate_while_writers_add(fast_switching):
+    store = ProblemStore()
+    for problem_id in range(200):
+        store.add_problem(problem_id, ['math'])
+    stop = threading.Event()
+    errors = []
+
+    def write():
+        problem_id = 200
+        while not stop.is_set():
+            store.add_problem(problem_id, ['math'])
+            store.add_problem(problem_id % 200, ['dp'] if problem_id % 2 else ['math'])
+            problem_id += 1
+
+    def read():
+        try:
+            for _ in range(100):
+                # 반환된 집합은 복사본이므로 순회 중에 색인이 바뀌어도 오류가 나지 않음
+                sum(1 for _ in store.problems_with_tag('math'))
+        except Exception as e:
+            errors.append(e)
+
+    writers = [threading.Thread(target=write) for _ in range(2)]
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for thread in writers + readers:
+        thread.start()
+    for thread in readers:
+        thread.join()
+    stop.set()
+    for thread in writers:
+        thread.join()
+    assert errors == []
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from recommendation_cache import RecommendationCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return RecommendationCache(max_entries=3, ttl_seconds=100, revalidate_after=10, clock=clock)
+
+
+def test_evicts_least_recently_used(cache):
+    for handle in ("a", "b", "c"):
+        cache.put((handle, None, 1), handle, solved_count=1)
+    assert cache.get(("a", None, 1)) == "a"
+
+    cache.put(("d", None, 1), "d", solved_count=1)
+    assert len(cache) == 3
+    assert cache.get(("b", None, 1)) is None
+    assert cache.get(("a", None, 1)) == "a"
+
+
+def test_entries_expire_after_ttl(cache, clock):
+    cache.put(("a", None, 1), "a", solved_count=1)
+    clock.now = 99
+    assert cache.get(("a", None, 1), lambda: 1) == "a"
+    clock.now = 100
+    assert cache.get(("a", None, 1), lambda: 1) is None
+    assert len(cache) == 0
+
+
+def test_revalidates_only_after_interval(cache, clock):
+    calls = []
+
+    def loader():
+        calls.append(clock.now)
+        return 5
+
+    cache.put(("a", None, 1), "a", solved_count=5)
+    clock.now = 9
+    assert cache.get(("a", None, 1), loader) == "a"
+    assert calls == []
+
+    clock.now = 10
+    assert cache.get(("a", None, 1), loader) == "a"
+    clock.now = 19
+    assert cache.get(("a", None, 1), loader) == "a"
+    assert calls == [10]
+
+
+@pytest.mark.parametrize("current", [6, None])
+def test_changed_or_unknown_solved_count_drops_entry(cache, clock, current):
+    cache.put(("a", None, 1), "a", solved_count=5)
+    clock.now = 10
+    assert cache.get(("a", None, 1), lambda: current) is None
+    assert len(cache) == 0
+
+
+def test_invalidate_user_drops_every_tag_and_version(cache):
+    cache.put(("a", None, 1), "x", solved_count=1)
+    cache.put(("a", "dp", 2), "y", solved_count=1)
+    cache.put(("b", None, 1), "z", solved_count=1)
+
+    cache.invalidate_user("a")
+    assert len(cache) == 1
+    assert cache.get(("b", None, 1)) == "z"
+
+
+def test_get_async_awaits_loader(cache, clock):
+    async def loader():
+        return 5
+
+    async def stale_loader():
+        return 6
+
+    cache.put(("a", None, 1), "a", solved_count=5)
+    clock.now = 10
+    assert asyncio.run(cache.get_async(("a", None, 1), loader)) == "a"
+    clock.now = 20
+    assert asyncio.run(cache.get_async(("a", None, 1), stale_loader)) is None
@@ -0,0 +1,90 @@
+import threading
+import time
+
+from rwlock import ReadWriteLock
+
+
+def _start(target):
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_readers_share_the_lock():
+    lock = ReadWriteLock()
+    inside = threading.Barrier(3, timeout=5)
+
+    def reader():
+        with lock.read_locked():
+            # 세 스레드가 모두 읽기 잠금 안에 들어와야 통과
+            inside.wait()
+
+    threads = [_start(reader) for _ in range(3)]
+    for thread in threads:
+        thread.join(5)
+    assert not inside.broken
+
+
+def test_writer_excludes_readers_and_writers():
+    lock = ReadWriteLock()
+    state = {'readers': 0, 'writers': 0, 'violations': 0}
+    state_lock = threading.Lock()
+
+    def enter(kind):
+        with state_lock:
+            state[kind] += 1
+            if state['writers'] > 1 or (state['writers'] and state['readers']):
+                state['violations'] += 1
+
+    def leave(kind):
+        with state_lock:
+            state[kind] -= 1
+
+    def reader():
+        for _ in range(200):
+            with lock.read_locked():
+                enter('readers')
+                leave('readers')
+
+    def writer():
+        for _ in range(200):
+            with lock.write_locked():
+                enter('writers')
+                leave('writers')
+
+    threads = [_start(reader) for _ in range(4)] + [_start(writer) for _ in range(2)]
+    for thread in threads:
+        thread.join(10)
+    assert state['violations'] == 0
+
+
+def test_waiting_writer_blocks_new_readers():
+    lock = ReadWriteLock()
+    events = []
+    lock.acquire_read()
+
+    writer = _start(lambda: (lock.acquire_write(), events.append('writer'), lock.release_write()))
+    while not lock._waiting_writers:
+        time.sleep(0.001)
+
+    # 쓰기를 기다리는 스레드가 있으면 새 읽기는 쓰기 뒤로 밀림
+    reader = _start(lambda: (lock.acquire_read(), events.append('reader'), lock.release_read()))
+    time.sleep(0.05)
+    assert events == []
+
+    lock.release_read()
+    writer.join(5)
+    reader.join(5)
+    assert events == ['writer', 'reader']
+
+
+def test_lock_released_after_exception():
+    lock = ReadWriteLock()
+    try:
+        with lock.write_locked():
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    with lock.read_locked():
+        pass
+    assert not lock._writer and lock._readers == 0
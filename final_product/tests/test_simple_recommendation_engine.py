@@ -0,0 +1,140 @@
+import math
+
+import pytest
+
+import simple_recommendation_engine
+from conftest import no_http, parity_problem_store
+from metrics import METRICS
+from simple_recommendation_engine import SimpleCollaborativeRecommender
+
+
+def _brute_force_similarities(recommender, user):
+    """모든 사용자 쌍을 직접 비교한 코사인 유사도 (0보다 큰 것만)"""
+    user_problems = recommender.user_item_matrix[user]
+    similarities = {}
+    for other, other_problems in recommender.user_item_matrix.items():
+        if other == user:
+            continue
+        score = recommender._cosine_similarity(user_problems, other_problems)
+        if score > 0:
+            similarities[other] = score
+    return similarities
+
+
+def _trained(csv_path, **kwargs):
+    recommender = SimpleCollaborativeRecommender(csv_path, n_neighbors=kwargs.pop('n_neighbors', 50))
+    recommender.train_model(**kwargs)
+    return recommender
+
+
+def test_load_data_keeps_first_duplicate(tmp_path):
+    csv_path = tmp_path / "dup.csv"
+    csv_path.write_text("SOLVER_HANDLE,PROBLEM_ID,SOLVED_LVL\na,1000,3\na,1000,9\nb,1000,4\nb,1001,5\n")
+    recommender = SimpleCollaborativeRecommender(str(csv_path))
+    assert dict(recommender.user_item_matrix['a'].items()) == {1000: 3}
+    assert dict(recommender.user_item_matrix['b'].items()) == {1000: 4, 1001: 5}
+    assert recommender.user_norms['b'] == pytest.approx(math.sqrt(4 ** 2 + 5 ** 2))
+
+
+def test_sparse_training_matches_brute_force(interactions_csv):
+    recommender = _trained(interactions_csv, block_size=7)
+    for user in recommender.user_item_matrix:
+        expected = _brute_force_similarities(recommender, user)
+        neighbors = dict(recommender.neighbors.neighbors(user))
+        assert neighbors.keys() == expected.keys()
+        for other, score in expected.items():
+            assert neighbors[other] == pytest.approx(score)
+
+
+def test_top_k_keeps_most_similar_neighbors(interactions_csv):
+    recommender = _trained(interactions_csv, n_neighbors=3)
+    for user in recommender.user_item_matrix:
+        expected = sorted(_brute_force_similarities(recommender, user).values(), reverse=True)[:3]
+        scores = sorted((score for _, score in recommender.neighbors.neighbors(user)), reverse=True)
+        assert scores == pytest.approx(expected)
+
+
+def test_pure_python_training_matches_sparse(interactions_csv, monkeypatch):
+    sparse_model = _trained(interactions_csv)
+    monkeypatch.setattr(simple_recommendation_engine, 'SPARSE_AVAILABLE', False)
+    python_model = _trained(interactions_csv)
+    for user in sparse_model.user_item_matrix:
+        expected = dict(sparse_model.neighbors.neighbors(user))
+        actual = dict(python_model.neighbors.neighbors(user))
+        assert actual.keys() == expected.keys()
+        for other, score in expected.items():
+            assert actual[other] == pytest.approx(score)
+
+
+def test_parallel_training_matches_sequential(interactions_csv):
+    sequential = _trained(interactions_csv, block_size=8)
+    parallel = _trained(interactions_csv, block_size=8, n_workers=2)
+    for user in sequential.user_item_matrix:
+        assert parallel.neighbors.neighbors(user) == sequential.neighbors.neighbors(user)
+
+
+@pytest.fixture
+def tagged_recommender(interactions_csv):
+    """짝수 문제는 'math', 홀수 문제는 'dp' 태그가 붙은 태그 색인을 가진 모델"""
+    recommender = _trained(interactions_csv)
+    recommender.set_problem_store(parity_problem_store())
+    return recommender
+
+
+def test_tag_popularity_uses_precomputed_ranking(tagged_recommender, monkeypatch):
+    monkeypatch.setattr(tagged_recommender, '_fetch_problem_tags', no_http)
+    result = tagged_recommender._get_popular_recommendations_by_tag({1000}, 'math', 5)
+    assert len(result) == 5
+    assert all(rec['problem_id'] % 2 == 0 and rec['problem_id'] != 1000 for rec in result)
+
+
+def test_unknown_tag_is_empty_without_http_or_mutation(tagged_recommender, monkeypatch):
+    monkeypatch.setattr(tagged_recommender, '_fetch_problem_tags', no_http)
+    tags_before = set(tagged_recommender.popular_problems_by_tag)
+    assert tagged_recommender._get_popular_recommendations_by_tag(set(), 'graphs', 5) == []
+    assert set(tagged_recommender.popular_problems_by_tag) == tags_before
+
+
+def test_tag_filter_records_index_lookups_once_per_request(tagged_recommender, monkeypatch):
+    monkeypatch.setattr(tagged_recommender, '_fetch_problem_tags', no_http)
+    calls = []
+    monkeypatch.setattr(METRICS, 'increment', lambda name, amount=1, **labels: calls.append((name, amount, labels)))
+
+    result = tagged_recommender.get_recommendations_for_user_history_by_tag("someone", {1000: 5, 1003: 12}, 'math')
+    assert result
+    # 후보마다 잠금을 잡지 않고 요청 전체의 적중 수를 한 번에 기록
+    assert len(calls) == 1
+    name, amount, labels = calls[0]
+    assert (name, labels) == ('cache_lookups_total', {'cache': 'tag_index', 'result': 'hit'})
+    assert amount > len(result)
+
+
+def test_tag_popularity_without_index_checks_only_needed_problems(interactions_csv, monkeypatch):
+    recommender = _trained(interactions_csv)
+    fetched = []
+
+    def fetch_tags(problem_id):
+        fetched.append(problem_id)
+        return ['math'] if problem_id % 2 == 0 else ['dp']
+
+    monkeypatch.setattr(recommender, '_fetch_problem_tags', fetch_tags)
+    result = recommender._get_popular_recommendations_by_tag(set(), 'math', 3)
+    assert [rec['problem_id'] % 2 for rec in result] == [0, 0, 0]
+    # 순위를 앞에서부터 훑다가 3개를 채우면 멈추고, 공유 상태에는 아무것도 저장하지 않음
+    assert fetched[-1] == result[-1]['problem_id']
+    assert len(fetched) < len(recommender.popular_problems['problem_ids'])
+    assert recommender.popular_problems_by_tag == {}
+
+
+def test_load_data_does_not_depend_on_chunk_size(interactions_csv):
+    whole = SimpleCollaborativeRecommender()
+    whole.load_data(interactions_csv)
+    chunked = SimpleCollaborativeRecommender()
+    chunked.load_data(interactions_csv, chunk_size=7)
+
+    assert chunked.problem_data is None
+    assert list(chunked.user_item_matrix) == list(whole.user_item_matrix)
+    assert chunked.user_item_matrix.problem_ids == whole.user_item_matrix.problem_ids
+    for user in whole.user_item_matrix:
+        assert chunked.user_item_matrix[user].items() == whole.user_item_matrix[user].items()
+        assert chunked.user_norms[user] == pytest.approx(whole.user_norms[user])
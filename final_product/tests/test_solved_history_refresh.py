@@ -0,0 +1,108 @@
+import pytest
+
+from solved_history_store import SolvedHistoryStore
+
+
+class StubClient:
+    """search/problem을 문제 ID 오름차순 페이지로 흉내 내는 solved.ac 클라이언트"""
+
+    def __init__(self, page_size):
+        self.page_size = page_size
+        self.entries = []
+        self.pages = []
+
+    def solve(self, entries):
+        self.entries = sorted(entries)
+
+    def get_json(self, path, params=None):
+        assert path == "search/problem"
+        page = params["page"]
+        self.pages.append(page)
+        chunk = self.entries[(page - 1) * self.page_size:page * self.page_size]
+        return {
+            "count": len(self.entries),
+            "items": [{"problemId": problem_id, "level": level} for problem_id, level in chunk],
+        }
+
+
+@pytest.fixture
+def main(main_module, monkeypatch):
+    client = StubClient(main_module.SOLVED_PAGE_SIZE)
+    monkeypatch.setattr(main_module, 'get_client', lambda: client)
+    monkeypatch.setattr(main_module, 'solvedPageLimiter', main_module.RateLimiter(10 ** 6, burst=10 ** 6))
+    monkeypatch.setattr(main_module, 'solvedHistoryStore', SolvedHistoryStore(":memory:"))
+    monkeypatch.setattr(main_module, 'client', client, raising=False)
+    return main_module
+
+
+def _entries(problem_ids):
+    return [(problem_id, problem_id % 30 + 1) for problem_id in problem_ids]
+
+
+def _stored(main, problem_ids):
+    """problem_ids를 푼 상태로 기록을 저장해 두고 요청한 페이지 기록은 비움"""
+    main.client.solve(_entries(problem_ids))
+    history = main.getUserSolvedProblems("alice")
+    assert history.entries() == main.client.entries
+    main.client.pages.clear()
+    return history
+
+
+def _refresh(main, problem_ids):
+    main.client.solve(_entries(problem_ids))
+    history = main.getUserSolvedProblems("alice")
+    assert history.entries() == main.client.entries
+    assert main.solvedHistoryStore.get("alice").entries() == main.client.entries
+    return sorted(main.client.pages)
+
+
+def test_unchanged_count_fetches_only_first_page(main):
+    _stored(main, range(1000, 1500))
+    assert _refresh(main, range(1000, 1500)) == [1]
+
+
+def test_problems_inserted_in_the_middle_fetch_few_pages(main):
+    base = list(range(1000, 3000, 2))  # 1000문제 = 20페이지
+    _stored(main, base)
+
+    pages = _refresh(main, base + [1501, 1503])
+    # 새 문제가 있는 구간만 반으로 나누며 가져오므로 전체 20페이지보다 훨씬 적게 요청
+    assert 1 in pages and len(pages) < 10
+    assert pages != list(range(1, 21))
+
+
+def test_problems_added_on_last_page(main):
+    base = list(range(1000, 3000, 2))
+    _stored(main, base)
+
+    pages = _refresh(main, base + [5000])
+    assert len(pages) < 10 and max(pages) == 21
+
+
+def test_changed_last_page_falls_back_to_full_fetch(main):
+    base = list(range(1000, 3000, 2))
+    stored = _stored(main, base).entries()
+
+    # 마지막 문제가 다른 문제로 바뀌고 하나가 늘어남: 기존 기록과 일관되게 합칠 수 없음
+    changed = base[:-1] + [4000, 4002]
+    main.client.solve(_entries(changed))
+    first_page = main.solvedEntries(main.client.get_json("search/problem", {"page": 1})["items"])
+    assert main.refreshSolvedHistory("alice", stored, first_page, len(changed)) is None
+
+    main.client.pages.clear()
+    assert set(_refresh(main, changed)) == set(range(1, 22))
+
+
+def test_shrunken_count_falls_back_to_full_fetch(main):
+    base = list(range(1000, 1600))
+    _stored(main, base)
+
+    remaining = base[:100] + base[101:]
+    assert _refresh(main, remaining) == list(range(1, 13))
+
+
+def test_many_new_problems_fall_back_to_full_fetch(main):
+    _stored(main, range(1000, 1500))
+    assert main.refreshSolvedHistory(
+        "alice", main.solvedHistoryStore.get("alice").entries(), [], 1500 + 50
+    ) is None
@@ -0,0 +1,76 @@
+import pytest
+
+from solved_history_store import SolvedHistoryStore
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def store(tmp_path, clock):
+    store = SolvedHistoryStore(str(tmp_path / "solved_history.sqlite3"), stale_after=600, clock=clock)
+    yield store
+    store.close()
+
+
+def test_put_and_get_round_trip(store):
+    history = store.put("alice", 3, [(1002, 5), (1000, 1), (1001, None)])
+    assert history.entries() == [(1000, 1), (1001, 0), (1002, 5)]
+
+    loaded = store.get("alice")
+    assert loaded.solved_count == 3
+    assert loaded.fetched_at == 1000.0
+    assert loaded.entries() == history.entries()
+    assert loaded.problems() == {1000: 1, 1001: 0, 1002: 5}
+    assert len(loaded) == 3
+
+
+def test_missing_handle_returns_none(store):
+    assert store.get("nobody") is None
+
+
+def test_put_replaces_previous_history(store):
+    store.put("alice", 1, [(1000, 1)])
+    store.put("alice", 2, [(1000, 1), (1001, 2)])
+    assert store.get("alice").entries() == [(1000, 1), (1001, 2)]
+    assert len(store) == 1
+
+
+def test_is_stale_by_age_and_solved_count(store, clock):
+    history = store.put("alice", 2, [(1000, 1), (1001, 2)])
+    assert not store.is_stale(history)
+    assert not store.is_stale(history, solved_count=2)
+    assert store.is_stale(history, solved_count=3)
+
+    clock.now += 600
+    assert store.is_stale(history)
+
+
+def test_delete(store):
+    store.put("alice", 1, [(1000, 1)])
+    store.delete("alice")
+    assert store.get("alice") is None
+    assert len(store) == 0
+
+
+def test_history_survives_reopen(tmp_path, clock):
+    path = str(tmp_path / "solved_history.sqlite3")
+    first = SolvedHistoryStore(path, clock=clock)
+    first.put("alice", 1, [(1000, 7)])
+    first.close()
+
+    second = SolvedHistoryStore(path, clock=clock)
+    try:
+        assert second.get("alice").problems() == {1000: 7}
+    finally:
+        second.close()
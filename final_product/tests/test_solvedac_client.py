@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+import requests
+
+from metrics import METRICS
+from solvedac_client import SolvedAcClient
+from async_solvedac_client import ASYNC_HTTP_AVAILABLE, AsyncSolvedAcClient
+
+
+def _response(status, headers=None, body=b'{}'):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response.url = "http://stub/user/show"
+    response._content = body
+    return response
+
+
+class FakeSession:
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.headers = {}
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def _counter(name, **labels):
+    for entry in METRICS.to_dict()['counters'].get(name, []):
+        if entry['labels'] == labels:
+            return entry['value']
+    return 0
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    METRICS.reset()
+    yield
+    METRICS.reset()
+
+
+def _client(outcomes, **kwargs):
+    delays = []
+    client = SolvedAcClient(base_url="http://stub", session=FakeSession(outcomes), sleep=delays.append, **kwargs)
+    return client, delays
+
+
+def test_retries_transient_failures_with_backoff():
+    client, delays = _client([
+        requests.exceptions.ConnectionError("down"),
+        _response(503),
+        _response(200, body=b'{"solvedCount": 3}'),
+    ])
+    assert client.get_json("user/show") == {"solvedCount": 3}
+    assert delays == [0.5, 1.0]
+    assert _counter("upstream_retries_total", endpoint="user/show") == 2
+    assert _counter("upstream_requests_total", endpoint="user/show", result="ok") == 1
+
+
+def test_follows_retry_after_capped_by_max_backoff():
+    client, delays = _client([_response(429, {"Retry-After": "2"}), _response(429, {"Retry-After": "99"}),
+                              _response(200)], max_backoff=10.0)
+    assert client.get("user/show") is not None
+    assert delays == [2.0, 10.0]
+
+
+def test_gives_up_after_max_retries():
+    client, delays = _client([_response(500)] * 3, max_retries=2)
+    assert client.get("user/show") is None
+    assert client.session.calls == 3
+    assert len(delays) == 2
+    assert _counter("upstream_requests_total", endpoint="user/show", result="error") == 1
+
+
+@pytest.mark.parametrize("outcome", [_response(404), requests.exceptions.InvalidURL("bad")])
+def test_does_not_retry_client_errors(outcome):
+    client, delays = _client([outcome])
+    assert client.get("user/show") is None
+    assert delays == []
+    assert _counter("upstream_retries_total", endpoint="user/show") == 0
+
+
+@pytest.mark.skipif(not ASYNC_HTTP_AVAILABLE, reason="httpx가 설치되어 있지 않음")
+def test_async_client_shares_the_retry_policy():
+    import httpx
+
+    statuses = [503, 429, 404, 200]
+
+    def handler(request):
+        return httpx.Response(statuses.pop(0), json={"solvedCount": 3})
+
+    client = AsyncSolvedAcClient(base_url="http://stub", backoff_factor=0.0)
+    client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        assert asyncio.run(client.get_json("user/show")) is None
+        assert asyncio.run(client.get_json("user/show")) == {"solvedCount": 3}
+    finally:
+        client.close()
+    assert _counter("upstream_retries_total", endpoint="user/show") == 2
+    assert _counter("upstream_requests_total", endpoint="user/show", result="error") == 1
+    assert _counter("upstream_requests_total", endpoint="user/show", result="ok") == 1
@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+import tag_catalog
+from tag_catalog import TagCatalog
+
+
+def _tag(en, ko):
+    return {"displayNames": [{"short": ko}, {"short": en}]}
+
+
+class StubClient:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def get_json(self, path, params=None):
+        assert path == "tag/list"
+        return self.pages.get(params["page"])
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def catalog(tmp_path, clock):
+    return TagCatalog(str(tmp_path / "tag_list.json"), refresh_interval=10, retry_interval=0, clock=clock)
+
+
+def _serve(monkeypatch, pages):
+    monkeypatch.setattr(tag_catalog, 'get_client', lambda: StubClient(pages))
+
+
+def test_skips_malformed_upstream_entries(monkeypatch, catalog):
+    _serve(monkeypatch, {
+        1: {"count": 4, "items": [_tag("dynamic programming", "다이나믹 프로그래밍"), None, {"displayNames": [{}]}]},
+        2: {"count": 4, "items": [{"displayNames": "math"}, _tag("math", "수학")]},
+    })
+    snapshot = catalog.get()
+    assert snapshot.items == [
+        {"en": "dynamic_programming", "ko": "다이나믹_프로그래밍"},
+        {"en": "math", "ko": "수학"},
+    ]
+
+
+@pytest.mark.parametrize("pages", [
+    {1: {"count": 1, "items": [{"displayNames": None}]}},
+    {1: {"count": 2, "items": [_tag("math", "수학")]}, 2: {"items": "broken"}},
+    {1: ["not", "a", "page"]},
+])
+def test_keeps_last_good_catalogue_when_refresh_is_malformed(monkeypatch, catalog, clock, pages):
+    _serve(monkeypatch, {1: {"count": 1, "items": [_tag("math", "수학")]}})
+    good = catalog.get()
+
+    _serve(monkeypatch, pages)
+    clock.now += 100
+    assert catalog.refresh() is good
+    assert catalog.get().items == [{"en": "math", "ko": "수학"}]
+
+
+def test_skips_malformed_persisted_entries(catalog):
+    with open(catalog.path, 'w', encoding='utf-8') as f:
+        json.dump({"fetched_at": 1000.0, "items": [{"en": "math", "ko": "수학"}, {"en": 3}, "dp"]}, f)
+    assert catalog.get().items == [{"en": "math", "ko": "수학"}]
+
+
+def test_unreadable_persisted_catalogue_is_refetched(monkeypatch, catalog):
+    with open(catalog.path, 'w', encoding='utf-8') as f:
+        json.dump({"fetched_at": "yesterday", "items": [{"en": "math", "ko": "수학"}]}, f)
+    _serve(monkeypatch, {1: {"count": 1, "items": [_tag("graphs", "그래프")]}})
+    assert catalog.get().items == [{"en": "graphs", "ko": "그래프"}]